@@ -10,14 +10,16 @@ from typing import Any, Optional, Dict
 import voluptuous as vol
 
 from homeassistant import (
-    core, config as conf_util, config_entries, components as core_components)
+    core, config as conf_util, config_entries, loader,
+    components as core_components)
 from homeassistant.components import persistent_notification
-from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
-from homeassistant.setup import async_setup_component
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, PLATFORM_FORMAT
+from homeassistant.setup import async_log_setup_timeline, async_setup_component
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
 from homeassistant.util.yaml import clear_secret_cache
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -128,6 +130,14 @@ async def async_from_config_dict(config: Dict[str, Any],
                      if key != core.DOMAIN)
     components.update(hass.config_entries.async_domains())
 
+    # Metadata of components that is read without importing them
+    platforms = [PLATFORM_FORMAT.format(domain, platform)
+                 for domain in components
+                 for platform, _ in config_per_platform(config, domain)
+                 if isinstance(platform, str)]
+    await loader.async_load_metadata_index(
+        hass, list(components) + platforms)
+
     # setup components
     res = await core_components.async_setup(hass, config)
     if not res:
@@ -157,6 +167,9 @@ async def async_from_config_dict(config: Dict[str, Any],
 
     stop = time()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop-start)
+    async_log_setup_timeline(hass)
+
+    await loader.async_save_metadata_index(hass)
 
     return hass
 
@@ -212,7 +225,7 @@ async def async_from_config_file(config_path: str,
 
     try:
         config_dict = await hass.async_add_executor_job(
-            conf_util.load_yaml_config_file, config_path)
+            conf_util.load_yaml_config_file, config_path, True)
     except HomeAssistantError as err:
         _LOGGER.error("Error loading %s: %s", config_path, err)
         return None
@@ -7,19 +7,22 @@ https://home-assistant.io/components/history/
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 
+from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.const import (
     HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE)
 import homeassistant.util.dt as dt_util
-from homeassistant.components import recorder, script
+from homeassistant.components import recorder, script, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
 from homeassistant.components.recorder.util import session_scope, execute
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSON_DUMP
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +40,25 @@ CONFIG_SCHEMA = vol.Schema({
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
+ATTR_TIME = 't'
+ATTR_STATE = 's'
+ATTR_ATTRIBUTES = 'a'
+ATTR_MIN = 'min'
+ATTR_MAX = 'max'
+
+# Entities encoded per streamed message or response chunk
+STREAM_CHUNK_SIZE = 50
+
+WS_TYPE_HISTORY_STREAM = 'history/stream'
+SCHEMA_WS_HISTORY_STREAM = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): WS_TYPE_HISTORY_STREAM,
+    vol.Required('start_time'): cv.datetime,
+    vol.Optional('end_time'): cv.datetime,
+    vol.Optional('entity_ids'): cv.entity_ids,
+    vol.Optional('points'): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional('attributes', default=False): cv.boolean,
+})
+
 
 def last_recorder_run(hass):
     """Retrieve the last closed recorder run from the database."""
@@ -62,21 +84,23 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
     thermostat so that we get current temperature in our graphs).
     """
     timer_start = time.perf_counter()
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        States, datetime_to_timestamp)
 
     with session_scope(hass=hass) as session:
         query = session.query(States).filter(
             (States.domain.in_(SIGNIFICANT_DOMAINS) |
-             (States.last_changed == States.last_updated)) &
-            (States.last_updated > start_time))
+             (States.last_changed_ts == States.last_updated_ts)) &
+            (States.last_updated_ts > datetime_to_timestamp(start_time)))
 
         if filters:
             query = filters.apply(query, entity_ids)
 
         if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
+            query = query.filter(
+                States.last_updated_ts < datetime_to_timestamp(end_time))
 
-        query = query.order_by(States.last_updated)
+        query = query.order_by(States.last_updated_ts)
 
         states = (
             state for state in execute(query)
@@ -96,15 +120,17 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
 def state_changes_during_period(hass, start_time, end_time=None,
                                 entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        States, datetime_to_timestamp)
 
     with session_scope(hass=hass) as session:
         query = session.query(States).filter(
-            (States.last_changed == States.last_updated) &
-            (States.last_updated > start_time))
+            (States.last_changed_ts == States.last_updated_ts) &
+            (States.last_updated_ts > datetime_to_timestamp(start_time)))
 
         if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
+            query = query.filter(
+                States.last_updated_ts < datetime_to_timestamp(end_time))
 
         if entity_id is not None:
             query = query.filter_by(entity_id=entity_id.lower())
@@ -112,7 +138,7 @@ def state_changes_during_period(hass, start_time, end_time=None,
         entity_ids = [entity_id] if entity_id is not None else None
 
         states = execute(
-            query.order_by(States.last_updated))
+            query.order_by(States.last_updated_ts))
 
     return states_to_json(hass, states, start_time, entity_ids)
 
@@ -125,7 +151,7 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
     with session_scope(hass=hass) as session:
         query = session.query(States).filter(
-            (States.last_changed == States.last_updated))
+            (States.last_changed_ts == States.last_updated_ts))
 
         if entity_id is not None:
             query = query.filter_by(entity_id=entity_id.lower())
@@ -133,7 +159,8 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         entity_ids = [entity_id] if entity_id is not None else None
 
         states = execute(
-            query.order_by(States.last_updated.desc()).limit(number_of_states))
+            query.order_by(
+                States.last_updated_ts.desc()).limit(number_of_states))
 
     return states_to_json(hass, reversed(states),
                           start_time,
@@ -144,7 +171,8 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
                filters=None):
     """Return the states at a specific point in time."""
-    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.models import (
+        States, datetime_to_timestamp)
 
     if run is None:
         run = recorder.run_information(hass, utc_point_in_time)
@@ -155,6 +183,9 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
 
     from sqlalchemy import and_, func
 
+    point_in_time_ts = datetime_to_timestamp(utc_point_in_time)
+    run_start_ts = datetime_to_timestamp(run.start)
+
     with session_scope(hass=hass) as session:
         if entity_ids and len(entity_ids) == 1:
             # Use an entirely different (and extremely fast) query if we only
@@ -162,10 +193,10 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
             most_recent_state_ids = session.query(
                 States.state_id.label('max_state_id')
             ).filter(
-                (States.last_updated < utc_point_in_time) &
+                (States.last_updated_ts < point_in_time_ts) &
                 (States.entity_id.in_(entity_ids))
             ).order_by(
-                States.last_updated.desc())
+                States.last_updated_ts.desc())
 
             most_recent_state_ids = most_recent_state_ids.limit(1)
 
@@ -176,10 +207,10 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
 
             most_recent_states_by_date = session.query(
                 States.entity_id.label('max_entity_id'),
-                func.max(States.last_updated).label('max_last_updated')
+                func.max(States.last_updated_ts).label('max_last_updated')
             ).filter(
-                (States.last_updated >= run.start) &
-                (States.last_updated < utc_point_in_time)
+                (States.last_updated_ts >= run_start_ts) &
+                (States.last_updated_ts < point_in_time_ts)
             )
 
             if entity_ids:
@@ -195,7 +226,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
                 func.max(States.state_id).label('max_state_id')
             ).join(most_recent_states_by_date, and_(
                 States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                States.last_updated == most_recent_states_by_date.c.
+                States.last_updated_ts == most_recent_states_by_date.c.
                 max_last_updated))
 
             most_recent_state_ids = most_recent_state_ids.group_by(
@@ -252,6 +283,185 @@ def states_to_json(
     return result
 
 
+def get_columnar_states(hass, start_time, end_time, entity_ids=None,
+                        filters=None, include_attributes=False, points=None):
+    """Return significant states during a period in a columnar format.
+
+    The result is {entity_id: {'t': [timestamps], 's': [states]}}, plus an
+    'a' list of attribute dicts when include_attributes is set. Rows are
+    read as plain columns instead of State objects, attributes are only
+    decoded when requested or needed to skip hidden entities and scripts
+    like get_significant_states does.
+
+    With points set, numeric entities with more changes are downsampled
+    into as many equal time buckets, reporting the mean as 's' together
+    with 'min' and 'max'. Downsampled entities do not include attributes.
+    When entity_ids are given and the buckets are at least as wide as a
+    statistics period, the recorder statistics are used instead of states.
+    """
+    timer_start = time.perf_counter()
+    from homeassistant.components.recorder.models import (
+        StateAttributes, States, datetime_to_timestamp)
+
+    start_ts = datetime_to_timestamp(start_time)
+    end_ts = datetime_to_timestamp(end_time)
+    result = defaultdict(lambda: defaultdict(list))
+
+    if points is not None and entity_ids:
+        result.update(_columnar_from_statistics(
+            hass, start_time, end_time, entity_ids, points))
+        entity_ids = [entity_id for entity_id in entity_ids
+                      if entity_id not in result]
+        if not entity_ids:
+            return {entity_id: dict(columns)
+                    for entity_id, columns in result.items()}
+
+    for state in get_states(hass, start_time, entity_ids, filters=filters):
+        _append_columnar(result[state.entity_id], start_ts, state.state,
+                         state.attributes if include_attributes else None)
+
+    with session_scope(hass=hass) as session:
+        query = session.query(
+            States.entity_id, States.domain, States.state,
+            States.last_updated_ts, StateAttributes.shared_attrs,
+            States.attributes
+        ).outerjoin(
+            StateAttributes,
+            States.attributes_id == StateAttributes.attributes_id
+        ).filter(
+            (States.domain.in_(SIGNIFICANT_DOMAINS) |
+             (States.last_changed_ts == States.last_updated_ts)) &
+            (States.last_updated_ts > start_ts) &
+            (States.last_updated_ts < end_ts))
+
+        if filters:
+            query = filters.apply(query, entity_ids)
+        elif entity_ids is not None:
+            query = query.filter(States.entity_id.in_(entity_ids))
+
+        for entity_id, domain, state, last_updated_ts, shared_attrs, \
+                attrs in query.order_by(States.last_updated_ts):
+            attrs = shared_attrs or attrs or '{}'
+            attributes = None
+
+            # Only decode the attributes when they are needed
+            if (include_attributes or domain == 'script' or
+                    ATTR_HIDDEN in attrs):
+                attributes = json.loads(attrs)
+                if attributes.get(ATTR_HIDDEN, False) or (
+                        domain == 'script' and
+                        not attributes.get(script.ATTR_CAN_CANCEL)):
+                    continue
+
+            _append_columnar(
+                result[entity_id], last_updated_ts, state,
+                attributes if include_attributes else None)
+
+    if points is not None:
+        for columns in result.values():
+            if ATTR_MIN not in columns:
+                _downsample(columns, start_ts, end_ts, points)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug('get_columnar_states took %fs', elapsed)
+
+    return {entity_id: dict(columns) for entity_id, columns in result.items()}
+
+
+def _columnar_from_statistics(hass, start_time, end_time, entity_ids,
+                              points):
+    """Return downsampled columns built from the recorder statistics.
+
+    Only used if the requested resolution allows it and the statistics of
+    an entity cover the whole period.
+    """
+    from homeassistant.components.recorder.models import datetime_to_timestamp
+    from homeassistant.components.recorder import statistics
+
+    start_ts = datetime_to_timestamp(start_time)
+    width = (datetime_to_timestamp(end_time) - start_ts) / points
+    duration = statistics.best_duration(width)
+    if duration is None:
+        return {}
+
+    result = {}
+    for entity_id, stats in statistics.statistics_during_period(
+            hass, start_time - timedelta(seconds=duration), end_time,
+            entity_ids, duration).items():
+        if stats[0]['start'] > start_ts:
+            continue
+
+        buckets = defaultdict(list)
+        for stat in stats:
+            index = max(int((stat['start'] - start_ts) // width), 0)
+            buckets[min(index, points - 1)].append(stat)
+
+        columns = result[entity_id] = defaultdict(list)
+        for index in sorted(buckets):
+            bucket = buckets[index]
+            count = sum(stat['count'] for stat in bucket)
+            columns[ATTR_TIME].append(start_ts + index * width)
+            columns[ATTR_STATE].append(sum(
+                stat['mean'] * stat['count'] for stat in bucket) / count)
+            columns[ATTR_MIN].append(min(stat['min'] for stat in bucket))
+            columns[ATTR_MAX].append(max(stat['max'] for stat in bucket))
+
+    return result
+
+
+def _append_columnar(columns, timestamp, state, attributes):
+    """Append a state to the columns of an entity."""
+    columns[ATTR_TIME].append(timestamp)
+    columns[ATTR_STATE].append(state)
+    if attributes is not None:
+        columns[ATTR_ATTRIBUTES].append(attributes)
+
+
+def _downsample(columns, start_ts, end_ts, points):
+    """Downsample numeric states into min/max/mean time buckets."""
+    if len(columns[ATTR_TIME]) <= points:
+        return
+
+    try:
+        values = [float(value) for value in columns[ATTR_STATE]]
+    except ValueError:
+        # Only numeric states can be aggregated
+        return
+
+    width = (end_ts - start_ts) / points
+    buckets = defaultdict(list)
+    for timestamp, value in zip(columns[ATTR_TIME], values):
+        buckets[min(int((timestamp - start_ts) // width), points - 1)] \
+            .append(value)
+
+    columns.clear()
+    for key in (ATTR_TIME, ATTR_STATE, ATTR_MIN, ATTR_MAX):
+        columns[key] = []
+    for index in sorted(buckets):
+        bucket = buckets[index]
+        columns[ATTR_TIME].append(start_ts + index * width)
+        columns[ATTR_STATE].append(sum(bucket) / len(bucket))
+        columns[ATTR_MIN].append(min(bucket))
+        columns[ATTR_MAX].append(max(bucket))
+
+
+def _chunk_items(result):
+    """Split a columnar result into lists of STREAM_CHUNK_SIZE items."""
+    items = list(result.items())
+    return [items[index:index + STREAM_CHUNK_SIZE]
+            for index in range(0, len(items), STREAM_CHUNK_SIZE)]
+
+
+def _encode_columnar_chunk(items, first):
+    """Encode columnar items as part of a JSON object."""
+    return ''.join(
+        '{}{}: {}'.format(
+            '' if first and not index else ', ', json.dumps(entity_id),
+            JSON_DUMP(columns))
+        for index, (entity_id, columns) in enumerate(items)).encode('UTF-8')
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -273,6 +483,10 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.http.register_view(HistoryColumnarView(filters))
+    hass.components.websocket_api.async_register_command(
+        WS_TYPE_HISTORY_STREAM, websocket_history_stream(filters),
+        SCHEMA_WS_HISTORY_STREAM)
     await hass.components.frontend.async_register_built_in_panel(
         'history', 'history', 'hass:poll-box')
 
@@ -353,6 +567,111 @@ class HistoryPeriodView(HomeAssistantView):
         return await hass.async_add_job(self.json, result)
 
 
+class HistoryColumnarView(HomeAssistantView):
+    """Stream history in a columnar format."""
+
+    url = '/api/history/columnar'
+    name = 'api:history:columnar'
+    extra_urls = ['/api/history/columnar/{datetime}']
+
+    def __init__(self, filters):
+        """Initialize the columnar history view."""
+        self.filters = filters
+
+    async def get(self, request, datetime=None):
+        """Return history over a period of time, one entity per chunk."""
+        if datetime:
+            datetime = dt_util.parse_datetime(datetime)
+
+            if datetime is None:
+                return self.json_message('Invalid datetime', HTTP_BAD_REQUEST)
+
+        if datetime:
+            start_time = dt_util.as_utc(datetime)
+        else:
+            start_time = dt_util.utcnow() - timedelta(days=1)
+
+        end_time = request.query.get('end_time')
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time:
+                end_time = dt_util.as_utc(end_time)
+            else:
+                return self.json_message('Invalid end_time', HTTP_BAD_REQUEST)
+        else:
+            end_time = start_time + timedelta(days=1)
+
+        points = request.query.get('points')
+        if points:
+            try:
+                points = int(points)
+            except ValueError:
+                points = 0
+            if points < 1:
+                return self.json_message('Invalid points', HTTP_BAD_REQUEST)
+        else:
+            points = None
+
+        entity_ids = request.query.get('filter_entity_id')
+        if entity_ids:
+            entity_ids = entity_ids.lower().split(',')
+        include_attributes = 'attributes' in request.query
+
+        hass = request.app['hass']
+
+        result = await hass.async_add_job(
+            get_columnar_states, hass, start_time, end_time, entity_ids,
+            self.filters, include_attributes, points)
+
+        response = web.StreamResponse()
+        response.content_type = 'application/json'
+        await response.prepare(request)
+        await response.write(b'{')
+        for index, items in enumerate(_chunk_items(result)):
+            chunk = await hass.async_add_executor_job(
+                _encode_columnar_chunk, items, not index)
+            await response.write(chunk)
+        await response.write(b'}')
+        await response.write_eof()
+        return response
+
+
+def websocket_history_stream(filters):
+    """Create the history stream websocket command handler."""
+    @websocket_api.async_response
+    async def handle_history_stream(hass, connection, msg):
+        """Send columnar history, STREAM_CHUNK_SIZE entities per message."""
+        start_time = dt_util.as_utc(msg['start_time'])
+        end_time = msg.get('end_time')
+        if end_time is None:
+            end_time = start_time + timedelta(days=1)
+        else:
+            end_time = dt_util.as_utc(end_time)
+
+        result = await hass.async_add_job(
+            get_columnar_states, hass, start_time, end_time,
+            msg.get('entity_ids'), filters, msg['attributes'],
+            msg.get('points'))
+
+        for items in _chunk_items(result):
+            message = await hass.async_add_executor_job(
+                JSON_DUMP, history_message(msg['id'], items))
+            await connection.async_send_message(message)
+
+        connection.send_message(websocket_api.result_message(msg['id']))
+
+    return handle_history_stream
+
+
+def history_message(iden, items):
+    """Return a message with the columnar history of some entities."""
+    return {
+        'id': iden,
+        'type': 'event',
+        'event': dict(items),
+    }
+
+
 class Filters:
     """Container for the configured include and exclude filters."""
 
@@ -5,7 +5,6 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/http/
 """
 import asyncio
-import json
 import logging
 
 from aiohttp import web
@@ -15,7 +14,7 @@ from homeassistant.components.http.ban import process_success_login
 from homeassistant.core import Context, is_callback
 from homeassistant.const import CONTENT_TYPE_JSON
 from homeassistant import exceptions
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSON_DUMP
 
 from .const import KEY_AUTHENTICATED, KEY_REAL_IP
 
@@ -44,8 +43,7 @@ class HomeAssistantView:
     def json(self, result, status_code=200, headers=None):
         """Return a JSON response."""
         try:
-            msg = json.dumps(
-                result, sort_keys=True, cls=JSONEncoder).encode('UTF-8')
+            msg = JSON_DUMP(result, sort_keys=True).encode('UTF-8')
         except TypeError as err:
             _LOGGER.error('Unable to serialize to JSON: %s\n%s', err, result)
             raise HTTPInternalServerError
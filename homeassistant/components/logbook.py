@@ -6,8 +6,10 @@ https://home-assistant.io/components/logbook/
 """
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 
+from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.loader import bind_hass
@@ -19,12 +21,15 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP, EVENT_LOGBOOK_ENTRY, EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST, STATE_NOT_HOME, STATE_OFF, STATE_ON)
 from homeassistant.core import (
-    DOMAIN as HA_DOMAIN, State, callback, split_entity_id)
+    DOMAIN as HA_DOMAIN, Context, State, callback, split_entity_id)
+from homeassistant.exceptions import (
+    InvalidEntityFormatError, InvalidStateError)
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.homekit.const import (
     ATTR_DISPLAY_NAME, ATTR_VALUE, DOMAIN as DOMAIN_HOMEKIT,
     EVENT_HOMEKIT_CHANGED)
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSON_DUMP
 import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,6 +46,9 @@ DOMAIN = 'logbook'
 
 GROUP_BY_MINUTES = 15
 
+# Number of logbook entries encoded per chunk of the response
+STREAM_CHUNK_SIZE = 500
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         CONF_EXCLUDE: vol.Schema({
@@ -147,12 +155,39 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=period)
         hass = request.app['hass']
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(list(
-                _get_events(hass, self.config, start_day, end_day, entity_id)))
-
-        return await hass.async_add_job(json_events)
+        def json_chunks():
+            """Fetch events and encode them as JSON chunks."""
+            return _encode_entry_chunks(
+                _get_events(hass, self.config, start_day, end_day, entity_id))
+
+        chunks = await hass.async_add_job(json_chunks)
+
+        response = web.StreamResponse()
+        response.content_type = 'application/json'
+        await response.prepare(request)
+        for chunk in chunks:
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+
+def _encode_entry_chunks(entries):
+    """Encode logbook entries as a JSON list in chunks of entries."""
+    chunks = [b'[']
+    batch = []
+    for entry in entries:
+        batch.append(JSON_DUMP(entry))
+        if len(batch) == STREAM_CHUNK_SIZE:
+            chunks.append('{}{}'.format(
+                ', ' if len(chunks) > 1 else '', ', '.join(batch))
+                          .encode('UTF-8'))
+            batch = []
+    if batch:
+        chunks.append('{}{}'.format(
+            ', ' if len(chunks) > 1 else '', ', '.join(batch))
+                      .encode('UTF-8'))
+    chunks.append(b']')
+    return chunks
 
 
 def humanify(hass, events):
@@ -202,7 +237,11 @@ def humanify(hass, events):
         for event in events_batch:
             if event.event_type == EVENT_STATE_CHANGED:
 
-                to_state = State.from_dict(event.data.get('new_state'))
+                new_state = event.data.get('new_state')
+                if isinstance(new_state, State):
+                    to_state = new_state
+                else:
+                    to_state = State.from_dict(new_state)
 
                 domain = to_state.domain
 
@@ -374,9 +413,11 @@ def _generate_filter_from_config(config):
 
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
-    from homeassistant.components.recorder.models import Events, States
+    from homeassistant.components.recorder.models import (
+        Events, States, StateAttributes, datetime_to_timestamp)
     from homeassistant.components.recorder.util import (
         execute, session_scope)
+    from sqlalchemy import case, literal
 
     entities_filter = _generate_filter_from_config(config)
 
@@ -386,20 +427,110 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
         else:
             entity_ids = _get_related_entity_ids(session, entities_filter)
 
-        query = session.query(Events).order_by(Events.time_fired) \
+        start_day_ts = datetime_to_timestamp(start_day)
+        end_day_ts = datetime_to_timestamp(end_day)
+
+        # The event data of state changes is not loaded, the columns of
+        # the state and its shared attributes have all that is needed.
+        # New entities, removed entities and attribute only changes are
+        # filtered out by the database.
+        query = session.query(
+            Events.event_type,
+            case([(Events.event_type == EVENT_STATE_CHANGED, literal(None))],
+                 else_=Events.event_data).label('event_data'),
+            Events.time_fired_ts, Events.context_id, Events.context_user_id,
+            States.entity_id, States.state, States.attributes_id,
+            States.attributes, StateAttributes.shared_attrs
+        ).order_by(Events.time_fired_ts) \
             .outerjoin(States, (Events.event_id == States.event_id)) \
+            .outerjoin(StateAttributes, (
+                States.attributes_id == StateAttributes.attributes_id)) \
             .filter(Events.event_type.in_(ALL_EVENT_TYPES)) \
-            .filter((Events.time_fired > start_day)
-                    & (Events.time_fired < end_day)) \
-            .filter(((States.last_updated == States.last_changed) &
-                     States.entity_id.in_(entity_ids))
+            .filter((Events.time_fired_ts > start_day_ts)
+                    & (Events.time_fired_ts < end_day_ts)) \
+            .filter(((States.last_updated_ts == States.last_changed_ts) &
+                     States.entity_id.in_(entity_ids) &
+                     States.old_state_id.isnot(None) &
+                     (States.state != ''))
                     | (States.state_id.is_(None)))
 
-        events = execute(query)
+        events = execute(query, _row_to_event_converter())
 
     return humanify(hass, _exclude_events(events, entities_filter))
 
 
+class _LogbookEvent:
+    """Event of a logbook row that decodes its data when needed."""
+
+    __slots__ = ['event_type', 'time_fired', 'context', '_event_data',
+                 '_data']
+
+    def __init__(self, row, new_state=None):
+        """Initialize the event."""
+        self.event_type = row.event_type
+        self.time_fired = dt_util.utc_from_timestamp(row.time_fired_ts)
+        self.context = Context(id=row.context_id,
+                               user_id=row.context_user_id)
+        if new_state is None:
+            self._event_data = row.event_data
+            self._data = None
+        else:
+            self._event_data = None
+            self._data = {
+                'entity_id': new_state.entity_id,
+                'new_state': new_state,
+            }
+
+    @property
+    def data(self):
+        """Return the event data."""
+        if self._data is None:
+            try:
+                self._data = json.loads(self._event_data)
+            except (TypeError, ValueError):
+                self._data = {}
+        return self._data
+
+
+def _row_to_event_converter():
+    """Return a function converting logbook rows to events.
+
+    Rows of hidden entities and of invalid states are converted to None.
+    Shared attributes are decoded once for all rows that use them.
+    """
+    attributes_cache = {}
+
+    def row_to_event(row):
+        """Convert a logbook row to an event."""
+        if row.entity_id is None:
+            return _LogbookEvent(row)
+
+        attributes = attributes_cache.get(row.attributes_id)
+        if attributes is None:
+            try:
+                attributes = json.loads(row.shared_attrs or row.attributes)
+            except (TypeError, ValueError):
+                attributes = {}
+            if row.attributes_id is not None:
+                attributes_cache[row.attributes_id] = attributes
+
+        # Filter auto groups and entities which are customized hidden
+        if attributes.get(ATTR_HIDDEN, False) or \
+                (attributes.get('auto', False) and
+                 row.entity_id.startswith('group.')):
+            return None
+
+        try:
+            new_state = State(row.entity_id, row.state, attributes)
+        except (InvalidEntityFormatError, InvalidStateError) as err:
+            _LOGGER.warning("Skipping invalid logbook row: %s", err)
+            return None
+
+        return _LogbookEvent(row, new_state)
+
+    return row_to_event
+
+
 def _exclude_events(events, entities_filter):
     filtered_events = []
     for event in events:
@@ -411,12 +542,18 @@ def _exclude_events(events, entities_filter):
             if entity_id is None:
                 continue
 
+            new_state = event.data.get('new_state')
+
+            # Rows of the logbook query were already filtered
+            if isinstance(new_state, State):
+                if entities_filter(entity_id):
+                    filtered_events.append(event)
+                continue
+
             # Do not report on new entities
             if event.data.get('old_state') is None:
                 continue
 
-            new_state = event.data.get('new_state')
-
             # Do not report on entity removal
             if not new_state:
                 continue
@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/mqtt/
 """
 import asyncio
+from collections import deque
 from itertools import groupby
 import logging
 from operator import attrgetter
@@ -12,7 +13,8 @@ import os
 import socket
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union, cast  # noqa: F401
+from typing import (  # noqa: F401
+    Any, Callable, Dict, List, Optional, Union, cast)
 
 import attr
 import requests.certs
@@ -566,6 +568,86 @@ class Subscription:
     encoding = attr.ib(type=str, default='utf-8')
 
 
+# Marks a payload that can not be decoded with an encoding
+_UNDECODABLE = object()
+
+
+class _TopicNode:
+    """Level of a topic in the subscription index."""
+
+    __slots__ = ('children', 'subscriptions')
+
+    def __init__(self) -> None:
+        """Initialize the topic level."""
+        self.children = {}  # type: Dict[str, _TopicNode]
+        self.subscriptions = []  # type: List[Subscription]
+
+
+class SubscriptionIndex:
+    """Trie of subscriptions by the levels of their topic filter.
+
+    Matching a topic visits at most the levels of the topic, plus their
+    single and multi level wildcards.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the subscription index."""
+        self._root = _TopicNode()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the index."""
+        node = self._root
+        for level in subscription.topic.split('/'):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions.append(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription from the index."""
+        path = [self._root]
+        for level in subscription.topic.split('/'):
+            path.append(path[-1].children[level])
+        path[-1].subscriptions.remove(subscription)
+
+        # Drop levels without subscriptions below them
+        levels = subscription.topic.split('/')
+        while len(path) > 1 and not path[-1].subscriptions and \
+                not path[-1].children:
+            path.pop()
+            del path[-1].children[levels[len(path) - 1]]
+
+    def match(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions that match a topic.
+
+        Wildcards at the first level do not match topics starting with $.
+        """
+        levels = topic.split('/')
+        count = len(levels)
+        normal = not topic.startswith('$')
+        matches = []  # type: List[Subscription]
+        nodes = [(self._root, 0)]
+
+        while nodes:
+            node, index = nodes.pop()
+            wildcards = normal or index > 0
+
+            if index == count:
+                matches.extend(node.subscriptions)
+            else:
+                child = node.children.get(levels[index])
+                if child is not None:
+                    nodes.append((child, index + 1))
+                if wildcards and '+' in node.children:
+                    nodes.append((node.children['+'], index + 1))
+
+            if wildcards and '#' in node.children:
+                matches.extend(node.children['#'].subscriptions)
+
+        return matches
+
+
 @attr.s(slots=True, frozen=True)
 class Message:
     """MQTT Message."""
@@ -595,6 +677,9 @@ class MQTT:
         self.port = port
         self.keepalive = keepalive
         self.subscriptions = []  # type: List[Subscription]
+        self._subscription_index = SubscriptionIndex()
+        self._pending_messages = deque()  # type: deque
+        self._drain_scheduled = False
         self.birth_message = birth_message
         self._mqttc = None  # type: mqtt.Client
         self._paho_lock = asyncio.Lock(loop=hass.loop)
@@ -684,6 +769,7 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_index.add(subscription)
 
         await self._async_perform_subscription(topic, qos)
 
@@ -693,6 +779,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_index.remove(subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -750,26 +837,50 @@ class MQTT:
                 self.async_publish(*attr.astuple(self.birth_message)))
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and the event loop is woken up once to handle
+        all messages that arrive until it gets to them.
+        """
+        self._pending_messages.append(msg)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_messages)
+
+    @callback
+    def _mqtt_handle_messages(self) -> None:
+        """Handle the buffered messages."""
+        # Reset first, messages added while draining schedule a new drain
+        self._drain_scheduled = False
+        pending = self._pending_messages
+        while pending:
+            msg = pending.popleft()
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on %s", msg.topic)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
         _LOGGER.debug("Received message on %s: %s", msg.topic, msg.payload)
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        # Payload decoded per encoding, shared by the subscriptions
+        payloads = {None: msg.payload}  # type: Dict[Optional[str], Any]
 
-            payload = msg.payload  # type: SubscribePayloadType
-            if subscription.encoding is not None:
+        for subscription in self._subscription_index.match(msg.topic):
+            encoding = subscription.encoding
+            if encoding not in payloads:
                 try:
-                    payload = msg.payload.decode(subscription.encoding)
+                    payloads[encoding] = msg.payload.decode(encoding)
                 except (AttributeError, UnicodeDecodeError):
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s",
-                        msg.payload, msg.topic, subscription.encoding)
-                    continue
+                        msg.payload, msg.topic, encoding)
+                    payloads[encoding] = _UNDECODABLE
+
+            payload = payloads[encoding]  # type: SubscribePayloadType
+            if payload is _UNDECODABLE:
+                continue
 
             self.hass.async_run_job(
                 subscription.callback, msg.topic, payload, msg.qos)
@@ -808,18 +919,6 @@ def _raise_on_error(result_code: int) -> None:
             'Error talking to MQTT: {}'.format(mqtt.error_string(result_code)))
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    from paho.mqtt.matcher import MQTTMatcher
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAvailability(Entity):
     """Mixin used for platforms that report availability."""
 
@@ -5,6 +5,8 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/mqtt/#discovery
 """
 import asyncio
+from collections import OrderedDict
+import hashlib
 import json
 import logging
 import re
@@ -59,6 +61,9 @@ CONFIG_ENTRY_IS_SETUP = 'mqtt_config_entry_is_setup'
 MQTT_DISCOVERY_UPDATED = 'mqtt_discovery_updated_{}'
 MQTT_DISCOVERY_NEW = 'mqtt_discovery_new_{}_{}'
 
+# Seconds config payloads are collected before they are applied together
+DISCOVERY_DEBOUNCE = 0.1
+
 TOPIC_BASE = '~'
 
 ABBREVIATIONS = {
@@ -168,11 +173,23 @@ ABBREVIATIONS = {
 }
 
 
+def _payload_fingerprint(payload):
+    """Return a hash of a normalized discovery payload."""
+    return hashlib.sha1(json.dumps(
+        payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
 async def async_start(hass: HomeAssistantType, discovery_topic, hass_config,
                       config_entry=None) -> bool:
     """Initialize of MQTT Discovery."""
+    # Payloads received during the current window by discovery hash, only
+    # the last payload of a component is applied
+    pending = OrderedDict()
+    flush_scheduled = False
+
     async def async_device_message_received(topic, payload, qos):
         """Process the received message."""
+        nonlocal flush_scheduled
         match = TOPIC_MATCHER.match(topic)
 
         if not match:
@@ -230,35 +247,78 @@ async def async_start(hass: HomeAssistantType, discovery_topic, hass_config,
 
             payload[ATTR_DISCOVERY_HASH] = discovery_hash
 
-        if ALREADY_DISCOVERED not in hass.data:
-            hass.data[ALREADY_DISCOVERED] = {}
-        if discovery_hash in hass.data[ALREADY_DISCOVERED]:
-            # Dispatch update
-            _LOGGER.info(
-                "Component has already been discovered: %s %s, sending update",
-                component, discovery_id)
-            async_dispatcher_send(
-                hass, MQTT_DISCOVERY_UPDATED.format(discovery_hash), payload)
-        elif payload:
-            # Add component
-            _LOGGER.info("Found new component: %s %s", component, discovery_id)
-            hass.data[ALREADY_DISCOVERED][discovery_hash] = None
-
-            if platform not in CONFIG_ENTRY_PLATFORMS.get(component, []):
-                await async_load_platform(
+        fingerprint = _payload_fingerprint(payload)
+        pending.pop(discovery_hash, None)
+
+        if hass.data[ALREADY_DISCOVERED].get(discovery_hash) == fingerprint:
+            # Brokers and devices resend their config, e.g. on reconnect
+            _LOGGER.debug("Discovery payload of %s %s is unchanged",
+                          component, discovery_id)
+            return
+
+        pending[discovery_hash] = (payload, fingerprint)
+
+        if not flush_scheduled:
+            flush_scheduled = True
+            hass.async_create_task(async_process_pending())
+
+    async def async_process_pending():
+        """Apply the payloads collected during the discovery window."""
+        nonlocal flush_scheduled
+        await asyncio.sleep(DISCOVERY_DEBOUNCE, loop=hass.loop)
+        flush_scheduled = False
+
+        discovered = hass.data[ALREADY_DISCOVERED]
+        new_payloads = OrderedDict()
+
+        while pending:
+            discovery_hash, (payload, fingerprint) = pending.popitem(
+                last=False)
+            component, discovery_id = discovery_hash
+
+            if discovery_hash in discovered:
+                # Dispatch update
+                _LOGGER.info("Component has already been discovered: %s %s, "
+                             "sending update", component, discovery_id)
+                discovered[discovery_hash] = fingerprint
+                async_dispatcher_send(
+                    hass, MQTT_DISCOVERY_UPDATED.format(discovery_hash),
+                    payload)
+            elif payload:
+                # Add component
+                _LOGGER.info("Found new component: %s %s",
+                             component, discovery_id)
+                discovered[discovery_hash] = fingerprint
+                new_payloads.setdefault(
+                    (component, payload[CONF_PLATFORM]), []).append(payload)
+
+        for (component, platform), payloads in new_payloads.items():
+            hass.async_create_task(
+                async_add_components(component, platform, payloads))
+
+    async def async_add_components(component, platform, payloads):
+        """Set up the components discovered for a platform."""
+        if platform not in CONFIG_ENTRY_PLATFORMS.get(component, []):
+            await asyncio.wait([
+                async_load_platform(
                     hass, component, platform, payload, hass_config)
-                return
+                for payload in payloads], loop=hass.loop)
+            return
 
-            config_entries_key = '{}.{}'.format(component, platform)
-            async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
-                if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
-                    await hass.config_entries.async_forward_entry_setup(
-                        config_entry, component)
-                    hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
+        config_entries_key = '{}.{}'.format(component, platform)
+        async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
+            if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
+                await hass.config_entries.async_forward_entry_setup(
+                    config_entry, component)
+                hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
 
+        # The entities created in response are added to the entity
+        # platform together, see EntityPlatform.async_add_entities
+        for payload in payloads:
             async_dispatcher_send(hass, MQTT_DISCOVERY_NEW.format(
                 component, platform), payload)
 
+    hass.data.setdefault(ALREADY_DISCOVERED, {})
     hass.data[DATA_CONFIG_ENTRY_LOCK] = asyncio.Lock()
     hass.data[CONFIG_ENTRY_IS_SETUP] = set()
 
@@ -17,7 +17,6 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.core import EventOrigin, State
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.json import JSONEncoder
 
 DOMAIN = 'mqtt_eventstream'
 DEPENDENCIES = ['mqtt']
@@ -79,8 +78,9 @@ def async_setup(hass, config):
         if event.event_type == EVENT_SERVICE_EXECUTED:
             return
 
-        event_info = {'event_type': event.event_type, 'event_data': event.data}
-        msg = json.dumps(event_info, cls=JSONEncoder)
+        # The event data is encoded once and shared with the other consumers
+        msg = '{{"event_type": {}, "event_data": {}}}'.format(
+            json.dumps(event.event_type), event.data_json)
         mqtt.async_publish(pub_topic, msg)
 
     # Only listen for local events if you are going to publish them.
@@ -104,6 +104,8 @@ class Proximity(Entity):
         self.tolerance = tolerance
         self.proximity_zone = proximity_zone
         self._unit_of_measurement = unit_of_measurement
+        # Last measured location and distance to the zone by device
+        self._distances = {}
 
     @property
     def name(self):
@@ -128,6 +130,19 @@ class Proximity(Entity):
             ATTR_NEAREST: self.nearest,
         }
 
+    def _distance_to_zone(self, device, zone_latitude, zone_longitude,
+                          latitude, longitude):
+        """Return the distance of a device, measuring each location once."""
+        location = (zone_latitude, zone_longitude, latitude, longitude)
+        last = self._distances.get(device)
+
+        if last is not None and last[0] == location:
+            return last[1]
+
+        dist = distance(*location)
+        self._distances[device] = (location, dist)
+        return dist
+
     def check_proximity_state_change(self, entity, old_state, new_state):
         """Perform the proximity checking."""
         entity_name = new_state.name
@@ -176,6 +191,9 @@ class Proximity(Entity):
         if 'latitude' not in new_state.attributes:
             return
 
+        # Distance at the previous location of the device that moved.
+        last_distance = self._distances.get(entity)
+
         # Collect distances to the zone for all devices.
         distances_to_zone = {}
         for device in self.proximity_devices:
@@ -189,10 +207,10 @@ class Proximity(Entity):
                 continue
 
             # Calculate the distance to the proximity zone.
-            dist_to_zone = distance(proximity_latitude,
-                                    proximity_longitude,
-                                    device_state.attributes['latitude'],
-                                    device_state.attributes['longitude'])
+            dist_to_zone = self._distance_to_zone(
+                device, proximity_latitude, proximity_longitude,
+                device_state.attributes['latitude'],
+                device_state.attributes['longitude'])
 
             # Add the device and distance to a dictionary.
             distances_to_zone[device] = round(
@@ -230,12 +248,17 @@ class Proximity(Entity):
         distance_travelled = 0
 
         # Calculate the distance travelled.
-        old_distance = distance(proximity_latitude, proximity_longitude,
-                                old_state.attributes['latitude'],
-                                old_state.attributes['longitude'])
-        new_distance = distance(proximity_latitude, proximity_longitude,
-                                new_state.attributes['latitude'],
-                                new_state.attributes['longitude'])
+        old_location = (proximity_latitude, proximity_longitude,
+                        old_state.attributes['latitude'],
+                        old_state.attributes['longitude'])
+        if last_distance is not None and last_distance[0] == old_location:
+            old_distance = last_distance[1]
+        else:
+            old_distance = distance(*old_location)
+        new_distance = self._distance_to_zone(
+            entity, proximity_latitude, proximity_longitude,
+            new_state.attributes['latitude'],
+            new_state.attributes['longitude'])
         distance_travelled = round(new_distance - old_distance, 1)
 
         # Check for tolerance
@@ -8,7 +8,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -23,6 +23,7 @@ from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE,
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED, MATCH_ALL)
+from homeassistant.components import websocket_api
 from homeassistant.core import CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
@@ -30,7 +31,7 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 from homeassistant.loader import bind_hass
 
-from . import migration, purge
+from . import migration, purge, statistics
 from .const import DATA_INSTANCE
 from .util import session_scope
 
@@ -45,6 +46,11 @@ SERVICE_PURGE = 'purge'
 ATTR_KEEP_DAYS = 'keep_days'
 ATTR_REPACK = 'repack'
 
+WS_TYPE_INFO = 'recorder/info'
+SCHEMA_WS_INFO = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): WS_TYPE_INFO,
+})
+
 SERVICE_PURGE_SCHEMA = vol.Schema({
     vol.Optional(ATTR_KEEP_DAYS): vol.All(vol.Coerce(int), vol.Range(min=0)),
     vol.Optional(ATTR_REPACK, default=False): cv.boolean,
@@ -57,9 +63,26 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_KEEP_DAYS = 'purge_keep_days'
 CONF_PURGE_INTERVAL = 'purge_interval'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_MAX_BATCH_SIZE = 'max_batch_size'
+CONF_MAX_QUEUE_SIZE = 'max_queue_size'
+
+DEFAULT_COMMIT_INTERVAL = 0
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_MAX_QUEUE_SIZE = 50000
+
+# Events still queued when the queue is more than half full
+HIGH_PRIORITY_EVENT_TYPES = (
+    EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
 
 CONNECT_RETRY_WAIT = 3
 
+# Returned by Recorder._collect_batch when no task follows the batch
+_NOTHING_PENDING = object()
+
+# Number of attribute sets to keep the database id of in memory
+ATTRIBUTES_CACHE_SIZE = 2048
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
@@ -79,6 +102,12 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_INTERVAL, default=1):
             vol.All(vol.Coerce(int), vol.Range(min=0)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_MAX_QUEUE_SIZE, default=DEFAULT_MAX_QUEUE_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=100)),
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -115,6 +144,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    max_batch_size = conf.get(CONF_MAX_BATCH_SIZE, DEFAULT_MAX_BATCH_SIZE)
+    max_queue_size = conf.get(CONF_MAX_QUEUE_SIZE, DEFAULT_MAX_QUEUE_SIZE)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -125,7 +157,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass, keep_days=keep_days, purge_interval=purge_interval,
-        uri=db_url, include=include, exclude=exclude)
+        uri=db_url, include=include, exclude=exclude,
+        commit_interval=commit_interval, max_batch_size=max_batch_size,
+        max_queue_size=max_queue_size)
     instance.async_initialize()
     instance.start()
 
@@ -137,9 +171,25 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service,
         schema=SERVICE_PURGE_SCHEMA)
 
+    hass.components.websocket_api.async_register_command(
+        WS_TYPE_INFO, websocket_info, SCHEMA_WS_INFO)
+
     return await instance.async_db_ready
 
 
+@callback
+def websocket_info(hass, connection, msg):
+    """Return the recorder queue and commit statistics."""
+    instance = hass.data[DATA_INSTANCE]
+    connection.send_message(websocket_api.result_message(msg['id'], {
+        'queue_depth': instance.queue.qsize(),
+        'max_queue_size': instance.max_queue_size,
+        'dropped_events': instance.dropped_events,
+        'last_batch_size': instance.last_batch_size,
+        'last_commit_latency': instance.last_commit_latency,
+    }))
+
+
 PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack'])
 
 
@@ -148,13 +198,26 @@ class Recorder(threading.Thread):
 
     def __init__(self, hass: HomeAssistant, keep_days: int,
                  purge_interval: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.dropped_events = 0
+        self._overflowing = False
+        self.last_commit_latency = None  # type: Optional[float]
+        self.last_batch_size = 0
+        self._attributes_ids = OrderedDict()  # type: OrderedDict
+        self._old_state_ids = {}  # type: Dict[str, int]
+        self.statistics = statistics.StatisticsCompiler()
         self.queue = queue.Queue()  # type: Any
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -183,9 +246,8 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
+        from .models import Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -275,8 +337,12 @@ class Recorder(threading.Thread):
 
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
+        pending = _NOTHING_PENDING
         while True:
-            event = self.queue.get()
+            if pending is _NOTHING_PENDING:
+                event = self.queue.get()
+            else:
+                event, pending = pending, _NOTHING_PENDING
 
             if event is None:
                 self._close_run()
@@ -284,54 +350,260 @@ class Recorder(threading.Thread):
                 self.queue.task_done()
                 return
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
-                self.queue.task_done()
-                continue
-            elif event.event_type == EVENT_TIME_CHANGED:
+                event = purge.PurgeRun(self, event.keep_days, event.repack)
+            if isinstance(event, purge.PurgeRun):
+                # Requeue unfinished purges so events queued in the meantime
+                # are written before the next chunk is deleted
+                if not event.run_chunk():
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
-            elif event.event_type in self.exclude_t:
+
+            batch, pending = self._collect_batch(event)
+            self._commit_batch(batch)
+
+            for _ in batch:
                 self.queue.task_done()
-                continue
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    self.queue.task_done()
-                    continue
-
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        dbevent = Events.from_event(event)
-                        session.add(dbevent)
-                        session.flush()
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            dbstate = States.from_event(event)
-                            dbstate.event_id = dbevent.event_id
-                            session.add(dbstate)
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
-
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
-
-            self.queue.task_done()
+    def _collect_batch(self, event):
+        """Drain the queue into a batch of events to commit together.
+
+        Collecting stops when the batch is full, the commit interval has
+        passed or a shutdown/purge task is found. That task is returned so
+        it can be handled after the batch has been committed, otherwise
+        _NOTHING_PENDING is returned.
+        """
+        batch = [event]
+        deadline = time.monotonic() + self.commit_interval
+
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    event = self.queue.get(timeout=remaining)
+                else:
+                    event = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if event is None or isinstance(
+                    event, (PurgeTask, purge.PurgeRun)):
+                return batch, event
+
+            batch.append(event)
+
+        return batch, _NOTHING_PENDING
+
+    def _commit_batch(self, events):
+        """Write a batch of events to the database in one transaction."""
+        from sqlalchemy import exc
+
+        tries = 1
+        updated = False
+        start = time.perf_counter()
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                with session_scope(session=self.get_session()) as session:
+                    self._insert_events(session, events)
+                updated = True
+
+            except exc.OperationalError as err:
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                # Rows added in the failed transaction were rolled back
+                self.clear_attributes_cache()
+                self._old_state_ids.clear()
+                self.statistics.clear()
+                tries += 1
+
+            except exc.SQLAlchemyError as err:
+                # Retrying does not help, drop the batch but keep recording
+                _LOGGER.error("Error saving events: %s", err)
+                self.clear_attributes_cache()
+                self._old_state_ids.clear()
+                self.statistics.clear()
+                return
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save "
+                          "after %d tries. Giving up", tries)
+            return
+
+        self.last_commit_latency = time.perf_counter() - start
+        self.last_batch_size = len(events)
+        _LOGGER.debug("Committed %d events in %.4fs, %d queued",
+                      self.last_batch_size, self.last_commit_latency,
+                      self.queue.qsize())
+
+    def _insert_events(self, session, events):
+        """Bulk insert events and their states with executemany.
+
+        The recorder is the only writer, so event and state ids are
+        allocated up front from the current maximum. This links states to
+        their events and previous states without flushing every row to
+        learn its id.
+        """
+        from .models import States, Events, datetime_to_timestamp
+        from sqlalchemy import func
+
+        next_id = (session.query(func.max(Events.event_id)).scalar() or 0) + 1
+        next_state_id = None
+        event_rows = []
+        state_rows = []
+
+        for event in events:
+            event_row = Events.params_from_event(event)
+            event_row['event_id'] = next_id
+            event_rows.append(event_row)
+
+            if event.event_type == EVENT_STATE_CHANGED:
+                state_row = States.params_from_event(event)
+                state_row['event_id'] = next_id
+                self.statistics.add(
+                    session, state_row['entity_id'], state_row['state'],
+                    datetime_to_timestamp(state_row['last_updated']))
+                state_row['attributes_id'] = self._get_attributes_id(
+                    session, state_row['attributes'])
+                state_row['attributes'] = None
+
+                if next_state_id is None:
+                    next_state_id = (session.query(
+                        func.max(States.state_id)).scalar() or 0) + 1
+                state_row['state_id'] = next_state_id
+                state_row['old_state_id'] = self._get_old_state_id(
+                    session, event)
+                if event.data.get('new_state') is None:
+                    self._old_state_ids.pop(state_row['entity_id'], None)
+                else:
+                    self._old_state_ids[state_row['entity_id']] = \
+                        next_state_id
+                next_state_id += 1
+
+                state_rows.append(state_row)
+
+            next_id += 1
+
+        session.execute(Events.__table__.insert(), event_rows)
+        last_ids = {('events', 'event_id'): next_id - 1}
+        if state_rows:
+            session.execute(States.__table__.insert(), state_rows)
+            last_ids[('states', 'state_id')] = next_state_id - 1
+            self.statistics.flush(session)
+
+        self._advance_sequences(session, last_ids)
+
+    def _advance_sequences(self, session, last_ids):
+        """Move the id sequences past ids that were inserted explicitly.
+
+        MySQL and SQLite move their auto increment counters on inserts
+        with explicit ids, PostgreSQL sequences have to be set so inserts
+        outside of the recorder do not reuse the ids.
+        """
+        from sqlalchemy import text
+
+        if self.engine.dialect.name != 'postgresql':
+            return
+
+        for (table, column), last_id in last_ids.items():
+            session.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table, "
+                     ":column), :last_id)"),
+                {'table': table, 'column': column, 'last_id': last_id})
+
+    def _get_old_state_id(self, session, event):
+        """Return the id of the previous state of a state change."""
+        from .models import States
+
+        if event.data.get('old_state') is None:
+            return None
+
+        entity_id = event.data['entity_id']
+        old_state_id = self._old_state_ids.get(entity_id)
+        if old_state_id is None:
+            # The previous state was recorded before the recorder started
+            row = session.query(States.state_id).filter(
+                States.entity_id == entity_id).order_by(
+                    States.state_id.desc()).first()
+            if row is not None:
+                old_state_id = row.state_id
+
+        return old_state_id
+
+    def _get_attributes_id(self, session, shared_attrs):
+        """Return the id of the stored attributes, adding them if new."""
+        from .models import StateAttributes
+
+        attributes_id = self._attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        for row in session.query(StateAttributes).filter(
+                StateAttributes.hash == attr_hash):
+            if row.shared_attrs == shared_attrs:
+                attributes_id = row.attributes_id
+                break
+        else:
+            result = session.execute(StateAttributes.__table__.insert(), {
+                'hash': attr_hash,
+                'shared_attrs': shared_attrs,
+            })
+            attributes_id = result.inserted_primary_key[0]
+
+        self._attributes_ids[shared_attrs] = attributes_id
+        if len(self._attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
+
+        return attributes_id
+
+    def clear_attributes_cache(self):
+        """Forget cached attribute ids after they may have been removed."""
+        self._attributes_ids.clear()
+
+    def _should_record(self, event):
+        """Return if an event should be written to the database."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return False
+        if event.event_type in self.exclude_t:
+            return False
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        if entity_id is not None and not self.entity_filter(entity_id):
+            return False
+
+        return True
 
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
+        """Listen for new events and put them in the process queue.
+
+        Once the queue grows past half of its maximum size only high
+        priority events are queued, when it is full all events are dropped.
+        """
+        if not self._should_record(event):
+            return
+
+        queue_depth = self.queue.qsize()
+        if queue_depth >= self.max_queue_size or (
+                queue_depth >= self.max_queue_size // 2 and
+                event.event_type not in HIGH_PRIORITY_EVENT_TYPES):
+            if not self._overflowing:
+                self._overflowing = True
+                _LOGGER.warning("The recorder queue reached %d events, "
+                                "dropping events until the database "
+                                "catches up", queue_depth)
+            self.dropped_events += 1
+            return
+
+        if self._overflowing and queue_depth < self.max_queue_size // 4:
+            self._overflowing = False
+            _LOGGER.info("The recorder queue recovered, %d events were "
+                         "dropped so far", self.dropped_events)
+
         self.queue.put(event)
 
     def block_till_done(self):
@@ -6,6 +6,8 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 PROGRESS_FILE = '.migration_progress'
+# Number of rows converted per transaction when filling new columns
+MIGRATION_CHUNK_SIZE = 10000
 
 
 def migrate_schema(instance):
@@ -173,6 +175,87 @@ def _add_columns(engine, table_name, columns_def):
                             column_def.split(' ')[1], table_name)
 
 
+def _fill_timestamp_columns(engine, table_name, id_column, columns):
+    """Fill float timestamp columns from their datetime columns.
+
+    Rows are converted in chunks to keep transactions small. `columns` maps
+    each timestamp column to the datetime column it is derived from.
+    """
+    from sqlalchemy import Table, bindparam
+    from . import models
+
+    _LOGGER.info("Filling timestamp columns of table %s. Note: this can "
+                 "take several minutes on large databases and slow "
+                 "computers. Please be patient!", table_name)
+
+    table = Table(table_name, models.Base.metadata)
+    row_id = table.c[id_column]
+    first_ts_column = table.c[next(iter(columns))]
+    select = table.select().with_only_columns(
+        [row_id] + [table.c[source] for source in columns.values()]
+    ).where(first_ts_column.is_(None)).where(row_id > bindparam('last_id')) \
+        .order_by(row_id).limit(MIGRATION_CHUNK_SIZE)
+    update = table.update()  # pylint: disable=no-value-for-parameter
+    update = update.where(row_id == bindparam('row_id')).values({
+        target: bindparam('new_' + target) for target in columns})
+
+    last_id = 0
+    while True:
+        rows = engine.execute(select, last_id=last_id).fetchall()
+        if not rows:
+            break
+
+        engine.execute(update, [
+            dict(row_id=row[id_column], **{
+                'new_' + target: models.datetime_to_timestamp(row[source])
+                for target, source in columns.items()})
+            for row in rows])
+        last_id = rows[-1][id_column]
+
+
+def _fill_old_state_ids(engine):
+    """Link existing states to the previous state of their entity.
+
+    Rows are linked in chunks in the order they were recorded. Restarts
+    are not known for existing rows, only removed entities start anew.
+    """
+    from sqlalchemy import Table, bindparam
+    from . import models
+
+    _LOGGER.info("Linking states to their previous state. Note: this can "
+                 "take several minutes on large databases and slow "
+                 "computers. Please be patient!")
+
+    table = Table('states', models.Base.metadata)
+    select = table.select().with_only_columns(
+        [table.c.state_id, table.c.entity_id, table.c.state]
+    ).where(table.c.state_id > bindparam('last_id')) \
+        .order_by(table.c.state_id).limit(MIGRATION_CHUNK_SIZE)
+    update = table.update()  # pylint: disable=no-value-for-parameter
+    update = update.where(table.c.state_id == bindparam('row_id')).values(
+        old_state_id=bindparam('new_old_state_id'))
+
+    previous = {}
+    last_id = 0
+    while True:
+        rows = engine.execute(select, last_id=last_id).fetchall()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            old_state_id = previous.get(row.entity_id)
+            if old_state_id is not None:
+                params.append({'row_id': row.state_id,
+                               'new_old_state_id': old_state_id})
+            # An empty state is recorded when an entity is removed
+            previous[row.entity_id] = row.state_id if row.state else None
+
+        if params:
+            engine.execute(update, params)
+        last_id = rows[-1].state_id
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -220,6 +303,41 @@ def _apply_update(engine, new_version, old_version):
         _create_index(engine, "states", "ix_states_context_user_id")
     elif new_version == 7:
         _create_index(engine, "states", "ix_states_entity_id")
+    elif new_version == 8:
+        # The state_attributes table itself is created by create_all.
+        # Existing rows keep their inline attributes.
+        _add_columns(engine, "states", [
+            'attributes_id INTEGER',
+        ])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 9:
+        _add_columns(engine, "events", [
+            'time_fired_ts DOUBLE PRECISION',
+        ])
+        _add_columns(engine, "states", [
+            'last_changed_ts DOUBLE PRECISION',
+            'last_updated_ts DOUBLE PRECISION',
+        ])
+        _fill_timestamp_columns(engine, "events", "event_id", {
+            'time_fired_ts': 'time_fired',
+        })
+        _fill_timestamp_columns(engine, "states", "state_id", {
+            'last_changed_ts': 'last_changed',
+            'last_updated_ts': 'last_updated',
+        })
+        _create_index(engine, "events", "ix_events_time_fired_ts")
+        _create_index(engine, "states", "ix_states_last_updated_ts")
+        _create_index(
+            engine, "states", "ix_states_entity_id_last_updated_ts")
+    elif new_version == 10:
+        # The statistics table is created by create_all. It is only filled
+        # with new states, existing rows are not aggregated.
+        pass
+    elif new_version == 11:
+        _add_columns(engine, "states", [
+            'old_state_id INTEGER',
+        ])
+        _fill_old_state_ids(engine)
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
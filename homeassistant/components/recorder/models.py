@@ -2,25 +2,40 @@
 import json
 from datetime import datetime
 import logging
+import zlib
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer,
+    String, Text, distinct)
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import (
     Context, Event, EventOrigin, State, split_entity_id)
-from homeassistant.helpers.json import JSONEncoder
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 11
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds since epoch, MySQL FLOAT is not precise enough for microseconds
+TIMESTAMP_TYPE = Float().with_variant(mysql.DOUBLE(asdecimal=False), 'mysql')
+
+
+def _timestamp_default(column):
+    """Return a column default deriving a timestamp from a datetime."""
+    def default(context):
+        """Convert the datetime inserted into the named column."""
+        return datetime_to_timestamp(
+            context.current_parameters.get(column))
+
+    return default
+
 
 class Events(Base):  # type: ignore
     """Event history data."""
@@ -31,19 +46,31 @@ class Events(Base):  # type: ignore
     event_data = Column(Text)
     origin = Column(String(32))
     time_fired = Column(DateTime(timezone=True), index=True)
+    time_fired_ts = Column(
+        TIMESTAMP_TYPE, index=True, default=_timestamp_default('time_fired'))
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
 
+    @staticmethod
+    def params_from_event(event):
+        """Return the column values for a native event.
+
+        Used to insert events in bulk without building ORM objects.
+        """
+        return {
+            'event_type': event.event_type,
+            'event_data': event.data_json,
+            'origin': str(event.origin),
+            'time_fired': event.time_fired,
+            'context_id': event.context.id,
+            'context_user_id': event.context.user_id,
+        }
+
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
-        return Events(event_type=event.event_type,
-                      event_data=json.dumps(event.data, cls=JSONEncoder),
-                      origin=str(event.origin),
-                      time_fired=event.time_fired,
-                      context_id=event.context.id,
-                      context_user_id=event.context.user_id)
+        return Events(**Events.params_from_event(event))
 
     def to_native(self):
         """Convert to a natve HA Event."""
@@ -56,7 +83,7 @@ class Events(Base):  # type: ignore
                 self.event_type,
                 json.loads(self.event_data),
                 EventOrigin(self.origin),
-                _process_timestamp(self.time_fired),
+                _process_timestamp(self.time_fired, self.time_fired_ts),
                 context=context,
             )
         except ValueError:
@@ -75,48 +102,74 @@ class States(Base):   # type: ignore
     state = Column(String(255))
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey('state_attributes.attributes_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
+    last_changed_ts = Column(
+        TIMESTAMP_TYPE, default=_timestamp_default('last_changed'))
+    last_updated_ts = Column(
+        TIMESTAMP_TYPE, index=True, default=_timestamp_default('last_updated'))
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
+    # Id of the previous state of the entity, None if the entity was added.
+    # Not a foreign key, purging may remove the previous state.
+    old_state_id = Column(Integer)
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
         Index(
             'ix_states_entity_id_last_updated', 'entity_id', 'last_updated'),
+        Index(
+            'ix_states_entity_id_last_updated_ts', 'entity_id',
+            'last_updated_ts'),
     )
 
+    # Shared attributes are always loaded with the state in the same query
+    state_attributes = relationship('StateAttributes', lazy='joined')
+
     @staticmethod
-    def from_event(event):
-        """Create object from a state_changed event."""
+    def params_from_event(event):
+        """Return the column values for a state_changed event.
+
+        Used to insert states in bulk without building ORM objects.
+        """
         entity_id = event.data['entity_id']
         state = event.data.get('new_state')
 
-        dbstate = States(
-            entity_id=entity_id,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-        )
+        params = {
+            'entity_id': entity_id,
+            'context_id': event.context.id,
+            'context_user_id': event.context.user_id,
+        }
 
         # State got deleted
         if state is None:
-            dbstate.state = ''
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = '{}'
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
+            params.update(
+                state='',
+                domain=split_entity_id(entity_id)[0],
+                attributes='{}',
+                last_changed=event.time_fired,
+                last_updated=event.time_fired,
+            )
         else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes),
-                                            cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            params.update(
+                domain=state.domain,
+                state=state.state,
+                attributes=state.attributes_json,
+                last_changed=state.last_changed,
+                last_updated=state.last_updated,
+            )
 
-        return dbstate
+        return params
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        return States(**States.params_from_event(event))
 
     def to_native(self):
         """Convert to an HA state object."""
@@ -125,11 +178,15 @@ class States(Base):   # type: ignore
             user_id=self.context_user_id
         )
         try:
+            if self.state_attributes is not None:
+                attributes = self.state_attributes.shared_attrs
+            else:
+                attributes = self.attributes
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
-                _process_timestamp(self.last_changed),
-                _process_timestamp(self.last_updated),
+                json.loads(attributes),
+                _process_timestamp(self.last_changed, self.last_changed_ts),
+                _process_timestamp(self.last_updated, self.last_updated_ts),
                 context=context,
             )
         except ValueError:
@@ -138,6 +195,51 @@ class States(Base):   # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """Attributes shared by many states."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up JSON encoded attributes."""
+        return zlib.crc32(shared_attrs.encode('utf-8'))
+
+
+class Statistics(Base):   # type: ignore
+    """Aggregated numeric states of an entity over a period."""
+
+    __tablename__ = 'statistics'
+    statistic_id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    duration = Column(Integer)
+    start_ts = Column(TIMESTAMP_TYPE)
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+
+    __table_args__ = (
+        Index('ix_statistics_entity_id_duration_start_ts',
+              'entity_id', 'duration', 'start_ts', unique=True),
+    )
+
+    def to_native(self):
+        """Return the statistic as a dictionary."""
+        return {
+            'start': self.start_ts,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'last': self.last,
+            'count': self.count,
+        }
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
@@ -186,8 +288,24 @@ class SchemaChanges(Base):   # type: ignore
     changed = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
-def _process_timestamp(ts):
-    """Process a timestamp into datetime object."""
+def datetime_to_timestamp(value):
+    """Convert a datetime to a timestamp, naive values are UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.UTC)
+
+    return value.timestamp()
+
+
+def _process_timestamp(ts, epoch=None):
+    """Process a timestamp into datetime object.
+
+    The float epoch is preferred when available, it avoids parsing and
+    localizing the datetime column.
+    """
+    if epoch is not None:
+        return datetime.fromtimestamp(epoch, dt_util.UTC)
     if ts is None:
         return None
     if ts.tzinfo is None:
@@ -1,6 +1,7 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
 import homeassistant.util.dt as dt_util
 
@@ -8,63 +9,186 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of ids covered by a single delete transaction
+PURGE_CHUNK_SIZE = 5000
+
 
 def purge_old_data(instance, purge_days, repack):
     """Purge events and states older than purge_days ago."""
-    from .models import States, Events
-    from sqlalchemy import func
-
-    purge_before = dt_util.utcnow() - timedelta(days=purge_days)
-    _LOGGER.debug("Purging events before %s", purge_before)
-
-    with session_scope(session=instance.get_session()) as session:
-        delete_states = session.query(States) \
-                            .filter((States.last_updated < purge_before))
+    purge_run = PurgeRun(instance, purge_days, repack)
+    while not purge_run.run_chunk():
+        pass
+
+
+class PurgeRun:
+    """Incremental purge of events and states older than purge_days ago.
+
+    Rows are deleted in bounded id ranges, each in its own transaction, so
+    the recorder can write queued events between two chunks.
+    """
+
+    def __init__(self, instance, purge_days, repack):
+        """Initialize the purge run."""
+        self.instance = instance
+        self.repack = repack
+        self.purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+        self.states_deleted = 0
+        self.events_deleted = 0
+        self._start = time.perf_counter()
+        self._steps = [self._purge_states, self._purge_events,
+                       self._purge_attributes]
+        self._next_id = None
+        self._last_id = None
+
+    @property
+    def rows_per_second(self):
+        """Return the average number of rows deleted per second."""
+        elapsed = time.perf_counter() - self._start
+        if not elapsed:
+            return 0
+        return (self.states_deleted + self.events_deleted) / elapsed
+
+    def run_chunk(self):
+        """Purge the next chunk of data. Return True when done."""
+        if self._steps:
+            with session_scope(session=self.instance.get_session()) as session:
+                if self._steps[0](session):
+                    self._steps.pop(0)
+                    self._next_id = self._last_id = None
+
+            _LOGGER.debug("Purged %s states and %s events before %s "
+                          "(%.0f rows/s)", self.states_deleted,
+                          self.events_deleted, self.purge_before,
+                          self.rows_per_second)
+            return False
+
+        self._finish()
+        return True
+
+    def _purge_states(self, session):
+        """Delete the next chunk of old states. Return True when done."""
+        from .models import States
+        from sqlalchemy import and_, exists, func
+        from sqlalchemy.orm import aliased
+
+        if self._next_id is None:
+            self._next_id, self._last_id = session.query(
+                func.min(States.state_id), func.max(States.state_id)
+            ).filter(States.last_updated < self.purge_before).one()
+
+            if self._next_id is None:
+                return True
+
+        chunk_end = self._next_id + PURGE_CHUNK_SIZE
 
         # For each entity, the most recent state is protected from deletion
         # s.t. we can properly restore state even if the entity has not been
-        # updated in a long time
-        protected_states = session.query(func.max(States.state_id)) \
-            .group_by(States.entity_id).all()
-
-        protected_state_ids = tuple(state[0] for state in protected_states)
-
-        if protected_state_ids:
-            delete_states = delete_states \
-                .filter(~States.state_id.in_(protected_state_ids))
-
-        deleted_rows = delete_states.delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s states", deleted_rows)
-
-        delete_events = session.query(Events) \
-            .filter((Events.time_fired < purge_before))
-
-        # We also need to protect the events belonging to the protected states.
-        # Otherwise, if the SQL server has "ON DELETE CASCADE" as default, it
-        # will delete the protected state when deleting its associated
-        # event. Also, we would be producing NULLed foreign keys otherwise.
-        if protected_state_ids:
-            protected_events = session.query(States.event_id) \
-                .filter(States.state_id.in_(protected_state_ids)) \
-                .filter(States.event_id.isnot(None)) \
-                .all()
-
-            protected_event_ids = tuple(state[0] for state in protected_events)
-
-            if protected_event_ids:
-                delete_events = delete_events \
-                    .filter(~Events.event_id.in_(protected_event_ids))
-
-        deleted_rows = delete_events.delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s events", deleted_rows)
-
-    # Execute sqlite vacuum command to free up space on disk
-    _LOGGER.debug("DB engine driver: %s", instance.engine.driver)
-    if repack and instance.engine.driver == 'pysqlite':
-        from sqlalchemy import exc
-
-        _LOGGER.debug("Vacuuming SQLite to free space")
-        try:
-            instance.engine.execute("VACUUM")
-        except exc.OperationalError as err:
-            _LOGGER.error("Error vacuuming SQLite: %s.", err)
+        # updated in a long time. A state is only deleted if a newer state of
+        # the same entity exists, which is answered by the entity_id index.
+        newer = aliased(States)
+        state_ids = [row[0] for row in session.query(States.state_id).filter(
+            (States.state_id >= self._next_id) &
+            (States.state_id < chunk_end) &
+            (States.state_id <= self._last_id) &
+            (States.last_updated < self.purge_before) &
+            exists().where(and_(
+                newer.entity_id == States.entity_id,
+                newer.state_id > States.state_id)))]
+
+        if state_ids:
+            self.states_deleted += session.query(States) \
+                .filter(States.state_id.in_(state_ids)) \
+                .delete(synchronize_session=False)
+
+        self._next_id = chunk_end
+        return chunk_end > self._last_id
+
+    def _purge_events(self, session):
+        """Delete the next chunk of old events. Return True when done."""
+        from .models import Events, States
+        from sqlalchemy import exists, func
+
+        if self._next_id is None:
+            self._next_id, self._last_id = session.query(
+                func.min(Events.event_id), func.max(Events.event_id)
+            ).filter(Events.time_fired < self.purge_before).one()
+
+            if self._next_id is None:
+                return True
+
+        chunk_end = self._next_id + PURGE_CHUNK_SIZE
+
+        # We also need to protect the events belonging to the remaining
+        # states. Otherwise, if the SQL server has "ON DELETE CASCADE" as
+        # default, it will delete the protected state when deleting its
+        # associated event. Also, we would be producing NULLed foreign keys
+        # otherwise.
+        event_ids = [row[0] for row in session.query(Events.event_id).filter(
+            (Events.event_id >= self._next_id) &
+            (Events.event_id < chunk_end) &
+            (Events.event_id <= self._last_id) &
+            (Events.time_fired < self.purge_before) &
+            ~exists().where(States.event_id == Events.event_id))]
+
+        if event_ids:
+            self.events_deleted += session.query(Events) \
+                .filter(Events.event_id.in_(event_ids)) \
+                .delete(synchronize_session=False)
+
+        self._next_id = chunk_end
+        return chunk_end > self._last_id
+
+    def _purge_attributes(self, session):
+        """Delete the next chunk of unused attributes. Return True if done."""
+        from .models import States, StateAttributes
+        from sqlalchemy import exists, func
+
+        if self._next_id is None:
+            self._next_id, self._last_id = session.query(
+                func.min(StateAttributes.attributes_id),
+                func.max(StateAttributes.attributes_id)).one()
+
+            if self._next_id is None:
+                return True
+
+        chunk_end = self._next_id + PURGE_CHUNK_SIZE
+
+        # Attributes no longer used by any state, which is answered by the
+        # attributes_id index of the states
+        attributes_ids = [
+            row[0] for row in session.query(
+                StateAttributes.attributes_id).filter(
+                    (StateAttributes.attributes_id >= self._next_id) &
+                    (StateAttributes.attributes_id < chunk_end) &
+                    (StateAttributes.attributes_id <= self._last_id) &
+                    ~exists().where(States.attributes_id ==
+                                    StateAttributes.attributes_id))]
+
+        if attributes_ids:
+            deleted_rows = session.query(StateAttributes) \
+                .filter(StateAttributes.attributes_id.in_(attributes_ids)) \
+                .delete(synchronize_session=False)
+            _LOGGER.debug("Deleted %s attributes", deleted_rows)
+            # States recorded before the next chunk must not reuse them
+            self.instance.clear_attributes_cache()
+
+        self._next_id = chunk_end
+        return chunk_end > self._last_id
+
+    def _finish(self):
+        """Log the purged rows and repack the database."""
+        _LOGGER.info("Purged %s states and %s events older than %s "
+                     "(%.0f rows/s)", self.states_deleted,
+                     self.events_deleted, self.purge_before,
+                     self.rows_per_second)
+
+        # Execute sqlite vacuum command to free up space on disk
+        _LOGGER.debug("DB engine driver: %s", self.instance.engine.driver)
+        if self.repack and self.instance.engine.driver == 'pysqlite':
+            from sqlalchemy import exc
+
+            _LOGGER.debug("Vacuuming SQLite to free space")
+            try:
+                self.instance.engine.execute("VACUUM")
+            except exc.OperationalError as err:
+                _LOGGER.error("Error vacuuming SQLite: %s.", err)
@@ -0,0 +1,183 @@
+"""Long-term statistics of numeric states."""
+from collections import OrderedDict, defaultdict
+import logging
+import math
+
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+DURATION_5_MINUTES = 300
+DURATION_HOUR = 3600
+
+# Period lengths in seconds the statistics are aggregated over
+STATISTICS_DURATIONS = (DURATION_5_MINUTES, DURATION_HOUR)
+
+
+def best_duration(resolution):
+    """Return the longest statistics period that fits in a resolution.
+
+    Returns None if the resolution is finer than all periods.
+    """
+    durations = [duration for duration in STATISTICS_DURATIONS
+                 if duration <= resolution]
+    return max(durations) if durations else None
+
+
+def statistics_during_period(hass, start_time, end_time=None,
+                             entity_ids=None, duration=DURATION_HOUR):
+    """Return the statistics of numeric entities during a period.
+
+    The result is {entity_id: [statistic]} with the periods starting
+    between start_time and end_time, each statistic a dictionary with
+    start, min, max, mean, last and count.
+    """
+    from .models import Statistics, datetime_to_timestamp
+
+    with session_scope(hass=hass) as session:
+        query = session.query(Statistics).filter(
+            (Statistics.duration == duration) &
+            (Statistics.start_ts >= datetime_to_timestamp(start_time)))
+
+        if end_time is not None:
+            query = query.filter(
+                Statistics.start_ts < datetime_to_timestamp(end_time))
+
+        if entity_ids is not None:
+            query = query.filter(Statistics.entity_id.in_(entity_ids))
+
+        query = query.order_by(Statistics.entity_id, Statistics.start_ts)
+
+        result = defaultdict(list)
+        for row in query:
+            result[row.entity_id].append(row.to_native())
+
+    return dict(result)
+
+
+def _numeric_value(state):
+    """Return the state as a float or None if it is not numeric."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+
+    if math.isnan(value) or math.isinf(value):
+        return None
+
+    return value
+
+
+class _Bucket:
+    """Running aggregate of a single statistics period."""
+
+    __slots__ = ('statistic_id', 'start_ts', 'min', 'max', 'mean', 'last',
+                 'count')
+
+    def __init__(self, start_ts, statistic_id=None, min_value=None,
+                 max_value=None, mean=None, last=None, count=0):
+        """Initialize the bucket."""
+        self.statistic_id = statistic_id
+        self.start_ts = start_ts
+        self.min = min_value
+        self.max = max_value
+        self.mean = mean
+        self.last = last
+        self.count = count
+
+    def add(self, value):
+        """Add a value to the aggregate."""
+        if self.count:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+            self.mean += (value - self.mean) / (self.count + 1)
+        else:
+            self.min = self.max = self.mean = value
+        self.last = value
+        self.count += 1
+
+    def as_params(self):
+        """Return the column values of the aggregate."""
+        return {
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'last': self.last,
+            'count': self.count,
+        }
+
+
+class StatisticsCompiler:
+    """Aggregate numeric states into statistics while they are recorded.
+
+    Only the current period of every entity is kept in memory, together
+    with the changed periods until the batch of states is flushed.
+    """
+
+    def __init__(self):
+        """Initialize the compiler."""
+        self._buckets = {}
+        # Changed periods by (entity_id, duration, start_ts)
+        self._dirty = OrderedDict()
+
+    def add(self, session, entity_id, state, timestamp):
+        """Add a recorded state to the statistics of its entity."""
+        value = _numeric_value(state)
+        if value is None:
+            return
+
+        for duration in STATISTICS_DURATIONS:
+            start_ts = timestamp - timestamp % duration
+            bucket = self._buckets.get((entity_id, duration))
+
+            if bucket is None or bucket.start_ts != start_ts:
+                # A period can come back before it was written, for
+                # example after the clock was set back
+                bucket = self._dirty.get((entity_id, duration, start_ts))
+                if bucket is None:
+                    bucket = self._load_bucket(
+                        session, entity_id, duration, start_ts)
+                self._buckets[(entity_id, duration)] = bucket
+
+            bucket.add(value)
+            self._dirty[(entity_id, duration, start_ts)] = bucket
+
+    def flush(self, session):
+        """Write the changed statistics periods."""
+        from .models import Statistics
+
+        table = Statistics.__table__
+
+        for (entity_id, duration, _), bucket in self._dirty.items():
+            if bucket.statistic_id is None:
+                result = session.execute(table.insert(), dict(
+                    entity_id=entity_id, duration=duration,
+                    start_ts=bucket.start_ts, **bucket.as_params()))
+                bucket.statistic_id = result.inserted_primary_key[0]
+            else:
+                session.execute(table.update().where(
+                    table.c.statistic_id == bucket.statistic_id
+                ).values(**bucket.as_params()))
+
+        self._dirty.clear()
+
+    def clear(self):
+        """Forget all aggregates, they are reloaded from the database."""
+        self._buckets.clear()
+        self._dirty.clear()
+
+    @staticmethod
+    def _load_bucket(session, entity_id, duration, start_ts):
+        """Load a statistics period from the database or start a new one."""
+        from .models import Statistics
+
+        row = session.query(Statistics).filter(
+            (Statistics.entity_id == entity_id) &
+            (Statistics.duration == duration) &
+            (Statistics.start_ts == start_ts)).first()
+
+        if row is None:
+            return _Bucket(start_ts)
+
+        return _Bucket(start_ts, row.statistic_id, row.min, row.max,
+                       row.mean, row.last, row.count)
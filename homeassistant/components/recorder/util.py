@@ -49,19 +49,25 @@ def commit(session, work):
     return False
 
 
-def execute(qry):
+def execute(qry, to_native=None):
     """Query the database and convert the objects to HA native form.
 
+    Rows are converted by to_native if given, otherwise by their own
+    to_native method. Rows converted to None are left out.
+
     This method also retries a few times in the case of stale connections.
     """
     from sqlalchemy.exc import SQLAlchemyError
 
+    if to_native is None:
+        to_native = _to_native
+
     for tryno in range(0, RETRIES):
         try:
             timer_start = time.perf_counter()
             result = [
                 row for row in
-                (row.to_native() for row in qry)
+                (to_native(row) for row in qry)
                 if row is not None]
 
             if _LOGGER.isEnabledFor(logging.DEBUG):
@@ -78,3 +84,8 @@ def execute(qry):
                 raise
             else:
                 time.sleep(QUERY_RETRY_WAIT)
+
+
+def _to_native(row):
+    """Convert a model row to HA native form."""
+    return row.to_native()
@@ -1,24 +1,43 @@
 """Commands part of Websocket API."""
 import voluptuous as vol
 
-from homeassistant.const import MATCH_ALL, EVENT_TIME_CHANGED
-from homeassistant.core import callback, DOMAIN as HASS_DOMAIN
+from homeassistant.const import (
+    MATCH_ALL, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+from homeassistant.core import (
+    callback, split_entity_id, DOMAIN as HASS_DOMAIN, Event)
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.setup import async_get_setup_timeline
 
 from . import const, decorators, messages
 
 
 TYPE_CALL_SERVICE = 'call_service'
+TYPE_CONNECTION_OPTIONS = 'connection_options'
 TYPE_EVENT = 'event'
 TYPE_GET_CONFIG = 'get_config'
 TYPE_GET_SERVICES = 'get_services'
+TYPE_GET_SETUP_TIMELINE = 'get_setup_timeline'
 TYPE_GET_STATES = 'get_states'
 TYPE_PING = 'ping'
 TYPE_PONG = 'pong'
+TYPE_SUBSCRIBE_ENTITIES = 'subscribe_entities'
 TYPE_SUBSCRIBE_EVENTS = 'subscribe_events'
 TYPE_UNSUBSCRIBE_EVENTS = 'unsubscribe_events'
 
+# Keys of the compact entity representation of subscribe_entities
+ATTR_ADDED = 'a'
+ATTR_CHANGED = 'c'
+ATTR_REMOVED = 'r'
+ATTR_STATE = 's'
+ATTR_ATTRIBUTES = 'a'
+ATTR_CONTEXT = 'c'
+ATTR_LAST_CHANGED = 'lc'
+ATTR_LAST_UPDATED = 'lu'
+ATTR_DIFF_ADDITIONS = '+'
+ATTR_DIFF_REMOVALS = '-'
+
 
 @callback
 def async_register_commands(hass):
@@ -28,11 +47,17 @@ def async_register_commands(hass):
               SCHEMA_SUBSCRIBE_EVENTS)
     async_reg(TYPE_UNSUBSCRIBE_EVENTS, handle_unsubscribe_events,
               SCHEMA_UNSUBSCRIBE_EVENTS)
+    async_reg(TYPE_SUBSCRIBE_ENTITIES, handle_subscribe_entities,
+              SCHEMA_SUBSCRIBE_ENTITIES)
     async_reg(TYPE_CALL_SERVICE, handle_call_service, SCHEMA_CALL_SERVICE)
     async_reg(TYPE_GET_STATES, handle_get_states, SCHEMA_GET_STATES)
     async_reg(TYPE_GET_SERVICES, handle_get_services, SCHEMA_GET_SERVICES)
     async_reg(TYPE_GET_CONFIG, handle_get_config, SCHEMA_GET_CONFIG)
+    async_reg(TYPE_GET_SETUP_TIMELINE, handle_get_setup_timeline,
+              SCHEMA_GET_SETUP_TIMELINE)
     async_reg(TYPE_PING, handle_ping, SCHEMA_PING)
+    async_reg(TYPE_CONNECTION_OPTIONS, handle_connection_options,
+              SCHEMA_CONNECTION_OPTIONS)
 
 
 SCHEMA_SUBSCRIBE_EVENTS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
@@ -47,6 +72,13 @@ SCHEMA_UNSUBSCRIBE_EVENTS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
 })
 
 
+SCHEMA_SUBSCRIBE_ENTITIES = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): TYPE_SUBSCRIBE_ENTITIES,
+    vol.Optional('entity_ids'): cv.entity_ids,
+    vol.Optional('domains'): vol.All(cv.ensure_list, [cv.string]),
+})
+
+
 SCHEMA_CALL_SERVICE = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
     vol.Required('type'): TYPE_CALL_SERVICE,
     vol.Required('domain'): str,
@@ -70,18 +102,97 @@ SCHEMA_GET_CONFIG = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
 })
 
 
+SCHEMA_GET_SETUP_TIMELINE = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): TYPE_GET_SETUP_TIMELINE,
+})
+
+
 SCHEMA_PING = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
     vol.Required('type'): TYPE_PING,
 })
 
 
+SCHEMA_CONNECTION_OPTIONS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): TYPE_CONNECTION_OPTIONS,
+    vol.Optional('coalesce_messages'): cv.boolean,
+    vol.Optional('max_rate'): vol.Any(None, vol.All(
+        vol.Coerce(float), vol.Range(min=0.1))),
+})
+
+
 def event_message(iden, event):
-    """Return an event message."""
+    """Return a pre-encoded event message.
+
+    The encoding of the event is cached and shared by all subscribers.
+    """
+    return '{{"id": {}, "type": "{}", "event": {}}}'.format(
+        int(iden), TYPE_EVENT, event.as_json())
+
+
+def entities_message(iden, added=None, changed=None, removed=None):
+    """Return an entity changes message."""
+    event = {}
+    if added:
+        event[ATTR_ADDED] = added
+    if changed:
+        event[ATTR_CHANGED] = changed
+    if removed:
+        event[ATTR_REMOVED] = removed
     return {
         'id': iden,
         'type': TYPE_EVENT,
-        'event': event.as_dict(),
+        'event': event,
+    }
+
+
+def compressed_state(state):
+    """Return the compact representation of a state.
+
+    Timestamps are seconds since the epoch, last updated is left out if it
+    equals last changed.
+    """
+    compressed = {
+        ATTR_STATE: state.state,
+        ATTR_ATTRIBUTES: dict(state.attributes),
+        ATTR_CONTEXT: state.context.id,
+        ATTR_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[ATTR_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def state_diff(old_state, new_state):
+    """Return the changes between two states of an entity.
+
+    Changed and added values are listed under '+' and removed attribute
+    keys under '-'.
+    """
+    additions = {
+        ATTR_CONTEXT: new_state.context.id,
+        ATTR_LAST_UPDATED: new_state.last_updated.timestamp(),
     }
+    diff = {ATTR_DIFF_ADDITIONS: additions}
+
+    if old_state.state != new_state.state:
+        additions[ATTR_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[ATTR_LAST_CHANGED] = new_state.last_changed.timestamp()
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes != new_attributes:
+        changed = {
+            key: value for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value}
+        if changed:
+            additions[ATTR_ATTRIBUTES] = changed
+
+        removed = [key for key in old_attributes if key not in new_attributes]
+        if removed:
+            diff[ATTR_DIFF_REMOVALS] = {ATTR_ATTRIBUTES: removed}
+
+    return diff
 
 
 def pong_message(iden):
@@ -98,12 +209,37 @@ def handle_subscribe_events(hass, connection, msg):
 
     Async friendly.
     """
-    async def forward_events(event):
+    # Old state of the last change queued per entity
+    old_states = {}
+
+    @callback
+    def forward_events(event):
         """Forward events to websocket."""
         if event.event_type == EVENT_TIME_CHANGED:
             return
 
-        connection.send_message(event_message(msg['id'], event))
+        if event.event_type == EVENT_STATE_CHANGED:
+            entity_id = event.data.get('entity_id')
+            pending_old_state = old_states.get(entity_id)
+            old_states[entity_id] = event.data.get('old_state')
+
+            @callback
+            def coalesce_change():
+                """Return the change since the state before the pending one."""
+                old_states[entity_id] = pending_old_state
+                return event_message(msg['id'], Event(
+                    EVENT_STATE_CHANGED, {
+                        'entity_id': entity_id,
+                        'old_state': pending_old_state,
+                        'new_state': event.data.get('new_state'),
+                    }, event.origin, event.time_fired, event.context))
+
+            # A pending change of the same entity is replaced
+            connection.send_message(
+                event_message(msg['id'], event), (msg['id'], entity_id),
+                coalesce_change)
+        else:
+            connection.send_message(event_message(msg['id'], event))
 
     connection.event_listeners[msg['id']] = hass.bus.async_listen(
         msg['event_type'], forward_events)
@@ -111,6 +247,68 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg['id']))
 
 
+@callback
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends a snapshot of the matching states, followed by the changes of
+    these entities.
+
+    Async friendly.
+    """
+    entity_ids = msg.get('entity_ids')
+    domains = msg.get('domains')
+    if entity_ids is not None:
+        entity_ids = set(entity_ids)
+    if domains is not None:
+        domains = set(domains)
+
+    def entity_filter(entity_id):
+        """Return if an entity is part of the subscription."""
+        if entity_ids is None and domains is None:
+            return True
+        return (entity_ids is not None and entity_id in entity_ids or
+                domains is not None and
+                split_entity_id(entity_id)[0] in domains)
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward the change of an entity to websocket."""
+        entity_id = event.data['entity_id']
+        if not entity_filter(entity_id):
+            return
+
+        old_state = event.data.get('old_state')
+        new_state = event.data.get('new_state')
+
+        if new_state is None:
+            connection.send_message(entities_message(
+                msg['id'], removed=[entity_id]))
+        elif old_state is None:
+            connection.send_message(entities_message(
+                msg['id'], added={entity_id: compressed_state(new_state)}))
+        else:
+            connection.send_message(entities_message(
+                msg['id'],
+                changed={entity_id: state_diff(old_state, new_state)}))
+
+    if entity_ids is not None and domains is None:
+        # Only the changes of the tracked entities reach the listener
+        unsub = async_track_state_change_event(
+            hass, entity_ids, forward_entity_changes)
+    else:
+        unsub = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes)
+
+    connection.event_listeners[msg['id']] = unsub
+
+    connection.send_message(messages.result_message(msg['id']))
+    connection.send_message(entities_message(msg['id'], added={
+        state.entity_id: compressed_state(state)
+        for state in hass.states.async_all()
+        if entity_filter(state.entity_id)}))
+
+
 @callback
 def handle_unsubscribe_events(hass, connection, msg):
     """Handle unsubscribe events command.
@@ -174,6 +372,16 @@ def handle_get_config(hass, connection, msg):
         msg['id'], hass.config.as_dict()))
 
 
+@callback
+def handle_get_setup_timeline(hass, connection, msg):
+    """Handle get setup timeline command.
+
+    Async friendly.
+    """
+    connection.send_message(messages.result_message(
+        msg['id'], async_get_setup_timeline(hass)))
+
+
 @callback
 def handle_ping(hass, connection, msg):
     """Handle ping command.
@@ -181,3 +389,20 @@ def handle_ping(hass, connection, msg):
     Async friendly.
     """
     connection.send_message(pong_message(msg['id']))
+
+
+@callback
+def handle_connection_options(hass, connection, msg):
+    """Handle connection options command.
+
+    With coalesce_messages, pending messages are sent as a JSON array in a
+    single frame. With max_rate, at most max_rate frames are sent per
+    second and the state changes of an entity in between are coalesced.
+
+    Async friendly.
+    """
+    if 'coalesce_messages' in msg:
+        connection.coalesce_messages = msg['coalesce_messages']
+    if 'max_rate' in msg:
+        connection.max_rate = msg['max_rate']
+    connection.send_message(messages.result_message(msg['id']))
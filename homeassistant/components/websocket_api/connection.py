@@ -9,11 +9,13 @@ from . import const, messages
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
-    def __init__(self, logger, hass, send_message, user, refresh_token):
+    def __init__(self, logger, hass, send_message, user, refresh_token,
+                 wait_writable=None):
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        self._wait_writable = wait_writable
         self.user = user
         if refresh_token:
             self.refresh_token_id = refresh_token.id
@@ -22,6 +24,18 @@ class ActiveConnection:
 
         self.event_listeners = {}
         self.last_id = 0
+        # Outbound options the client opted into
+        self.coalesce_messages = False
+        self.max_rate = None
+
+    async def async_send_message(self, message):
+        """Send a message once there is room in the pending messages.
+
+        Bulk senders use this to stay below the max pending messages.
+        """
+        if self._wait_writable is not None:
+            await self._wait_writable()
+        self.send_message(message)
 
     def context(self, msg):
         """Return a context."""
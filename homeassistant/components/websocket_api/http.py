@@ -1,8 +1,8 @@
 """View to accept incoming websocket connection."""
 import asyncio
+from collections import OrderedDict
 from contextlib import suppress
-from functools import partial
-import json
+from itertools import count
 import logging
 
 from aiohttp import web, WSMsgType
@@ -11,14 +11,12 @@ import async_timeout
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSON_DUMP
 
 from .const import MAX_PENDING_MSG, CANCELLATION_ERRORS, URL
 from .auth import AuthPhase, auth_required_message
 from .error import Disconnect
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder)
-
 
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
@@ -41,7 +39,16 @@ class WebSocketHandler:
         self.hass = hass
         self.request = request
         self.wsock = None
-        self._to_write = asyncio.Queue(maxsize=MAX_PENDING_MSG, loop=hass.loop)
+        # Pending messages by coalesce key, a message replaces the pending
+        # message with the same key. Other messages get a unique key.
+        self._to_write = OrderedDict()
+        self._message_ids = count()
+        self._ready = asyncio.Event(loop=hass.loop)
+        # Set after every write, bulk senders wait on it for room
+        self._written = asyncio.Event(loop=hass.loop)
+        self._closing = False
+        self._last_write = 0
+        self._connection = None
         self._handle_task = None
         self._writer_task = None
         self._logger = logging.getLogger(
@@ -52,30 +59,85 @@ class WebSocketHandler:
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
-                if message is None:
+                await self._ready.wait()
+
+                connection = self._connection
+                if connection is not None and connection.max_rate and \
+                        not self._closing:
+                    # Messages pending in the meantime are coalesced
+                    delay = (self._last_write + 1 / connection.max_rate -
+                             self.hass.loop.time())
+                    if delay > 0:
+                        await asyncio.sleep(delay, loop=self.hass.loop)
+
+                self._ready.clear()
+                messages = list(self._to_write.values())
+                self._to_write.clear()
+                self._last_write = self.hass.loop.time()
+
+                encoded = []
+                for message in messages:
+                    self._logger.debug("Sending %s", message)
+                    try:
+                        # Messages can be pre-encoded
+                        encoded.append(message if isinstance(message, str)
+                                       else JSON_DUMP(message))
+                    except TypeError as err:
+                        self._logger.error(
+                            'Unable to serialize to JSON: %s\n%s',
+                            err, message)
+
+                if connection is not None and \
+                        connection.coalesce_messages and len(encoded) > 1:
+                    await self.wsock.send_str(
+                        '[{}]'.format(','.join(encoded)))
+                else:
+                    for message in encoded:
+                        await self.wsock.send_str(message)
+
+                self._written.set()
+
+                if self._closing and not self._to_write:
                     break
-                self._logger.debug("Sending %s", message)
-                try:
-                    await self.wsock.send_json(message, dumps=JSON_DUMP)
-                except TypeError as err:
-                    self._logger.error('Unable to serialize to JSON: %s\n%s',
-                                       err, message)
 
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, coalesce_key=None, coalesce=None):
         """Send a message to the client.
 
+        A pending message with the same coalesce key is replaced and the
+        message is sent after all messages pending before it. If given,
+        coalesce is called to build the message that replaces the pending one.
         Closes connection if the client is not reading the messages.
 
         Async friendly.
         """
-        try:
-            self._to_write.put_nowait(message)
-        except asyncio.QueueFull:
-            self._logger.error("Client exceeded max pending messages [2]: %s",
-                               MAX_PENDING_MSG)
-            self._cancel()
+        if coalesce_key is not None and coalesce_key in self._to_write:
+            del self._to_write[coalesce_key]
+            if coalesce is not None:
+                message = coalesce()
+        else:
+            if len(self._to_write) >= MAX_PENDING_MSG:
+                self._logger.error(
+                    "Client exceeded max pending messages [2]: %s",
+                    MAX_PENDING_MSG)
+                self._cancel()
+                return
+
+            if coalesce_key is None:
+                coalesce_key = next(self._message_ids)
+
+        self._to_write[coalesce_key] = message
+        self._ready.set()
+
+    async def _async_wait_writable(self):
+        """Wait until the client has read most pending messages.
+
+        Returns right away once the connection is closing.
+        """
+        while len(self._to_write) >= MAX_PENDING_MSG // 2 and \
+                not self._closing:
+            self._written.clear()
+            await self._written.wait()
 
     @callback
     def _cancel(self):
@@ -107,7 +169,8 @@ class WebSocketHandler:
 
         self._writer_task = self.hass.async_create_task(self._writer())
 
-        auth = AuthPhase(self._logger, self.hass, self._send_message, request)
+        auth = AuthPhase(self._logger, self.hass, self._send_message, request,
+                         self._async_wait_writable)
         connection = None
         disconnect_warn = None
 
@@ -137,7 +200,7 @@ class WebSocketHandler:
                 raise Disconnect
 
             self._logger.debug("Received %s", msg)
-            connection = await auth.async_handle(msg)
+            connection = self._connection = await auth.async_handle(msg)
 
             # Command phase
             while not wsock.closed:
@@ -174,12 +237,12 @@ class WebSocketHandler:
             if connection is not None:
                 connection.async_close()
 
-            try:
-                self._to_write.put_nowait(None)
-                # Make sure all error messages are written before closing
+            # Make sure all error messages are written before closing
+            self._closing = True
+            self._ready.set()
+            self._written.set()
+            with suppress(*CANCELLATION_ERRORS):
                 await self._writer_task
-            except asyncio.QueueFull:
-                self._writer_task.cancel()
 
             await wsock.close()
 
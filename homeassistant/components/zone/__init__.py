@@ -11,14 +11,16 @@ import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import (
-    CONF_NAME, CONF_LATITUDE, CONF_LONGITUDE, CONF_ICON, CONF_RADIUS)
+    CONF_NAME, CONF_LATITUDE, CONF_LONGITUDE, CONF_ICON, CONF_RADIUS,
+    EVENT_STATE_CHANGED)
+from homeassistant.core import callback
 from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.entity import async_generate_entity_id
 from homeassistant.util import slugify
 
 from .config_flow import configured_zones
 from .const import CONF_PASSIVE, DOMAIN, HOME_ZONE
-from .zone import Zone
+from .zone import DATA_INDEX, Zone, ZoneIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +30,7 @@ DEFAULT_RADIUS = 100
 
 ENTITY_ID_FORMAT = 'zone.{}'
 ENTITY_ID_HOME = ENTITY_ID_FORMAT.format(HOME_ZONE)
+ENTITY_ID_PREFIX = ENTITY_ID_FORMAT.format('')
 
 ICON_HOME = 'mdi:home'
 ICON_IMPORT = 'mdi:import'
@@ -46,6 +49,26 @@ PLATFORM_SCHEMA = vol.Schema({
 async def async_setup(hass, config):
     """Set up configured zones as well as home assistant zone if necessary."""
     hass.data[DOMAIN] = {}
+    index = hass.data[DATA_INDEX] = ZoneIndex()
+
+    for entity_id in hass.states.async_entity_ids(DOMAIN):
+        index.async_update(hass.states.get(entity_id))
+
+    @callback
+    def async_zone_changed(event):
+        """Keep the index up to date when a zone changes."""
+        entity_id = event.data['entity_id']
+        if not entity_id.startswith(ENTITY_ID_PREFIX):
+            return
+
+        new_state = event.data['new_state']
+        if new_state is None:
+            index.async_remove(entity_id)
+        else:
+            index.async_update(new_state)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, async_zone_changed)
+
     entities = set()
     zone_entries = configured_zones(hass)
     for _, entry in config_per_platform(config, DOMAIN):
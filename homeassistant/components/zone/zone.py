@@ -1,6 +1,8 @@
 """Component entity and functionality."""
+import math
 
 from homeassistant.const import ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.loader import bind_hass
 from homeassistant.util.async_ import run_callback_threadsafe
@@ -13,6 +15,20 @@ ATTR_RADIUS = 'radius'
 
 STATE = 'zoning'
 
+DATA_INDEX = 'zone_index'
+
+# Size in degrees of the cells of the zone index
+INDEX_CELL_SIZE = 0.1
+INDEX_LONGITUDE_CELLS = int(360 / INDEX_CELL_SIZE)
+# Circles covering more cells are compared with every lookup instead
+INDEX_MAX_CELLS = 100
+# Meters per degree of latitude at the equator, the least on the ellipsoid
+METERS_PER_DEGREE = 110574
+# Bounds are widened so the flat approximation never excludes a match
+BOUNDS_MARGIN = 1.1
+# Closer to the poles a circle can span any longitude
+MAX_BOUNDED_LATITUDE = 80
+
 
 @bind_hass
 def active_zone(hass, latitude, longitude, radius=0):
@@ -28,15 +44,21 @@ def async_active_zone(hass, latitude, longitude, radius=0):
 
     This method must be run in the event loop.
     """
+    index = hass.data.get(DATA_INDEX)
+
+    if index is None:
+        entity_ids = hass.states.async_entity_ids(DOMAIN)
+    else:
+        entity_ids = index.async_candidates(latitude, longitude, radius)
+
     # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (hass.states.get(entity_id) for entity_id
-             in sorted(hass.states.async_entity_ids(DOMAIN)))
+    zones = (hass.states.get(entity_id) for entity_id in sorted(entity_ids))
 
     min_dist = None
     closest = None
 
     for zone in zones:
-        if zone.attributes.get(ATTR_PASSIVE):
+        if zone is None or zone.attributes.get(ATTR_PASSIVE):
             continue
 
         zone_dist = distance(
@@ -61,6 +83,12 @@ def in_zone(zone, latitude, longitude, radius=0):
 
     Async friendly.
     """
+    if not _maybe_within(latitude, longitude,
+                         zone.attributes[ATTR_LATITUDE],
+                         zone.attributes[ATTR_LONGITUDE],
+                         zone.attributes[ATTR_RADIUS] + radius):
+        return False
+
     zone_dist = distance(
         latitude, longitude,
         zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE])
@@ -68,6 +96,117 @@ def in_zone(zone, latitude, longitude, radius=0):
     return zone_dist - radius < zone.attributes[ATTR_RADIUS]
 
 
+def _maybe_within(lat1, lon1, lat2, lon2, meters):
+    """Return False if two points are certainly further apart than meters.
+
+    Async friendly.
+    """
+    max_delta = meters * BOUNDS_MARGIN / METERS_PER_DEGREE
+
+    if abs(lat1 - lat2) > max_delta:
+        return False
+
+    max_latitude = max(abs(lat1), abs(lat2)) + max_delta
+
+    if max_latitude > MAX_BOUNDED_LATITUDE:
+        return True
+
+    return abs((lon1 - lon2 + 180) % 360 - 180) <= \
+        max_delta / math.cos(math.radians(max_latitude))
+
+
+def _circle_cells(latitude, longitude, radius):
+    """Return the index cells a circle overlaps.
+
+    Returns None if the circle covers too many cells to be indexed.
+    """
+    lat_delta = radius * BOUNDS_MARGIN / METERS_PER_DEGREE
+    max_latitude = abs(latitude) + lat_delta
+
+    if max_latitude > MAX_BOUNDED_LATITUDE:
+        return None
+
+    lon_delta = lat_delta / math.cos(math.radians(max_latitude))
+
+    lat_cells = range(
+        math.floor((latitude - lat_delta) / INDEX_CELL_SIZE),
+        math.floor((latitude + lat_delta) / INDEX_CELL_SIZE) + 1)
+    lon_cells = range(
+        math.floor((longitude - lon_delta) / INDEX_CELL_SIZE),
+        math.floor((longitude + lon_delta) / INDEX_CELL_SIZE) + 1)
+
+    if len(lat_cells) * len(lon_cells) > INDEX_MAX_CELLS:
+        return None
+
+    return [(lat_cell, lon_cell % INDEX_LONGITUDE_CELLS)
+            for lat_cell in lat_cells for lon_cell in lon_cells]
+
+
+class ZoneIndex:
+    """Grid of the active zones by the cells they overlap.
+
+    Looking up the zones of a location only measures the distance to the
+    zones near it.
+    """
+
+    def __init__(self):
+        """Initialize the index."""
+        self._cells = {}
+        self._zone_cells = {}
+        # Zones too large or too close to the poles to be indexed
+        self._unindexed = set()
+
+    @callback
+    def async_update(self, state):
+        """Index the current state of a zone."""
+        self.async_remove(state.entity_id)
+
+        attributes = state.attributes
+        if attributes.get(ATTR_PASSIVE):
+            return
+
+        try:
+            cells = _circle_cells(attributes[ATTR_LATITUDE],
+                                  attributes[ATTR_LONGITUDE],
+                                  attributes[ATTR_RADIUS])
+        except (KeyError, TypeError):
+            # Without a location the zone is never active
+            return
+
+        if cells is None:
+            self._unindexed.add(state.entity_id)
+            return
+
+        self._zone_cells[state.entity_id] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(state.entity_id)
+
+    @callback
+    def async_remove(self, entity_id):
+        """Remove a zone from the index."""
+        self._unindexed.discard(entity_id)
+
+        for cell in self._zone_cells.pop(entity_id, ()):
+            zones = self._cells[cell]
+            zones.discard(entity_id)
+            if not zones:
+                del self._cells[cell]
+
+    @callback
+    def async_candidates(self, latitude, longitude, radius=0):
+        """Return the entity ids of the zones a location could be in."""
+        cells = _circle_cells(latitude, longitude, radius)
+
+        if cells is None:
+            return set(self._zone_cells).union(self._unindexed)
+
+        candidates = set(self._unindexed)
+        for cell in cells:
+            candidates.update(self._cells.get(cell, ()))
+
+        return candidates
+
+
 class Zone(Entity):
     """Representation of a Zone."""
 
@@ -26,7 +26,7 @@ from homeassistant.const import (
 from homeassistant.core import callback, DOMAIN as CONF_CORE, HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import get_component, get_platform
-from homeassistant.util.yaml import load_yaml, SECRET_YAML
+from homeassistant.util.yaml import load_yaml, load_yaml_cached, SECRET_YAML
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import dt as date_util, location as loc_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
@@ -41,6 +41,7 @@ RE_ASCII = re.compile(r"\033\[[^m]*m")
 HA_COMPONENT_URL = '[{}](https://home-assistant.io/components/{}/)'
 YAML_CONFIG_FILE = 'configuration.yaml'
 VERSION_FILE = '.HA_VERSION'
+CONFIG_CACHE_FILE = '.config_cache'
 CONFIG_DIR_NAME = '.homeassistant'
 DATA_CUSTOMIZE = 'hass_customize'
 
@@ -341,7 +342,7 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
         if path is None:
             raise HomeAssistantError(
                 "Config file not found in: {}".format(hass.config.config_dir))
-        return load_yaml_config_file(path)
+        return load_yaml_config_file(path, True)
 
     return await hass.async_add_executor_job(_load_hass_yaml_config)
 
@@ -355,13 +356,20 @@ def find_config_file(config_dir: Optional[str]) -> Optional[str]:
     return config_path if os.path.isfile(config_path) else None
 
 
-def load_yaml_config_file(config_path: str) -> Dict[Any, Any]:
+def load_yaml_config_file(config_path: str,
+                          use_cache: bool = False) -> Dict[Any, Any]:
     """Parse a YAML configuration file.
 
+    With use_cache, the parsed configuration is cached next to the file and
+    reused until the file or anything it includes changes.
     This method needs to run in an executor.
     """
     try:
-        conf_dict = load_yaml(config_path)
+        if use_cache:
+            conf_dict = load_yaml_cached(config_path, os.path.join(
+                os.path.dirname(config_path), CONFIG_CACHE_FILE))
+        else:
+            conf_dict = load_yaml(config_path)
     except FileNotFoundError as err:
         raise HomeAssistantError("Config file not found: {}".format(
             getattr(err, 'filename', err)))
@@ -8,6 +8,7 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import datetime
 import enum
+import json
 import logging
 import os
 import pathlib
@@ -416,6 +417,25 @@ class Context:
         }
 
 
+def _json_dump(value: Any) -> str:
+    """Encode a value as JSON."""
+    from homeassistant.helpers.json import JSON_DUMP
+    return JSON_DUMP(value)
+
+
+def _json_object(data: Dict) -> str:
+    """Encode a dictionary as JSON, reusing the cached encoding of states."""
+    if not any(isinstance(value, State) for value in data.values()) or \
+            not all(isinstance(key, str) for key in data):
+        return _json_dump(data)
+
+    return '{{{}}}'.format(', '.join(
+        '{}: {}'.format(
+            json.dumps(key),
+            value.as_json() if isinstance(value, State) else _json_dump(value))
+        for key, value in data.items()))
+
+
 class EventOrigin(enum.Enum):
     """Represent the origin of an event."""
 
@@ -430,7 +450,8 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ['event_type', 'data', 'origin', 'time_fired', 'context']
+    __slots__ = ['event_type', 'data', 'origin', 'time_fired', 'context',
+                 '_data_json', '_json']
 
     def __init__(self, event_type: str, data: Optional[Dict] = None,
                  origin: EventOrigin = EventOrigin.local,
@@ -442,6 +463,36 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context = context or Context()
+        self._data_json = None  # type: Optional[str]
+        self._json = None  # type: Optional[str]
+
+    @property
+    def data_json(self) -> str:
+        """Return the event data encoded as JSON.
+
+        The encoding is cached, the data of a fired event must not change.
+        """
+        if self._data_json is None:
+            self._data_json = _json_object(self.data)
+        return self._data_json
+
+    def as_json(self) -> str:
+        """Return the JSON representation of this Event.
+
+        Equal to encoding as_dict() and cached, so an event is encoded only
+        once no matter how many consumers forward it.
+
+        Async friendly.
+        """
+        if self._json is None:
+            self._json = (
+                '{{"event_type": {}, "data": {}, "origin": {}, '
+                '"time_fired": {}, "context": {}}}').format(
+                    _json_dump(self.event_type), self.data_json,
+                    _json_dump(str(self.origin)),
+                    _json_dump(self.time_fired),
+                    _json_dump(self.context))
+        return self._json
 
     def as_dict(self) -> Dict:
         """Create a dict representation of this Event.
@@ -477,6 +528,16 @@ class Event:
                 self.context == other.context)
 
 
+def _async_run_callbacks(callbacks: List[Callable], event: Event) -> None:
+    """Run callback listeners of an event, isolating their exceptions."""
+    for func in callbacks:
+        try:
+            func(event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running event listener %s for %s",
+                              func, event)
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
@@ -532,8 +593,26 @@ class EventBus:
         if not listeners:
             return
 
+        if len(listeners) == 1:
+            # Most events have a single listener, skip the batching
+            func = listeners[0]
+            if is_callback(func):
+                self._hass.loop.call_soon(func, event)
+            else:
+                self._hass.async_add_job(func, event)
+            return
+
+        callbacks = []
         for func in listeners:
-            self._hass.async_add_job(func, event)
+            if is_callback(func):
+                callbacks.append(func)
+            else:
+                self._hass.async_add_job(func, event)
+
+        # Run all callback listeners in a single loop iteration instead of
+        # scheduling one handle per listener
+        if callbacks:
+            self._hass.loop.call_soon(_async_run_callbacks, callbacks, event)
 
     def listen(
             self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
@@ -652,7 +731,8 @@ class State:
     """
 
     __slots__ = ['entity_id', 'state', 'attributes',
-                 'last_changed', 'last_updated', 'context']
+                 'last_changed', 'last_updated', 'context',
+                 '_attributes_json', '_json']
 
     def __init__(self, entity_id: str, state: Any,
                  attributes: Optional[Dict] = None,
@@ -678,6 +758,8 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        self._attributes_json = None  # type: Optional[str]
+        self._json = None  # type: Optional[str]
 
     @property
     def domain(self) -> str:
@@ -711,6 +793,35 @@ class State:
                 'last_updated': self.last_updated,
                 'context': self.context.as_dict()}
 
+    @property
+    def attributes_json(self) -> str:
+        """Return the attributes encoded as JSON.
+
+        The encoding is cached, states are replaced rather than changed.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = _json_dump(self.attributes)
+        return self._attributes_json
+
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Equal to encoding as_dict() and cached, so a state is encoded only
+        once no matter how many consumers forward it.
+
+        Async friendly.
+        """
+        if self._json is None:
+            self._json = (
+                '{{"entity_id": {}, "state": {}, "attributes": {}, '
+                '"last_changed": {}, "last_updated": {}, '
+                '"context": {}}}').format(
+                    _json_dump(self.entity_id), _json_dump(self.state),
+                    self.attributes_json, _json_dump(self.last_changed),
+                    _json_dump(self.last_updated),
+                    _json_dump(self.context))
+        return self._json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1294,8 +1405,13 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(EVENT_TIME_CHANGED,
-                            {ATTR_NOW: now})
+        # Only fire when something listens to the time specifically, all
+        # listeners of every event ignore it. The shared point in time
+        # scheduler only listens while it has actions pending.
+        # pylint: disable=protected-access
+        if EVENT_TIME_CHANGED in hass.bus._listeners:
+            hass.bus.async_fire(EVENT_TIME_CHANGED,
+                                {ATTR_NOW: now})
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
@@ -345,6 +345,8 @@ class Entity:
             # pylint: disable=no-member
             if hasattr(self, 'async_update'):
                 await self.async_update()
+            elif hasattr(self, 'update') and self.platform is not None:
+                await self.platform.async_add_update_job(self.update)
             elif hasattr(self, 'update'):
                 await self.hass.async_add_executor_job(self.update)
         finally:
@@ -1,18 +1,77 @@
 """Class to manage the entities for a single platform."""
 import asyncio
-
-from homeassistant.const import DEVICE_DEFAULT_NAME
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import random
+import sys
+from timeit import default_timer as timer
+
+from homeassistant.const import (
+    DEVICE_DEFAULT_NAME, EVENT_HOMEASSISTANT_CLOSE)
 from homeassistant.core import callback, valid_entity_id, split_entity_id
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
+from homeassistant.setup import PHASE_PLATFORMS, async_record_setup_time
+import homeassistant.util.dt as dt_util
 from homeassistant.util.async_ import (
     run_callback_threadsafe, run_coroutine_threadsafe)
 
-from .event import async_track_time_interval, async_call_later
+from .event import (
+    async_track_time_interval, async_track_point_in_utc_time,
+    async_call_later)
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
 
+DATA_UPDATE_EXECUTORS = 'entity_platform_update_executors'
+# Threads running the blocking updates of the entities of an integration
+UPDATE_EXECUTOR_MAX_WORKERS = 4
+# Integrations with their own update executor, this bounds the update
+# threads to UPDATE_EXECUTORS_MAX * UPDATE_EXECUTOR_MAX_WORKERS
+UPDATE_EXECUTORS_MAX = 10
+# Up to this fraction of the scan interval the first poll is moved forward
+POLLING_JITTER = 0.2
+
+
+@callback
+def _async_get_update_executor(hass, integration):
+    """Return the executor running the blocking updates of an integration.
+
+    Integrations get their own bounded executor so slow devices of one
+    integration can not starve the shared executor. Once
+    UPDATE_EXECUTORS_MAX integrations have one, None is returned and the
+    updates run in the shared executor.
+    """
+    executors = hass.data.get(DATA_UPDATE_EXECUTORS)
+
+    if executors is None:
+        executors = hass.data[DATA_UPDATE_EXECUTORS] = {}
+
+        @callback
+        def async_shutdown_executors(event):
+            """Shut down the update executors."""
+            for executor in executors.values():
+                executor.shutdown(wait=False)
+            executors.clear()
+
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, async_shutdown_executors)
+
+    executor = executors.get(integration)
+
+    if executor is None:
+        if len(executors) >= UPDATE_EXECUTORS_MAX:
+            return None
+
+        executor_opts = {'max_workers': UPDATE_EXECUTOR_MAX_WORKERS}
+        if sys.version_info[:2] >= (3, 6):
+            executor_opts['thread_name_prefix'] = 'UpdateWorker_{}'.format(
+                integration)
+        executor = executors[integration] = ThreadPoolExecutor(
+            **executor_opts)
+
+    return executor
+
 
 class EntityPlatform:
     """Manage the entities for a single platform."""
@@ -42,6 +101,8 @@ class EntityPlatform:
         self.config_entry = None
         self.entities = {}
         self._tasks = []
+        # Entities scheduled to be added by update_before_add
+        self._pending_entities = {}
         # Method to cancel the state change listener
         self._async_unsub_polling = None
         # Method to cancel the retry of setup
@@ -115,6 +176,7 @@ class EntityPlatform:
         full_name = '{}.{}'.format(self.domain, self.platform_name)
 
         logger.info("Setting up %s", full_name)
+        start = timer()
         warn_task = hass.loop.call_later(
             SLOW_SETUP_WARNING, logger.warning,
             "Setup of platform %s is taking over %s seconds.",
@@ -166,6 +228,8 @@ class EntityPlatform:
             return False
         finally:
             warn_task.cancel()
+            async_record_setup_time(
+                hass, full_name, PHASE_PLATFORMS, start, timer())
 
     def _schedule_add_entities(self, new_entities, update_before_add=False):
         """Schedule adding entities for a single platform, synchronously."""
@@ -178,11 +242,25 @@ class EntityPlatform:
     @callback
     def _async_schedule_add_entities(self, new_entities,
                                      update_before_add=False):
-        """Schedule adding entities for a single platform async."""
+        """Schedule adding entities for a single platform async.
+
+        Entities scheduled before the scheduled task runs are added in the
+        same batch.
+        """
+        pending = self._pending_entities.get(update_before_add)
+        if pending is not None:
+            pending.extend(new_entities)
+            return
+
+        self._pending_entities[update_before_add] = list(new_entities)
         self._tasks.append(self.hass.async_add_job(
-            self.async_add_entities(
-                new_entities, update_before_add=update_before_add)
-        ))
+            self._async_add_pending_entities(update_before_add)))
+
+    async def _async_add_pending_entities(self, update_before_add):
+        """Add the entities scheduled for a single platform async."""
+        await self.async_add_entities(
+            self._pending_entities.pop(update_before_add),
+            update_before_add=update_before_add)
 
     def add_entities(self, new_entities, update_before_add=False):
         """Add entities for a single platform."""
@@ -228,9 +306,36 @@ class EntityPlatform:
                    in self.entities.values()):
             return
 
+        # Spread the polls of platforms that are set up at the same time
+        jitter = random.uniform(
+            0, self.scan_interval.total_seconds() * POLLING_JITTER)
+        self._async_unsub_polling = async_track_point_in_utc_time(
+            self.hass, self._async_start_polling,
+            dt_util.utcnow() + self.scan_interval - timedelta(seconds=jitter))
+
+    @callback
+    def _async_start_polling(self, now):
+        """Poll the entities and keep polling every scan interval."""
         self._async_unsub_polling = async_track_time_interval(
             self.hass, self._update_entity_states, self.scan_interval
         )
+        self.hass.async_create_task(self._update_entity_states(now))
+
+    @callback
+    def async_add_update_job(self, target):
+        """Run the blocking update of an entity in an executor.
+
+        This method must be run in the event loop.
+        """
+        executor = None
+        if self.platform is not None:
+            executor = _async_get_update_executor(
+                self.hass, self.platform_name)
+
+        if executor is None:
+            return self.hass.async_add_executor_job(target)
+
+        return self.hass.loop.run_in_executor(executor, target)
 
     async def _async_add_entity(self, entity, update_before_add,
                                 entity_registry, device_registry):
@@ -387,7 +492,8 @@ class EntityPlatform:
         """Update the states of all the polling entities.
 
         To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        in parallel and other entities sequential. Blocking updates run in
+        the executor of the integration.
 
         This method must be run in the event loop.
         """
@@ -399,11 +505,28 @@ class EntityPlatform:
             return
 
         async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                await asyncio.wait(tasks, loop=self.hass.loop)
+            entities = [entity for entity in self.entities.values()
+                        if entity.should_poll]
+
+            if not entities:
+                return
+
+            # Platforms can fetch the data of all their entities at once
+            update_many = getattr(self.platform, 'async_update_many', None)
+
+            if update_many is None:
+                tasks = [entity.async_update_ha_state(True)
+                         for entity in entities]
+            else:
+                try:
+                    await update_many(self.hass, entities)
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception(
+                        "Error updating %s %s entities", self.platform_name,
+                        self.domain)
+                    return
+
+                tasks = [entity.async_update_ha_state()
+                         for entity in entities]
+
+            await asyncio.wait(tasks, loop=self.hass.loop)
@@ -1,6 +1,8 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import heapq
+import itertools
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
@@ -11,6 +13,10 @@ from ..const import (
 from ..util import dt as dt_util
 from ..util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = 'track_state_change_callbacks'
+TRACK_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+DATA_POINT_IN_TIME_SCHEDULER = 'point_in_time_scheduler'
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -64,10 +70,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -81,12 +83,76 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return async_track_state_change_event(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+@bind_hass
+def async_track_state_change_event(hass, entity_ids, action):
+    """Track state change events of specific entities.
+
+    Unlike listening to EVENT_STATE_CHANGED, a single bus listener is shared
+    by all trackers and only the actions tracking the changed entity are
+    run, with the state change event as argument.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+        @callback
+        def state_change_dispatcher(event):
+            """Dispatch a state change to the actions of its entity."""
+            actions = entity_callbacks.get(event.data.get('entity_id'))
+            if actions is None:
+                return
+
+            # Copy, actions may be removed while we iterate
+            for entity_action in list(actions):
+                hass.async_run_job(entity_action, event)
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_dispatcher)
+
+    if isinstance(entity_ids, str):
+        entity_ids = (entity_ids.lower(),)
+    else:
+        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(action)
+
+    @callback
+    def remove_listener():
+        """Remove the action from all tracked entities."""
+        for entity_id in entity_ids:
+            actions = entity_callbacks.get(entity_id)
+            if actions is None or action not in actions:
+                continue
+            actions.remove(action)
+            if not actions:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
+track_state_change_event = threaded_listener_factory(
+    async_track_state_change_event)
+
+
 @callback
 @bind_hass
 def async_track_template(hass, template, action, variables=None):
@@ -185,35 +251,104 @@ def async_track_point_in_time(hass, action, point_in_time):
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
-@callback
-@bind_hass
-def async_track_point_in_utc_time(hass, action, point_in_time):
-    """Add a listener that fires once after a specific point in UTC time."""
-    # Ensure point_in_time is UTC
-    point_in_time = dt_util.as_utc(point_in_time)
+class _PointInTimeScheduler:
+    """Run actions once their point in time has passed.
+
+    All pending points in time are kept in a heap behind a single time
+    changed listener, which only looks at the earliest one on every tick.
+    The listener is removed when nothing is scheduled.
+    """
+
+    def __init__(self, hass):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._unsub = None
 
     @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
+    def async_schedule(self, point_in_time, action):
+        """Schedule an action, return a function to cancel it."""
+        # The counter keeps entries of the same time in order of scheduling
+        entry = [point_in_time, next(self._counter), action]
+        heapq.heappush(self._heap, entry)
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        @callback
+        def cancel():
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+            entry[2] = None
+            if entry[1] is None:
+                return
+            self._cancelled += 1
+
+            if self._cancelled > len(self._heap) // 2:
+                self._async_compact()
+
+        return cancel
+
+    @callback
+    def _async_compact(self):
+        """Drop cancelled entries from the heap."""
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+        self._async_stop_if_idle()
+
+    @callback
+    def _async_stop_if_idle(self):
+        """Stop listening to time changes if nothing is scheduled."""
+        if not self._heap and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run all actions that are due."""
         now = event.data[ATTR_NOW]
 
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
+        # Take the due entries off the heap first, actions rescheduled by
+        # an action of this tick wait for the next one
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is None:
+                self._cancelled -= 1
+                continue
+            # Off the heap, cancelling the entry is no longer counted
+            entry[1] = None
+            due.append(entry)
+
+        for entry in due:
+            # Actions may cancel entries that are due in this tick too
+            action = entry[2]
+            if action is None:
+                continue
+            entry[2] = None
+            self.hass.async_run_job(action, now)
+
+        self._async_stop_if_idle()
 
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
 
-        hass.async_run_job(action, now)
+@callback
+@bind_hass
+def async_track_point_in_utc_time(hass, action, point_in_time):
+    """Add a listener that fires once after a specific point in UTC time."""
+    # Ensure point_in_time is UTC
+    point_in_time = dt_util.as_utc(point_in_time)
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
+    scheduler = hass.data.get(DATA_POINT_IN_TIME_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POINT_IN_TIME_SCHEDULER] = \
+            _PointInTimeScheduler(hass)
 
-    return async_unsub
+    return scheduler.async_schedule(point_in_time, action)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -2,11 +2,73 @@
 from datetime import datetime
 import json
 import logging
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Dict  # noqa: F401 pylint: disable=W0611
+
+from homeassistant.core import Context, Event, State
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _encode_context(context: Context) -> Dict:
+    """Return the fields of a context."""
+    return {'id': context.id, 'user_id': context.user_id}
+
+
+def _encode_state(state: State) -> Dict:
+    """Return the fields of a state in a single pass."""
+    return {'entity_id': state.entity_id,
+            'state': state.state,
+            'attributes': dict(state.attributes),
+            'last_changed': state.last_changed,
+            'last_updated': state.last_updated,
+            'context': _encode_context(state.context)}
+
+
+def _encode_event(event: Event) -> Dict:
+    """Return the fields of an event without copying its data."""
+    return {'event_type': event.event_type,
+            'data': event.data,
+            'origin': str(event.origin),
+            'time_fired': event.time_fired,
+            'context': _encode_context(event.context)}
+
+
+# Handlers for the types that are encoded most, looked up by exact type
+ENCODERS = {
+    State: _encode_state,
+    Event: _encode_event,
+    Context: _encode_context,
+    datetime: datetime.isoformat,
+    MappingProxyType: dict,
+    set: list,
+}  # type: Dict[type, Callable[[Any], Any]]
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects to types JSON can encode.
+
+    Raise TypeError for objects that are not supported.
+    """
+    encoder = ENCODERS.get(type(obj))
+    if encoder is not None:
+        return encoder(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, 'as_dict'):
+        return obj.as_dict()
+
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        type(obj).__name__))
+
+
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
@@ -16,11 +78,33 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, 'as_dict'):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        encoder = ENCODERS.get(type(o))
+        if encoder is not None:
+            return encoder(o)
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+def _orjson_dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Encode an object as JSON with orjson."""
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return str(orjson.dumps(
+        obj, default=json_encoder_default, option=option).decode('utf-8'))
+
+
+def _json_dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Encode an object as JSON with the standard library."""
+    return json.dumps(obj, sort_keys=sort_keys, cls=JSONEncoder)
+
+
+# Encode an object as JSON with the fastest available backend, keys are
+# sorted if sort_keys is passed. Both raise TypeError (or a subclass) for
+# objects that cannot be encoded.
+if orjson is not None:
+    JSON_DUMP = _orjson_dumps  # type: Callable[..., str]
+else:
+    JSON_DUMP = _json_dumps
@@ -10,12 +10,14 @@ call get_component(hass, 'switch.your_platform'). In both cases the config
 directory is checked to see if it contains a user provided version. If not
 available it will check the built-in components and platforms.
 """
+import ast
 import functools as ft
 import importlib
 import logging
+import os
 import sys
 from types import ModuleType
-from typing import Optional, Set, TYPE_CHECKING, Callable, Any, TypeVar  # noqa pylint: disable=unused-import
+from typing import Optional, Set, TYPE_CHECKING, Callable, Any, TypeVar, Dict, Iterable, List  # noqa pylint: disable=unused-import
 
 from homeassistant.const import PLATFORM_FORMAT
 from homeassistant.util import OrderedSet
@@ -35,8 +37,19 @@ _LOGGER = logging.getLogger(__name__)
 
 
 DATA_KEY = 'components'
+DATA_METADATA = 'component_metadata'
 PATH_CUSTOM_COMPONENTS = 'custom_components'
 PACKAGE_COMPONENTS = 'homeassistant.components'
+PATH_COMPONENTS = os.path.join(os.path.dirname(__file__), 'components')
+
+METADATA_STORAGE_KEY = 'core.component_metadata'
+METADATA_STORAGE_VERSION = 1
+
+# Module attributes that are read without importing the module
+METADATA_ATTRIBUTES = {
+    'DEPENDENCIES': 'dependencies',
+    'REQUIREMENTS': 'requirements',
+}
 
 
 def set_component(hass,  # type: HomeAssistant
@@ -139,6 +152,213 @@ def get_component(hass,  # type: HomeAssistant
     return None
 
 
+class _MetadataIndex:
+    """Metadata of components, keyed by the module file it was read from."""
+
+    def __init__(self, entries: Optional[Dict] = None) -> None:
+        """Initialize the index."""
+        self.entries = entries or {}  # type: Dict[str, Dict]
+        self.changed = False
+        # Entries compared with their module file in this run
+        self.checked = set()  # type: Set[str]
+
+
+def _module_paths(hass,  # type: HomeAssistant
+                  comp_or_platform: str) -> List[str]:
+    """Return the files a component or platform can be imported from.
+
+    The files are in the order they are looked up by get_component.
+    """
+    parts = comp_or_platform.split('.')
+    bases = [PATH_COMPONENTS]
+    if hass.config.config_dir is not None:
+        bases.insert(0, os.path.join(
+            hass.config.config_dir, PATH_CUSTOM_COMPONENTS))
+
+    paths = []
+    for base in bases:
+        paths.append(os.path.join(base, *parts, '__init__.py'))
+        paths.append(os.path.join(base, *parts[:-1], parts[-1] + '.py'))
+    return paths
+
+
+def _read_metadata(path: str) -> Optional[Dict[str, List[str]]]:
+    """Read the metadata of a module from its source.
+
+    Returns None if the metadata is not defined once with a literal value,
+    the module has to be imported to find it.
+    """
+    try:
+        with open(path, encoding='utf-8') as source:
+            tree = ast.parse(source.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    bindings = {attr: 0 for attr in METADATA_ATTRIBUTES}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names = [node.id]
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [alias.asname or alias.name for alias in node.names]
+        else:
+            continue
+
+        if '*' in names:
+            return None
+        for name in names:
+            if name in bindings:
+                bindings[name] += 1
+
+    if any(count > 1 for count in bindings.values()):
+        return None
+
+    metadata = {
+        key: [] for key in METADATA_ATTRIBUTES.values()
+    }  # type: Dict[str, List[str]]
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and
+                isinstance(node.targets[0], ast.Name) and
+                node.targets[0].id in METADATA_ATTRIBUTES):
+            continue
+        try:
+            value = ast.literal_eval(node.value)
+        except ValueError:
+            return None
+        if not isinstance(value, (list, tuple, set)) or \
+                not all(isinstance(item, str) for item in value):
+            return None
+        bindings[node.targets[0].id] -= 1
+        metadata[METADATA_ATTRIBUTES[node.targets[0].id]] = list(value)
+
+    # Defined, but not by a literal assignment at the top of the module
+    if any(bindings.values()):
+        return None
+
+    return metadata
+
+
+def _module_metadata(module: Any) -> Dict[str, List[str]]:
+    """Return the metadata of an imported module."""
+    return {key: list(getattr(module, attr, []))
+            for attr, key in METADATA_ATTRIBUTES.items()}
+
+
+def _indexed_metadata(hass,  # type: HomeAssistant
+                      index: _MetadataIndex,
+                      comp_or_platform: str) -> Optional[Dict[str, List[str]]]:
+    """Return the metadata of a module file from the index.
+
+    The module source is read if the index entry is missing or outdated.
+    Returns None if the metadata is not read from the source.
+    """
+    if comp_or_platform not in index.checked:
+        index.checked.add(comp_or_platform)
+
+        for path in _module_paths(hass, comp_or_platform):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = index.entries.get(comp_or_platform)
+            if entry is None or entry['path'] != path or \
+                    entry['mtime'] != stat.st_mtime or \
+                    entry['size'] != stat.st_size:
+                index.entries[comp_or_platform] = {
+                    'path': path,
+                    'mtime': stat.st_mtime,
+                    'size': stat.st_size,
+                    'metadata': _read_metadata(path),
+                }
+                index.changed = True
+            break
+        else:
+            if index.entries.pop(comp_or_platform, None) is not None:
+                index.changed = True
+
+    entry = index.entries.get(comp_or_platform)
+    if entry is None:
+        return None
+    metadata = entry['metadata']  # type: Optional[Dict[str, List[str]]]
+    return metadata
+
+
+def _fill_metadata_index(hass,  # type: HomeAssistant
+                         index: _MetadataIndex,
+                         names: Iterable[str]) -> None:
+    """Index the metadata of components and platforms with dependencies."""
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in index.checked:
+            continue
+
+        metadata = _indexed_metadata(hass, index, name)
+        if metadata is not None:
+            pending.extend(metadata['dependencies'])
+
+
+def get_metadata(hass,  # type: HomeAssistant
+                 comp_or_platform: str) -> Optional[Dict[str, List[str]]]:
+    """Return the dependencies and requirements of a component or platform.
+
+    Read from the module source and cached in an index, the module is only
+    imported if its metadata can not be read from the source. Returns None
+    if the component or platform does not exist.
+
+    Components that were not indexed by async_load_metadata_index are read
+    when they are looked up.
+    """
+    cache = hass.data.get(DATA_KEY, {})
+    if comp_or_platform in cache:
+        module = cache[comp_or_platform]
+        return None if module is None else _module_metadata(module)
+
+    index = hass.data.get(DATA_METADATA)
+    if index is None:
+        index = hass.data[DATA_METADATA] = _MetadataIndex()
+
+    metadata = _indexed_metadata(hass, index, comp_or_platform)
+    if metadata is not None:
+        return metadata
+
+    module = get_component(hass, comp_or_platform)
+    return None if module is None else _module_metadata(module)
+
+
+async def async_load_metadata_index(
+        hass,  # type: HomeAssistant
+        names: Iterable[str] = ()
+) -> None:
+    """Load the stored index of component metadata.
+
+    The index is brought up to date in the executor for the given
+    components and platforms and their dependencies.
+    """
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, METADATA_STORAGE_VERSION, METADATA_STORAGE_KEY)
+    entries = await store.async_load()
+    index = hass.data[DATA_METADATA] = _MetadataIndex(entries)
+    await hass.async_add_executor_job(
+        _fill_metadata_index, hass, index, names)
+
+
+async def async_save_metadata_index(
+        hass  # type: HomeAssistant
+) -> None:
+    """Store the index of component metadata if it changed."""
+    from homeassistant.helpers.storage import Store
+
+    index = hass.data.get(DATA_METADATA)
+    if index is None or not index.changed:
+        return
+
+    store = Store(hass, METADATA_STORAGE_VERSION, METADATA_STORAGE_KEY)
+    await store.async_save(index.entries)  # type: ignore
+    index.changed = False
+
+
 class ModuleWrapper:
     """Class to wrap a Python module and auto fill in hass argument."""
 
@@ -225,15 +445,15 @@ def _load_order_component(hass,  # type: HomeAssistant
 
     Async friendly.
     """
-    component = get_component(hass, comp_name)
+    metadata = get_metadata(hass, comp_name)
 
     # If None it does not exist, error already thrown by get_component.
-    if component is None:
+    if metadata is None:
         return OrderedSet()
 
     loading.add(comp_name)
 
-    for dependency in getattr(component, 'DEPENDENCIES', []):
+    for dependency in metadata['dependencies']:
         # Check not already loaded
         if dependency in load_order:
             continue
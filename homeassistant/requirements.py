@@ -1,20 +1,27 @@
 """Module to handle installing requirements."""
 import asyncio
 from functools import partial
+import hashlib
 import logging
 import os
 import sys
+from timeit import default_timer as timer
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 import pkg_resources
 
 import homeassistant.util.package as pkg_util
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 DATA_PIP_LOCK = 'pip_lock'
 DATA_PKG_CACHE = 'pkg_cache'
+DATA_REQS_CACHE = 'requirements_cache'
 CONSTRAINT_FILE = 'package_constraints.txt'
+STORAGE_KEY = 'core.requirements'
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+SITE_DIRS = ('site-packages', 'dist-packages')
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -32,24 +39,87 @@ async def async_process_requirements(hass: HomeAssistant, name: str,
     if pkg_cache is None:
         pkg_cache = hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
 
+    reqs_cache = hass.data.get(DATA_REQS_CACHE)
+    if reqs_cache is None:
+        reqs_cache = hass.data[DATA_REQS_CACHE] = RequirementsCache(hass)
+
+    await reqs_cache.async_load()
+
+    missing = [req for req in requirements if req not in reqs_cache.met]
+    if len(missing) < len(requirements):
+        # Imported here to avoid a circular import
+        from homeassistant.setup import (
+            PHASE_REQUIREMENTS_SAVED, async_record_setup_saving)
+
+        async_record_setup_saving(
+            hass, name, PHASE_REQUIREMENTS_SAVED,
+            sum(reqs_cache.met.get(req, 0) for req in requirements))
+
+    if not missing:
+        return True
+
     pip_install = partial(pkg_util.install_package,
                           **pip_kwargs(hass.config.config_dir))
+    installed = False
 
     async with pip_lock:
-        for req in requirements:
-            if await pkg_cache.loadable(req):
-                continue
+        try:
+            for req in missing:
+                start = timer()
+                if await pkg_cache.loadable(req):
+                    reqs_cache.async_add(req, timer() - start)
+                    continue
+
+                ret = await hass.async_add_executor_job(pip_install, req)
 
-            ret = await hass.async_add_executor_job(pip_install, req)
+                if not ret:
+                    _LOGGER.error("Not initializing %s because could not "
+                                  "install requirement %s", name, req)
+                    return False
 
-            if not ret:
-                _LOGGER.error("Not initializing %s because could not install "
-                              "requirement %s", name, req)
-                return False
+                installed = True
+        finally:
+            if installed:
+                await reqs_cache.async_update_fingerprint()
 
     return True
 
 
+async def async_clear_requirements_cache(hass: HomeAssistant) -> None:
+    """Forget which requirements were met.
+
+    All requirements are checked again when they are processed next.
+    This method is a coroutine.
+    """
+    reqs_cache = hass.data.get(DATA_REQS_CACHE)
+    if reqs_cache is None:
+        reqs_cache = hass.data[DATA_REQS_CACHE] = RequirementsCache(hass)
+    await reqs_cache.async_clear()
+
+
+def site_fingerprint() -> str:
+    """Return a fingerprint of the installed packages.
+
+    Installing, upgrading or removing a distribution changes the
+    modification time of the site directory it is installed in. Other
+    directories on the path, like the config dir, change too often.
+    """
+    hasher = hashlib.sha1()
+    hasher.update(sys.executable.encode('utf-8'))
+    hasher.update(sys.version.encode('utf-8'))
+
+    for path in sys.path:
+        if os.path.basename(path) not in SITE_DIRS:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime  # type: Optional[float]
+        except OSError:
+            mtime = None
+        hasher.update('{}:{}'.format(path, mtime).encode('utf-8'))
+
+    return hasher.hexdigest()
+
+
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
     kwargs = {
@@ -105,3 +175,65 @@ class PackageLoadable:
         dist_cache = self.dist_cache
         for dist in pkg_resources.find_distributions(path):
             dist_cache.setdefault(dist.project_name.lower(), dist)
+
+
+class RequirementsCache:
+    """Class to remember the requirements that were met at last start.
+
+    The requirements are stored with the seconds it took to check them and
+    are dropped when the fingerprint of the installed packages changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the requirements cache."""
+        self.hass = hass
+        self.met = {}  # type: Dict[str, float]
+        self.fingerprint = None  # type: Optional[str]
+        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._load_task = None  # type: Optional[asyncio.Future]
+
+    async def async_load(self) -> None:
+        """Load the requirements that are still met."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Load the stored requirements and verify the fingerprint."""
+        data, self.fingerprint = await asyncio.gather(
+            self._store.async_load(),
+            self.hass.async_add_executor_job(site_fingerprint),
+            loop=self.hass.loop)
+
+        if data is not None and data['fingerprint'] == self.fingerprint:
+            self.met = data['met']
+        elif data is not None:
+            _LOGGER.info("Installed packages changed, checking requirements")
+
+    @callback
+    def async_add(self, requirement: str, duration: float) -> None:
+        """Remember a met requirement and the time it took to check."""
+        self.met[requirement] = round(duration, 3)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_clear(self) -> None:
+        """Forget all met requirements."""
+        await self.async_load()
+        self.met = {}
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_update_fingerprint(self) -> None:
+        """Update the fingerprint after packages have been installed."""
+        self.fingerprint = await self.hass.async_add_executor_job(
+            site_fingerprint)
+        if self.met:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {
+            'fingerprint': self.fingerprint,
+            'met': self.met,
+        }
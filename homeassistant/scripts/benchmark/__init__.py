@@ -3,12 +3,15 @@ import argparse
 import asyncio
 from contextlib import suppress
 from datetime import datetime
+from functools import partial
+import json
 import logging
+import random
 from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.util import dt as dt_util
 
 BENCHMARKS = {}
@@ -77,6 +80,35 @@ async def async_million_events(hass):
     return timer() - start
 
 
+@benchmark
+async def async_fire_match_all_listeners(hass):
+    """Run 100k events through 10 listeners of all events."""
+    count = 0
+    event_name = 'benchmark_event'
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**6:
+            event.set()
+
+    for _ in range(10):
+        hass.bus.async_listen(MATCH_ALL, listener)
+
+    for _ in range(10**5):
+        hass.bus.async_fire(event_name)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def async_million_time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -141,6 +173,42 @@ async def async_million_state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_states(hass):
+    """Serialize 2000 states 100 times with the fastest JSON backend."""
+    from homeassistant.helpers.json import JSON_DUMP
+
+    return _json_serialize_states(hass, JSON_DUMP)
+
+
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize 2000 states 100 times with the standard library."""
+    from homeassistant.helpers.json import JSONEncoder
+
+    return _json_serialize_states(
+        hass, partial(json.dumps, cls=JSONEncoder))
+
+
+def _json_serialize_states(hass, dumps):
+    """Serialize the result of get_states for 2000 entities."""
+    for index in range(2000):
+        hass.states.async_set('sensor.benchmark_{}'.format(index), index, {
+            'friendly_name': 'Benchmark {}'.format(index),
+            'unit_of_measurement': 'W',
+            'icon': 'mdi:flash',
+        })
+
+    states = hass.states.async_all()
+
+    start = timer()
+
+    for _ in range(100):
+        dumps(states)
+
+    return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 def logbook_filtering_state(hass):
@@ -189,3 +257,88 @@ def _logbook_filtering(hass, last_changed, last_updated):
     list(logbook.humanify(None, events))
 
     return timer() - start
+
+
+@benchmark
+async def mqtt_message_dispatch(hass):
+    """Dispatch 200k messages to 800 MQTT subscriptions."""
+    from homeassistant.components import mqtt
+
+    class Client(mqtt.MQTT):
+        """MQTT client that does not talk to a broker."""
+
+        async def _async_perform_subscription(self, topic, qos):
+            """Skip the subscription at the broker."""
+            pass
+
+    client = Client(hass, 'localhost', 1883, None, None, None, None, None,
+                    None, None, None, None, None, None, None)
+    count = 0
+
+    @core.callback
+    def message_received(topic, payload, qos):
+        """Count the received messages."""
+        nonlocal count
+        count += 1
+
+    topics = []
+    for index in range(400):
+        topics.append('zigbee2mqtt/device_{}'.format(index))
+        topics.append('stat/tasmota_{}/POWER'.format(index))
+
+    for topic in topics + ['zigbee2mqtt/bridge/#', 'tele/+/LWT']:
+        await client.async_subscribe(topic, message_received, 0, 'utf-8')
+
+    messages = [mqtt.Message(topics[index % len(topics)], b'{"state": "ON"}')
+                for index in range(200000)]
+
+    start = timer()
+
+    for message in messages:
+        client._mqtt_handle_message(message)  # pylint: disable=W0212
+
+    assert count == len(messages)
+
+    return timer() - start
+
+
+@benchmark
+async def zone_active_zone(hass):
+    """Find the active zone of 2000 locations among 150 zones."""
+    return _zone_active_zone(hass, True)
+
+
+@benchmark
+async def zone_active_zone_scan(hass):
+    """Find the active zone of 2000 locations measuring every zone."""
+    return _zone_active_zone(hass, False)
+
+
+def _zone_active_zone(hass, indexed):
+    """Find the active zone of locations around 150 zones in a region."""
+    from homeassistant.components.zone import zone
+
+    rand = random.Random(0)
+
+    if indexed:
+        index = hass.data[zone.DATA_INDEX] = zone.ZoneIndex()
+
+    for number in range(150):
+        hass.states.async_set('zone.benchmark_{}'.format(number), 'zoning', {
+            'latitude': 52.0 + rand.uniform(0, 0.5),
+            'longitude': 4.5 + rand.uniform(0, 0.8),
+            'radius': rand.uniform(100, 500),
+        })
+        if indexed:
+            index.async_update(
+                hass.states.get('zone.benchmark_{}'.format(number)))
+
+    locations = [(52.0 + rand.uniform(0, 0.5), 4.5 + rand.uniform(0, 0.8),
+                  rand.uniform(0, 50)) for _ in range(2000)]
+
+    start = timer()
+
+    for latitude, longitude, accuracy in locations:
+        zone.async_active_zone(hass, latitude, longitude, accuracy)
+
+    return timer() - start
@@ -1,10 +1,13 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+from collections import OrderedDict
 import logging.handlers
 from timeit import default_timer as timer
 
 from types import ModuleType
-from typing import Optional, Dict, List
+from typing import Awaitable, Dict, List, Optional  # noqa pylint: disable=unused-import
+
+import async_timeout
 
 from homeassistant import requirements, core, loader, config as conf_util
 from homeassistant.config import async_notify_setup_error
@@ -19,8 +22,19 @@ ATTR_COMPONENT = 'component'
 
 DATA_SETUP = 'setup_tasks'
 DATA_DEPS_REQS = 'deps_reqs_processed'
+DATA_SETUP_TIMELINE = 'setup_timeline'
 
 SLOW_SETUP_WARNING = 10
+# Seconds after which the async setup of a component is considered failed
+SETUP_TIMEOUT = 300
+
+# Phases of the setup recorded in the startup timeline
+PHASE_IMPORT = 'import'
+PHASE_REQUIREMENTS = 'requirements'
+PHASE_REQUIREMENTS_SAVED = 'requirements_saved'
+PHASE_DEPENDENCIES = 'dependencies'
+PHASE_SETUP = 'setup'
+PHASE_PLATFORMS = 'platforms'
 
 
 def setup_component(hass: core.HomeAssistant, domain: str,
@@ -56,6 +70,87 @@ async def async_setup_component(hass: core.HomeAssistant, domain: str,
     return await task  # type: ignore
 
 
+@core.callback
+def async_record_setup_time(hass: core.HomeAssistant, name: str, phase: str,
+                            start: float, end: float) -> None:
+    """Add the duration of a setup phase to the startup timeline.
+
+    Name is a domain or a platform like light.hue. Durations of the same
+    phase add up.
+    """
+    timings = _async_get_timings(hass, name, start)
+    timings[phase] = round(timings.get(phase, 0) + end - start, 3)
+
+
+@core.callback
+def async_record_setup_saving(hass: core.HomeAssistant, name: str,
+                              phase: str, seconds: float) -> None:
+    """Add the time a cache saved during setup to the startup timeline."""
+    timings = _async_get_timings(hass, name, timer())
+    timings[phase] = round(timings.get(phase, 0) + seconds, 3)
+
+
+@core.callback
+def _async_get_timings(hass: core.HomeAssistant, name: str,
+                       start: float) -> Dict:
+    """Return the recorded timings of a component or platform."""
+    timeline = hass.data.get(DATA_SETUP_TIMELINE)
+    if timeline is None:
+        timeline = hass.data[DATA_SETUP_TIMELINE] = OrderedDict()
+
+    timings = timeline.get(name)
+    if timings is None:
+        timings = timeline[name] = {'start': start}
+    else:
+        timings['start'] = min(timings['start'], start)
+
+    return timings
+
+
+@core.callback
+def async_get_setup_timeline(hass: core.HomeAssistant) -> List[Dict]:
+    """Return the recorded setup phases of all components.
+
+    Start times are relative to the start of the first recorded phase.
+    """
+    timeline = hass.data.get(DATA_SETUP_TIMELINE)
+    if not timeline:
+        return []
+
+    first = min(timings['start'] for timings in timeline.values())
+    return sorted((dict(timings, name=name,
+                        start=round(timings['start'] - first, 3))
+                   for name, timings in timeline.items()),
+                  key=lambda timings: timings['start'])
+
+
+@core.callback
+def async_log_setup_timeline(hass: core.HomeAssistant,
+                             count: int = 10) -> None:
+    """Log the components that took longest to set up."""
+    timeline = async_get_setup_timeline(hass)
+
+    def duration(timings: Dict) -> float:
+        """Return the time spent setting up, dependencies excluded."""
+        return sum(value for phase, value in timings.items()
+                   if phase not in ('name', 'start', PHASE_DEPENDENCIES,
+                                    PHASE_REQUIREMENTS_SAVED))
+
+    timeline.sort(key=duration, reverse=True)
+
+    for timings in timeline[:count]:
+        _LOGGER.info(
+            "Setup of %s took %.2fs: %s", timings['name'], duration(timings),
+            ', '.join('{} {:.2f}s'.format(phase, value)
+                      for phase, value in sorted(timings.items())
+                      if phase not in ('name', 'start')))
+
+    saved = sum(timings.get(PHASE_REQUIREMENTS_SAVED, 0)
+                for timings in timeline)
+    if saved:
+        _LOGGER.info("Skipped %.2fs of requirement checks", saved)
+
+
 async def _async_process_dependencies(
         hass: core.HomeAssistant, config: Dict, name: str,
         dependencies: List[str]) -> bool:
@@ -100,9 +195,7 @@ async def _async_setup_component(hass: core.HomeAssistant,
         _LOGGER.error("Setup failed for %s: %s", domain, msg)
         async_notify_setup_error(hass, domain, link)
 
-    component = loader.get_component(hass, domain)
-
-    if not component:
+    if loader.get_metadata(hass, domain) is None:
         log_error("Component not found.", False)
         return False
 
@@ -114,6 +207,16 @@ async def _async_setup_component(hass: core.HomeAssistant,
         log_error("Unable to resolve component or dependencies.")
         return False
 
+    start = timer()
+    component = loader.get_component(hass, domain)
+    async_record_setup_time(hass, domain, PHASE_IMPORT, start, timer())
+
+    if not component:
+        log_error("Component not found.", False)
+        return False
+
+    # Reject invalid config before installing requirements or setting up
+    # dependencies
     processed_config = \
         conf_util.async_process_component_config(hass, config, domain)
 
@@ -122,7 +225,7 @@ async def _async_setup_component(hass: core.HomeAssistant,
         return False
 
     try:
-        await async_process_deps_reqs(hass, config, domain, component)
+        await async_process_deps_reqs(hass, config, domain)
     except HomeAssistantError as err:
         log_error(str(err))
         return False
@@ -141,17 +244,24 @@ async def _async_setup_component(hass: core.HomeAssistant,
 
     try:
         if hasattr(component, 'async_setup'):
-            result = await component.async_setup(  # type: ignore
-                hass, processed_config)
+            # A setup in the executor can not be cancelled and would go on
+            # after it was declared failed, so only async setups time out
+            with async_timeout.timeout(SETUP_TIMEOUT, loop=hass.loop):
+                result = await component.async_setup(  # type: ignore
+                    hass, processed_config)
         else:
             result = await hass.async_add_executor_job(
                 component.setup, hass, processed_config)  # type: ignore
+    except asyncio.TimeoutError:
+        log_error("Setup timed out after {} seconds.".format(SETUP_TIMEOUT))
+        return False
     except Exception:  # pylint: disable=broad-except
         _LOGGER.exception("Error during setup of component %s", domain)
         async_notify_setup_error(hass, domain, True)
         return False
     finally:
         end = timer()
+        async_record_setup_time(hass, domain, PHASE_SETUP, start, end)
         if warn_task:
             warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds.", domain, end - start)
@@ -198,33 +308,36 @@ async def async_prepare_setup_platform(hass: core.HomeAssistant, config: Dict,
                       platform_path, msg)
         async_notify_setup_error(hass, platform_path)
 
-    platform = loader.get_platform(hass, domain, platform_name)
-
     # Not found
-    if platform is None:
+    if loader.get_metadata(hass, platform_path) is None:
         log_error("Platform not found.")
         return None
 
-    # Already loaded
-    if platform_path in hass.config.components:
-        return platform
+    if platform_path not in hass.config.components:
+        try:
+            await async_process_deps_reqs(hass, config, platform_path)
+        except HomeAssistantError as err:
+            log_error(str(err))
+            return None
 
-    try:
-        await async_process_deps_reqs(
-            hass, config, platform_path, platform)
-    except HomeAssistantError as err:
-        log_error(str(err))
-        return None
+    start = timer()
+    platform = loader.get_platform(hass, domain, platform_name)
+    async_record_setup_time(hass, platform_path, PHASE_IMPORT, start, timer())
+
+    if platform is None:
+        log_error("Platform not found.")
 
     return platform
 
 
 async def async_process_deps_reqs(
         hass: core.HomeAssistant, config: Dict, name: str,
-        module: ModuleType) -> None:
+        module: Optional[ModuleType] = None) -> None:
     """Process all dependencies and requirements for a module.
 
-    Module is a Python module of either a component or platform.
+    Module is a Python module of either a component or platform. If it is
+    not passed, the metadata is looked up without importing the module.
+    Dependencies are set up while the requirements are processed.
     """
     processed = hass.data.get(DATA_DEPS_REQS)
 
@@ -233,18 +346,49 @@ async def async_process_deps_reqs(
     elif name in processed:
         return
 
-    if hasattr(module, 'DEPENDENCIES'):
-        dep_success = await _async_process_dependencies(
-            hass, config, name, module.DEPENDENCIES)  # type: ignore
-
-        if not dep_success:
-            raise HomeAssistantError("Could not set up all dependencies.")
-
-    if not hass.config.skip_pip and hasattr(module, 'REQUIREMENTS'):
-        req_success = await requirements.async_process_requirements(
-            hass, name, module.REQUIREMENTS)  # type: ignore
-
-        if not req_success:
-            raise HomeAssistantError("Could not install all requirements.")
+    if module is None:
+        metadata = loader.get_metadata(hass, name)
+        if metadata is None:
+            raise HomeAssistantError("Component not found.")
+        dependencies = metadata['dependencies']
+        reqs = metadata['requirements']
+    else:
+        dependencies = getattr(module, 'DEPENDENCIES', None)
+        reqs = getattr(module, 'REQUIREMENTS', None)
+
+    async def process_dependencies() -> bool:
+        """Set up the dependencies."""
+        start = timer()
+        try:
+            return await _async_process_dependencies(
+                hass, config, name, dependencies)
+        finally:
+            async_record_setup_time(
+                hass, name, PHASE_DEPENDENCIES, start, timer())
+
+    async def process_requirements() -> bool:
+        """Install the requirements."""
+        start = timer()
+        try:
+            return await requirements.async_process_requirements(
+                hass, name, reqs)
+        finally:
+            async_record_setup_time(
+                hass, name, PHASE_REQUIREMENTS, start, timer())
+
+    tasks = OrderedDict()  # type: Dict[str, Awaitable[bool]]
+    if dependencies:
+        tasks[PHASE_DEPENDENCIES] = process_dependencies()
+    if not hass.config.skip_pip and reqs:
+        tasks[PHASE_REQUIREMENTS] = process_requirements()
+
+    results = dict(zip(tasks, await asyncio.gather(
+        *tasks.values(), loop=hass.loop)))
+
+    if not results.get(PHASE_DEPENDENCIES, True):
+        raise HomeAssistantError("Could not set up all dependencies.")
+
+    if not results.get(PHASE_REQUIREMENTS, True):
+        raise HomeAssistantError("Could not install all requirements.")
 
     processed.add(name)
@@ -1,10 +1,14 @@
 """YAML utility functions."""
+import hashlib
+import json
 import logging
 import os
 import sys
 import fnmatch
+import threading
 from collections import OrderedDict
-from typing import Union, List, Dict, Iterator, overload, TypeVar
+from typing import (
+    Any, Union, List, Dict, Iterator, Optional, overload, TypeVar)
 
 import yaml
 try:
@@ -17,6 +21,7 @@ try:
 except ImportError:
     credstash = None
 
+from homeassistant.const import __version__
 from homeassistant.exceptions import HomeAssistantError
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,6 +29,10 @@ _SECRET_NAMESPACE = 'homeassistant'
 SECRET_YAML = 'secrets.yaml'
 __SECRET_CACHE = {}  # type: Dict[str, JSON_TYPE]
 
+CACHE_VERSION = 2
+# Sources of the YAML that is being loaded into the cache, per thread
+_SOURCES = threading.local()
+
 JSON_TYPE = Union[List, Dict, str]  # pylint: disable=invalid-name
 DICT_T = TypeVar('DICT_T', bound=Dict)  # pylint: disable=invalid-name
 
@@ -54,6 +63,24 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if hasattr(yaml, 'CSafeLoader'):
+    # pylint: disable=too-many-ancestors
+    class CSafeLineLoader(yaml.CSafeLoader):  # type: ignore
+        """Loader class using LibYAML, line numbers are in the node marks."""
+
+        def __init__(self, stream: Any) -> None:
+            """Initialize the loader and remember the file name."""
+            super().__init__(stream)
+            self.name = getattr(stream, 'name', '')
+            self.stream = stream
+
+    LOADER = CSafeLineLoader  # type: type
+    LOADERS = (yaml.SafeLoader, CSafeLineLoader)  # type: tuple
+else:
+    LOADER = SafeLineLoader
+    LOADERS = (yaml.SafeLoader,)
+
+
 # pylint: disable=pointless-statement
 @overload
 def _add_reference(obj: Union[list, NodeListClass],
@@ -88,11 +115,12 @@ def _add_reference(obj, loader: SafeLineLoader,  # type: ignore # noqa: F811
 
 def load_yaml(fname: str) -> JSON_TYPE:
     """Load a YAML file."""
+    _add_source('files', fname)
     try:
         with open(fname, encoding='utf-8') as conf_file:
             # If configuration file is empty YAML returns None
             # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+            return yaml.load(conf_file, Loader=LOADER) or OrderedDict()
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc)
@@ -101,6 +129,198 @@ def load_yaml(fname: str) -> JSON_TYPE:
         raise HomeAssistantError(exc)
 
 
+def load_yaml_cached(fname: str, cache_path: str) -> JSON_TYPE:
+    """Load a YAML file, or its parsed version from the cache.
+
+    The cache holds the parsed YAML together with the state of every file,
+    directory and environment variable it was loaded from and is only used
+    while none of them changed.
+    """
+    cached = _load_cache(fname, cache_path)
+    if cached is not None:
+        return cached
+
+    sources = _SOURCES.current = {
+        'files': set(), 'dirs': set(), 'env_vars': set(), 'cacheable': True}
+    try:
+        loaded = load_yaml(fname)
+    finally:
+        _SOURCES.current = None
+
+    if sources['cacheable']:
+        _save_cache(fname, cache_path, loaded, sources)
+
+    return loaded
+
+
+def _add_source(kind: str, value: Optional[str]) -> None:
+    """Add a source of the YAML that is being loaded into the cache."""
+    sources = getattr(_SOURCES, 'current', None)
+    if sources is None:
+        return
+    if value is None:
+        sources['cacheable'] = False
+    else:
+        sources[kind].add(value)
+
+
+def _file_state(path: str, with_hash: bool = True) -> Optional[List]:
+    """Return modification time, size and hash of a file or directory.
+
+    Directories are hashed by the names of their entries.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    if not with_hash:
+        return [stat.st_mtime_ns, stat.st_size, None]
+
+    hasher = hashlib.sha1()
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            hasher.update(name.encode('utf-8', 'surrogateescape') + b'\0')
+    else:
+        with open(path, 'rb') as source:
+            hasher.update(source.read())
+
+    return [stat.st_mtime_ns, stat.st_size, hasher.hexdigest()]
+
+
+def _state_unchanged(path: str, state: Optional[List]) -> bool:
+    """Return if a file or directory still has the stored state.
+
+    The hash is only compared if the modification time or size changed.
+    """
+    current = _file_state(path, False)
+    if current is None or state is None:
+        return current == state
+    if current[:2] == state[:2]:
+        return True
+    current = _file_state(path)
+    return current is not None and current[2] == state[2]
+
+
+def _env_state(name: str) -> Optional[str]:
+    """Return a hash of the value of an environment variable."""
+    value = os.environ.get(name)
+    if value is None:
+        return None
+    return hashlib.sha1(value.encode('utf-8', 'surrogateescape')).hexdigest()
+
+
+def _encode_cache(obj: Any) -> Any:
+    """Convert parsed YAML to plain JSON types.
+
+    Containers and strings loaded from a file keep the file name and line in
+    the encoded value. Raises TypeError for values that can not be cached.
+    """
+    if obj is None or type(obj) in (bool, int, float, str):
+        return obj
+    if isinstance(obj, str):
+        encoded = {'str': str(obj)}  # type: Dict[str, Any]
+    elif isinstance(obj, list):
+        encoded = {'seq': [_encode_cache(item) for item in obj]}
+    elif isinstance(obj, dict):
+        encoded = {'map': [[_encode_cache(key), _encode_cache(value)]
+                           for key, value in obj.items()]}
+    else:
+        raise TypeError("Unable to cache {}".format(type(obj).__name__))
+
+    if hasattr(obj, '__config_file__'):
+        encoded['file'] = getattr(obj, '__config_file__')
+    if hasattr(obj, '__line__'):
+        encoded['line'] = getattr(obj, '__line__')
+    return encoded
+
+
+def _decode_cache(obj: Any) -> Any:
+    """Restore parsed YAML converted by _encode_cache."""
+    if not isinstance(obj, dict):
+        return obj
+    if 'str' in obj:
+        decoded = NodeStrClass(obj['str'])  # type: Any
+    elif 'seq' in obj:
+        decoded = NodeListClass(_decode_cache(item) for item in obj['seq'])
+    else:
+        decoded = OrderedDict(
+            (_decode_cache(key), _decode_cache(value))
+            for key, value in obj['map'])
+
+    if 'file' in obj:
+        setattr(decoded, '__config_file__', obj['file'])
+    if 'line' in obj:
+        setattr(decoded, '__line__', obj['line'])
+    return decoded
+
+
+def _load_cache(fname: str, cache_path: str) -> Optional[JSON_TYPE]:
+    """Load the parsed YAML from the cache if it is still valid."""
+    try:
+        with open(cache_path, encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        _LOGGER.warning("Unable to read config cache %s", cache_path)
+        return None
+
+    try:
+        if cache['version'] != [CACHE_VERSION, __version__] or \
+                cache['path'] != os.path.abspath(fname):
+            return None
+        for path, state in cache['files'].items():
+            if not _state_unchanged(path, state):
+                return None
+        for name, state in cache['env_vars'].items():
+            if _env_state(name) != state:
+                return None
+        config = _decode_cache(cache['config'])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        _LOGGER.warning("Invalid config cache %s", cache_path)
+        return None
+
+    _LOGGER.debug("Loaded %s from config cache %s", fname, cache_path)
+    return config
+
+
+def _save_cache(fname: str, cache_path: str, loaded: JSON_TYPE,
+                sources: Dict) -> None:
+    """Store the parsed YAML and the state of its sources in the cache."""
+    files = {}
+    for path in sources['files'] | sources['dirs']:
+        state = _file_state(path)
+        # Only cache YAML loaded from the file system
+        if state is None and path in sources['files'] and \
+                not path.endswith(SECRET_YAML):
+            return
+        files[os.path.abspath(path)] = state
+
+    try:
+        config = _encode_cache(loaded)
+    except (TypeError, RecursionError) as err:
+        _LOGGER.debug("Not caching %s: %s", fname, err)
+        return
+
+    cache = {
+        'version': [CACHE_VERSION, __version__],
+        'path': os.path.abspath(fname),
+        'files': files,
+        'env_vars': {name: _env_state(name) for name in sources['env_vars']},
+        'config': config,
+    }
+
+    tmp_path = '{}.tmp'.format(cache_path)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Unable to write config cache %s: %s",
+                        cache_path, err)
+
+
 def dump(_dict: dict) -> str:
     """Dump YAML to a string and remove null."""
     return yaml.safe_dump(
@@ -142,7 +362,9 @@ def _is_file_valid(name: str) -> bool:
 
 def _find_files(directory: str, pattern: str) -> Iterator[str]:
     """Recursively load files in a directory."""
+    _add_source('dirs', directory)
     for root, dirs, files in os.walk(directory, topdown=True):
+        _add_source('dirs', root)
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in files:
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -211,14 +433,14 @@ def _ordered_dict(loader: SafeLineLoader,
         try:
             hash(key)
         except TypeError:
-            fname = getattr(loader.stream, 'name', '')
+            fname = loader.name
             raise yaml.MarkedYAMLError(
                 context="invalid key: \"{}\"".format(key),
                 context_mark=yaml.Mark(fname, 0, line, -1, None, None)
             )
 
         if key in seen:
-            fname = getattr(loader.stream, 'name', '')
+            fname = loader.name
             _LOGGER.error(
                 'YAML file %s contains duplicate key "%s". '
                 'Check lines %d and %d.', fname, key, seen[key], line)
@@ -237,6 +459,7 @@ def _env_var_yaml(loader: SafeLineLoader,
                   node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    _add_source('env_vars', args[0])
 
     # Check for a default value
     if len(args) > 1:
@@ -250,6 +473,7 @@ def _env_var_yaml(loader: SafeLineLoader,
 def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
     """Load the secrets yaml from path."""
     secret_path = os.path.join(secret_path, SECRET_YAML)
+    _add_source('files', secret_path)
     if secret_path in __SECRET_CACHE:
         return __SECRET_CACHE[secret_path]
 
@@ -296,6 +520,7 @@ def secret_yaml(loader: SafeLineLoader,
         pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
         if pwd:
             _LOGGER.debug("Secret %s retrieved from keyring", node.value)
+            _add_source('secrets', None)
             return pwd
 
     global credstash  # pylint: disable=invalid-name
@@ -306,6 +531,7 @@ def secret_yaml(loader: SafeLineLoader,
             pwd = credstash.getSecret(node.value, table=_SECRET_NAMESPACE)
             if pwd:
                 _LOGGER.debug("Secret %s retrieved from credstash", node.value)
+                _add_source('secrets', None)
                 return pwd
         except credstash.ItemNotFound:
             pass
@@ -316,19 +542,22 @@ def secret_yaml(loader: SafeLineLoader,
     raise HomeAssistantError("Secret {} not defined".format(node.value))
 
 
-yaml.SafeLoader.add_constructor('!include', _include_yaml)
-yaml.SafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                _ordered_dict)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
-yaml.SafeLoader.add_constructor('!env_var', _env_var_yaml)
-yaml.SafeLoader.add_constructor('!secret', secret_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_list', _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_list',
-                                _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_named', _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_named',
-                                _include_dir_merge_named_yaml)
+def add_constructor(tag: str, constructor: Any) -> None:
+    """Add a constructor for a tag to the YAML loaders."""
+    for loader in LOADERS:
+        loader.add_constructor(tag, constructor)
+
+
+add_constructor('!include', _include_yaml)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG,
+                _construct_seq)
+add_constructor('!env_var', _env_var_yaml)
+add_constructor('!secret', secret_yaml)
+add_constructor('!include_dir_list', _include_dir_list_yaml)
+add_constructor('!include_dir_merge_list', _include_dir_merge_list_yaml)
+add_constructor('!include_dir_named', _include_dir_named_yaml)
+add_constructor('!include_dir_merge_named', _include_dir_merge_named_yaml)
 
 
 # From: https://gist.github.com/miracle2k/3184458
@@ -7,7 +7,8 @@ from homeassistant.components.mqtt.discovery import async_start, \
                                        ALREADY_DISCOVERED
 from homeassistant.const import STATE_ON, STATE_OFF
 
-from tests.common import async_fire_mqtt_message, mock_coro, MockConfigEntry
+from tests.common import (
+    async_fire_mqtt_message, mock_coro, mock_coro_func, MockConfigEntry)
 
 
 @asyncio.coroutine
@@ -207,10 +208,60 @@ def test_non_duplicate_discovery(hass, mqtt_mock, caplog):
     assert state is not None
     assert state.name == 'Beer'
     assert state_duplicate is None
+    assert 'Component has already been discovered: ' \
+           'binary_sensor bla' not in caplog.text
+
+
+@asyncio.coroutine
+def test_unchanged_discovery_payload(hass, mqtt_mock, caplog):
+    """Test an unchanged payload of a discovered component is skipped."""
+    entry = MockConfigEntry(domain=mqtt.DOMAIN)
+
+    yield from async_start(hass, 'homeassistant', {}, entry)
+
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/bla/config',
+                            '{ "name": "Beer" }')
+    yield from hass.async_block_till_done()
+
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/bla/config',
+                            '{"name":"Beer"}')
+    yield from hass.async_block_till_done()
+
+    assert 'Component has already been discovered: ' \
+           'binary_sensor bla' not in caplog.text
+
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/bla/config',
+                            '{ "name": "Milk" }')
+    yield from hass.async_block_till_done()
+
     assert 'Component has already been discovered: ' \
            'binary_sensor bla' in caplog.text
 
 
+@asyncio.coroutine
+def test_discovery_window(hass, mqtt_mock, caplog):
+    """Test payloads received together are applied together."""
+    entry = MockConfigEntry(domain=mqtt.DOMAIN)
+
+    yield from async_start(hass, 'homeassistant', {}, entry)
+
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/bla/config',
+                            '{ "name": "Beer" }')
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/bla/config',
+                            '{ "name": "Milk" }')
+    async_fire_mqtt_message(hass, 'homeassistant/binary_sensor/foo/config',
+                            '{ "name": "Water" }')
+
+    with patch('homeassistant.helpers.entity_platform.EntityPlatform.'
+               'async_add_entities',
+               side_effect=mock_coro_func()) as mock_add:
+        yield from hass.async_block_till_done()
+
+    assert len(mock_add.mock_calls) == 1
+    assert [entity.name for entity in mock_add.mock_calls[0][1][0]] == \
+        ['Milk', 'Water']
+
+
 @asyncio.coroutine
 def test_discovery_expansion(hass, mqtt_mock, caplog):
     """Test expansion of abbreviated discovery payload."""
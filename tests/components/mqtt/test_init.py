@@ -735,3 +735,81 @@ def test_mqtt_subscribes_topics_on_connect(hass):
 async def test_setup_fails_without_config(hass):
     """Test if the MQTT component fails to load with no config."""
     assert not await async_setup_component(hass, mqtt.DOMAIN, {})
+
+
+def test_subscription_index():
+    """Test the subscription index matches and removes subscriptions."""
+    index = mqtt.SubscriptionIndex()
+    subscriptions = [mqtt.Subscription(topic, None) for topic in (
+        'home/kitchen/temp', 'home/+/temp', 'home/#', '#', '$SYS/#')]
+    for subscription in subscriptions:
+        index.add(subscription)
+
+    def topics(topic):
+        """Return the sorted topic filters that match a topic."""
+        return sorted(sub.topic for sub in index.match(topic))
+
+    assert topics('home/kitchen/temp') == \
+        ['#', 'home/#', 'home/+/temp', 'home/kitchen/temp']
+    assert topics('home') == ['#', 'home/#']
+    assert topics('$SYS/uptime') == ['$SYS/#']
+    assert topics('office/temp') == ['#']
+
+    index.remove(subscriptions[0])
+    index.remove(subscriptions[3])
+    assert topics('home/kitchen/temp') == ['home/#', 'home/+/temp']
+
+    for subscription in subscriptions[1:3] + subscriptions[4:]:
+        index.remove(subscription)
+    assert not index.match('home/kitchen/temp')
+    assert not index._root.children
+
+
+async def test_messages_handled_in_batches(hass):
+    """Test messages from the MQTT thread wake up the loop once."""
+    await async_mock_mqtt_client(hass)
+    calls = []
+
+    @callback
+    def record_calls(topic, payload, qos):
+        """Record the received payloads."""
+        calls.append(payload)
+
+    await mqtt.async_subscribe(hass, 'test-topic', record_calls)
+    await mqtt.async_subscribe(hass, 'test-topic', record_calls)
+
+    with mock.patch.object(
+            hass.loop, 'call_soon_threadsafe',
+            wraps=hass.loop.call_soon_threadsafe) as mock_call_soon:
+        for payload in (b'1', b'2', b'3'):
+            hass.data['mqtt']._mqtt_on_message(
+                None, None, mqtt.Message('test-topic', payload))
+
+    assert mock_call_soon.call_count == 1
+
+    await hass.async_block_till_done()
+    assert calls == ['1', '1', '2', '2', '3', '3']
+
+
+async def test_failing_subscriber_does_not_stop_batch(hass, caplog):
+    """Test a failing subscriber does not keep other messages pending."""
+    await async_mock_mqtt_client(hass)
+    calls = []
+
+    @callback
+    def record_calls(topic, payload, qos):
+        """Record the received payloads and fail on the first one."""
+        calls.append(payload)
+        if payload == '1':
+            raise ValueError('Broken subscriber')
+
+    await mqtt.async_subscribe(hass, 'test-topic', record_calls)
+
+    for payload in (b'1', b'2'):
+        hass.data['mqtt']._mqtt_on_message(
+            None, None, mqtt.Message('test-topic', payload))
+
+    await hass.async_block_till_done()
+    assert calls == ['1', '2']
+    assert not hass.data['mqtt']._pending_messages
+    assert 'Error handling message on test-topic' in caplog.text
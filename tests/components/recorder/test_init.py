@@ -1,16 +1,22 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant.core import callback
-from homeassistant.const import MATCH_ALL
-from homeassistant.components.recorder import Recorder
+from homeassistant.core import Event, callback
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.components.websocket_api.const import TYPE_RESULT
+from homeassistant.components.recorder import (
+    PurgeTask, Recorder, _NOTHING_PENDING)
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    Events, StateAttributes, States)
+
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -202,3 +208,228 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+def test_saving_state_batched(hass_recorder):
+    """Test that states written in one batch keep their event linkage."""
+    hass = hass_recorder({'max_batch_size': 2, 'commit_interval': 0.1})
+    states = _add_entities(hass, ['test.one', 'test.two', 'test.three'])
+    assert len(states) == 3
+
+    with session_scope(hass=hass) as session:
+        for db_state in session.query(States):
+            assert db_state.event_id is not None
+            db_event = session.query(Events).filter_by(
+                event_id=db_state.event_id).one()
+            assert db_event.event_type == 'state_changed'
+
+
+def test_collect_batch_stops_at_control_task():
+    """Test that collecting a batch hands back a pending purge task."""
+    hass = get_test_home_assistant()
+    rec = Recorder(hass, keep_days=7, purge_interval=2, uri='sqlite://',
+                   include={}, exclude={}, max_batch_size=10)
+    task = PurgeTask(7, False)
+    rec.queue.put('event_2')
+    rec.queue.put(task)
+    rec.queue.put('event_3')
+
+    batch, pending = rec._collect_batch('event_1')
+
+    assert batch == ['event_1', 'event_2']
+    assert pending is task
+    hass.stop()
+
+
+def test_collect_batch_max_size():
+    """Test that a batch never grows beyond the max batch size."""
+    hass = get_test_home_assistant()
+    rec = Recorder(hass, keep_days=7, purge_interval=2, uri='sqlite://',
+                   include={}, exclude={}, max_batch_size=2)
+    rec.queue.put('event_2')
+    rec.queue.put('event_3')
+
+    batch, pending = rec._collect_batch('event_1')
+
+    assert batch == ['event_1', 'event_2']
+    assert pending is _NOTHING_PENDING
+    assert rec.queue.qsize() == 1
+    hass.stop()
+
+
+def test_collect_batch_stops_at_shutdown():
+    """Test that collecting a batch hands back the shutdown task."""
+    hass = get_test_home_assistant()
+    rec = Recorder(hass, keep_days=7, purge_interval=2, uri='sqlite://',
+                   include={}, exclude={}, max_batch_size=10)
+    rec.queue.put(None)
+
+    batch, pending = rec._collect_batch('event_1')
+
+    assert batch == ['event_1']
+    assert pending is None
+    assert rec.queue.empty()
+    hass.stop()
+
+
+def test_stop_with_queued_events():
+    """Test the recorder writes queued events and stops on shutdown."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass, {'commit_interval': 0.1})
+    hass.start()
+    hass.block_till_done()
+    instance = hass.data[DATA_INSTANCE]
+
+    for index in range(10):
+        hass.states.set('test.queued', index)
+    hass.stop()
+    instance.join(5)
+
+    assert not instance.is_alive()
+
+
+def test_commit_batch_database_error(hass_recorder):
+    """Test a failing batch is dropped without stopping the recorder."""
+    from sqlalchemy.exc import IntegrityError
+
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(instance, '_insert_events',
+                      side_effect=IntegrityError('insert', {}, None)):
+        _add_entities(hass, ['test.dropped'])
+
+    states = _add_entities(hass, ['test.saved'])
+    assert instance.is_alive()
+    assert [state.entity_id for state in states] == ['test.saved']
+
+
+def test_insert_events_allocates_ids(hass_recorder):
+    """Test bulk inserted states link to the events inserted with them."""
+    hass = hass_recorder()
+    hass.bus.fire('test_event')
+    _add_entities(hass, ['test.one', 'test.two'])
+
+    with session_scope(hass=hass) as session:
+        event_ids = [row.event_id for row in session.query(Events)]
+        assert len(event_ids) == len(set(event_ids))
+
+        for db_state in session.query(States):
+            db_event = session.query(Events).filter_by(
+                event_id=db_state.event_id).one()
+            assert db_event.to_native().data['entity_id'] == \
+                db_state.entity_id
+
+
+def test_insert_events_keeps_ids_free(hass_recorder):
+    """Test rows inserted outside of the recorder get unused ids."""
+    hass = hass_recorder()
+    _add_entities(hass, ['test.one', 'test.two'])
+
+    with session_scope(hass=hass) as session:
+        event = Events(event_type='outside', event_data='{}', origin='LOCAL',
+                       time_fired=dt_util.utcnow())
+        session.add(event)
+        session.flush()
+        assert session.query(Events).filter_by(
+            event_id=event.event_id).count() == 1
+
+
+def test_advance_sequences_postgresql():
+    """Test the PostgreSQL sequences are moved past the inserted ids."""
+    hass = get_test_home_assistant()
+    instance = Recorder(hass, keep_days=7, purge_interval=2, uri='sqlite://',
+                        include={}, exclude={})
+    instance.engine = Mock()
+    session = Mock()
+
+    instance.engine.dialect.name = 'sqlite'
+    instance._advance_sequences(session, {('events', 'event_id'): 5})
+    assert not session.execute.called
+
+    instance.engine.dialect.name = 'postgresql'
+    instance._advance_sequences(session, {('events', 'event_id'): 5})
+    assert len(session.execute.mock_calls) == 1
+    assert 'setval' in str(session.execute.mock_calls[0][1][0])
+    assert session.execute.mock_calls[0][1][1] == {
+        'table': 'events', 'column': 'event_id', 'last_id': 5}
+    hass.stop()
+
+
+def test_saving_state_shared_attributes(hass_recorder):
+    """Test identical attributes are only stored once."""
+    hass = hass_recorder()
+    hass.states.set('test.one', 'on', {'friendly_name': 'One'})
+    hass.states.set('test.one', 'off', {'friendly_name': 'One'})
+    hass.states.set('test.two', 'on', {'friendly_name': 'Two'})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 3
+        assert db_states[0].attributes is None
+        assert db_states[0].attributes_id == db_states[1].attributes_id
+        states = [db_state.to_native() for db_state in db_states]
+
+    assert states[1] == hass.states.get('test.one')
+    assert states[2] == hass.states.get('test.two')
+
+
+def test_saving_state_links_old_state(hass_recorder):
+    """Test states are linked to the previous state of their entity."""
+    hass = hass_recorder()
+    hass.states.set('test.one', 'on')
+    hass.states.set('test.one', 'off')
+    hass.states.remove('test.one')
+    hass.states.set('test.one', 'on')
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.old_state_id for db_state in db_states] == [
+            None, db_states[0].state_id, db_states[1].state_id, None]
+
+
+def test_event_listener_drops_events_when_full():
+    """Test that low priority events are dropped first when backed up."""
+    hass = get_test_home_assistant()
+    rec = Recorder(hass, keep_days=7, purge_interval=2, uri='sqlite://',
+                   include={}, exclude={}, max_queue_size=4)
+
+    for _ in range(2):
+        rec.event_listener(Event('test_event'))
+    assert rec.queue.qsize() == 2
+
+    rec.event_listener(Event('test_event'))
+    assert rec.queue.qsize() == 2
+    assert rec.dropped_events == 1
+
+    for _ in range(3):
+        rec.event_listener(Event(EVENT_STATE_CHANGED, {
+            'entity_id': 'test.recorder'}))
+    assert rec.queue.qsize() == 4
+    assert rec.dropped_events == 2
+    hass.stop()
+
+
+async def test_ws_info(hass, hass_ws_client):
+    """Test the recorder info websocket command."""
+    with patch('homeassistant.components.recorder.migration.migrate_schema'):
+        assert await async_setup_component(hass, 'recorder', {
+            'recorder': {'db_url': 'sqlite://', 'max_queue_size': 500}
+        })
+
+    client = await hass_ws_client(hass)
+    await client.send_json({
+        'id': 5,
+        'type': 'recorder/info',
+    })
+    msg = await client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == TYPE_RESULT
+    assert msg['success']
+    assert msg['result']['max_queue_size'] == 500
+    assert msg['result']['dropped_events'] == 0
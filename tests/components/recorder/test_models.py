@@ -78,6 +78,43 @@ class TestStates(unittest.TestCase):
         assert db_state.last_changed == event.time_fired
         assert db_state.last_updated == event.time_fired
 
+    def test_timestamp_columns(self):
+        """Test timestamp columns are filled from the datetime columns."""
+        session = SESSION()
+        state = ha.State('sensor.temperature', '18')
+        event = ha.Event(EVENT_STATE_CHANGED, {
+            'entity_id': 'sensor.temperature',
+            'old_state': None,
+            'new_state': state,
+        }, context=state.context)
+        db_state = States.from_event(event)
+        session.add(db_state)
+        session.flush()
+
+        assert db_state.last_updated_ts == state.last_updated.timestamp()
+        assert db_state.last_changed_ts == state.last_changed.timestamp()
+        assert db_state.to_native() == state
+        session.rollback()
+
+    def test_timestamp_columns_naive_datetime(self):
+        """Test naive datetimes are treated as UTC."""
+        session = SESSION()
+        db_state = States(
+            entity_id='sensor.temperature',
+            state='20',
+            attributes='{}',
+            last_changed=datetime(2016, 7, 9, 8, 0, 0),
+            last_updated=datetime(2016, 7, 9, 8, 0, 0),
+        )
+        session.add(db_state)
+        session.flush()
+
+        assert db_state.last_updated_ts == datetime(
+            2016, 7, 9, 8, 0, 0, tzinfo=dt.UTC).timestamp()
+        assert db_state.to_native().last_updated == datetime(
+            2016, 7, 9, 8, 0, 0, tzinfo=dt.UTC)
+        session.rollback()
+
 
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
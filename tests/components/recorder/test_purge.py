@@ -6,8 +6,9 @@ from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.purge import PurgeRun, purge_old_data
+from homeassistant.components.recorder.models import (
+    Events, StateAttributes, States)
 from homeassistant.components.recorder.util import session_scope
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -209,3 +210,51 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 assert mock_logger.debug.mock_calls[4][1][0] == \
                     "Vacuuming SQLite to free space"
+
+    def test_purge_in_chunks(self):
+        """Test purging old data over multiple chunks."""
+        self._add_test_events()
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session, \
+                patch('homeassistant.components.recorder.purge.'
+                      'PURGE_CHUNK_SIZE', 2):
+            purge_run = PurgeRun(self.hass.data[DATA_INSTANCE], 4, False)
+
+            chunks = 1
+            while not purge_run.run_chunk():
+                chunks += 1
+
+            assert chunks > 3
+            assert purge_run.states_deleted == 4
+            assert purge_run.events_deleted == 4
+            assert session.query(States).count() == 3
+            assert 'iamprotected' in (
+                state.state for state in session.query(States))
+
+    def test_purge_unused_attributes_in_chunks(self):
+        """Test purging attributes no longer used by any state in chunks."""
+        now = datetime.now()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for attributes_id in range(1, 6):
+                session.add(StateAttributes(
+                    attributes_id=attributes_id, hash=attributes_id,
+                    shared_attrs='{}'))
+            session.add(States(
+                entity_id='test.attributes', domain='test', state='on',
+                attributes_id=3, last_changed=now, last_updated=now,
+                created=now, event_id=3000))
+
+        with session_scope(hass=self.hass) as session, \
+                patch('homeassistant.components.recorder.purge.'
+                      'PURGE_CHUNK_SIZE', 2):
+            purge_run = PurgeRun(self.hass.data[DATA_INSTANCE], 4, False)
+
+            chunks = 1
+            while not purge_run.run_chunk():
+                chunks += 1
+
+            assert chunks > 3
+            assert [row.attributes_id for row
+                    in session.query(StateAttributes)] == [3]
@@ -0,0 +1,109 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import statistics
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.util import session_scope
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """HASS fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass)
+    hass.start()
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+    yield hass
+    hass.stop()
+
+
+def _set_states(hass, entity_id, states, start):
+    """Set states of an entity one second apart."""
+    for idx, state in enumerate(states):
+        with patch('homeassistant.core.dt_util.utcnow',
+                   return_value=start + timedelta(seconds=idx)):
+            hass.states.set(entity_id, state)
+        hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+
+def test_best_duration():
+    """Test picking the statistics period for a resolution."""
+    assert statistics.best_duration(60) is None
+    assert statistics.best_duration(300) == statistics.DURATION_5_MINUTES
+    assert statistics.best_duration(1800) == statistics.DURATION_5_MINUTES
+    assert statistics.best_duration(86400) == statistics.DURATION_HOUR
+
+
+def test_compile_statistics(hass_recorder):
+    """Test numeric states are aggregated while they are recorded."""
+    hass = hass_recorder
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    _set_states(hass, 'sensor.power', ['10', '20', 'unknown', '30'], start)
+    _set_states(hass, 'switch.light', ['on', 'off'], start)
+
+    with session_scope(hass=hass) as session:
+        rows = session.query(Statistics).filter(
+            Statistics.entity_id == 'switch.light').count()
+        assert rows == 0
+
+    stats = statistics.statistics_during_period(
+        hass, start, entity_ids=['sensor.power'])
+    assert stats == {
+        'sensor.power': [{
+            'start': start.timestamp(),
+            'min': 10,
+            'max': 30,
+            'mean': 20,
+            'last': 30,
+            'count': 3,
+        }]
+    }
+
+    stats = statistics.statistics_during_period(
+        hass, start, entity_ids=['sensor.power'],
+        duration=statistics.DURATION_5_MINUTES)
+    assert len(stats['sensor.power']) == 1
+
+
+def test_compile_statistics_reload(hass_recorder):
+    """Test statistics continue the stored period after a reset."""
+    hass = hass_recorder
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    _set_states(hass, 'sensor.power', ['10'], start)
+
+    hass.data[DATA_INSTANCE].statistics.clear()
+    _set_states(hass, 'sensor.power', ['30'], start + timedelta(seconds=10))
+
+    stats = statistics.statistics_during_period(
+        hass, start, entity_ids=['sensor.power'])
+    assert stats['sensor.power'][0]['count'] == 2
+    assert stats['sensor.power'][0]['mean'] == 20
+
+
+def test_compile_statistics_period_returns_before_flush(hass_recorder):
+    """Test a period that comes back before it was written is reused."""
+    hass = hass_recorder
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    start_ts = start.timestamp()
+    compiler = statistics.StatisticsCompiler()
+
+    with session_scope(hass=hass) as session:
+        compiler.add(session, 'sensor.power', '10', start_ts)
+        compiler.add(session, 'sensor.power', '20', start_ts + 3600)
+        compiler.add(session, 'sensor.power', '30', start_ts + 1)
+        compiler.flush(session)
+
+    stats = statistics.statistics_during_period(
+        hass, start, entity_ids=['sensor.power'])
+    assert [(stat['count'], stat['mean'])
+            for stat in stats['sensor.power']] == [(2, 20), (1, 20)]
@@ -428,6 +428,56 @@ class TestComponentHistory(unittest.TestCase):
                     history.CONF_ENTITIES: ['media_player.test']}}})
         self.check_significant_states(zero, four, states, config)
 
+    def test_get_columnar_states(self):
+        """Test getting significant states in a columnar format."""
+        zero, four, states = self.record_states()
+        hist = history.get_columnar_states(
+            self.hass, zero, four, filters=history.Filters())
+
+        assert set(hist) == set(states)
+        for entity_id, entity_states in states.items():
+            assert hist[entity_id]['s'] == [
+                state.state for state in entity_states]
+            assert hist[entity_id]['t'] == [
+                state.last_updated.timestamp() for state in entity_states]
+            assert 'a' not in hist[entity_id]
+
+    def test_get_columnar_states_attributes(self):
+        """Test getting columnar states including attributes."""
+        zero, four, states = self.record_states()
+        hist = history.get_columnar_states(
+            self.hass, zero, four, entity_ids=['thermostat.test'],
+            filters=history.Filters(), include_attributes=True)
+
+        assert list(hist) == ['thermostat.test']
+        assert hist['thermostat.test']['a'] == [
+            dict(state.attributes) for state in states['thermostat.test']]
+
+    def test_get_columnar_states_from_statistics(self):
+        """Test downsampled columns are read from statistics if possible."""
+        self.init_recorder()
+        end = dt_util.utcnow()
+        start = end - timedelta(hours=4)
+        stats = {'sensor.power': [
+            {'start': start.timestamp() + idx * 3600, 'min': idx,
+             'max': idx + 2, 'mean': idx + 1, 'last': idx, 'count': 2}
+            for idx in range(4)
+        ]}
+
+        with patch('homeassistant.components.recorder.statistics.'
+                   'statistics_during_period', return_value=stats) as mock:
+            hist = history.get_columnar_states(
+                self.hass, start, end, entity_ids=['sensor.power'],
+                filters=history.Filters(), points=2)
+
+        assert mock.call_args[0][4] == 3600
+        assert hist == {'sensor.power': {
+            't': [start.timestamp(), start.timestamp() + 7200],
+            's': [1.5, 3.5],
+            'min': [0, 2],
+            'max': [3, 5],
+        }}
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -525,3 +575,142 @@ async def test_fetch_period_api(hass, aiohttp_client):
     response = await client.get(
         '/api/history/period/{}'.format(dt_util.utcnow().isoformat()))
     assert response.status == 200
+
+
+def test_downsample_numeric():
+    """Test downsampling numeric states into buckets."""
+    columns = {
+        't': [0, 1, 2, 3, 8, 9],
+        's': ['1', '3', '2', '6', '10', '20'],
+    }
+    history._downsample(columns, 0, 10, 2)
+
+    assert columns == {
+        't': [0, 5],
+        's': [3, 15],
+        'min': [1, 10],
+        'max': [6, 20],
+    }
+
+
+def test_downsample_non_numeric():
+    """Test non numeric states are not downsampled."""
+    columns = {
+        't': [0, 1, 2],
+        's': ['on', 'off', 'on'],
+    }
+    history._downsample(columns, 0, 10, 2)
+
+    assert columns == {
+        't': [0, 1, 2],
+        's': ['on', 'off', 'on'],
+    }
+
+
+async def test_fetch_columnar_api(hass, aiohttp_client):
+    """Test the columnar history view."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    hass.states.async_set('sensor.power', '10')
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await aiohttp_client(hass.http.app)
+    response = await client.get(
+        '/api/history/columnar/{}?filter_entity_id=sensor.power'.format(
+            (dt_util.utcnow() - timedelta(hours=1)).isoformat()))
+    assert response.status == 200
+    result = await response.json()
+    assert result['sensor.power']['s'] == ['10']
+
+
+async def test_fetch_columnar_api_invalid_points(hass, aiohttp_client):
+    """Test the columnar history view with invalid points."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    client = await aiohttp_client(hass.http.app)
+    response = await client.get('/api/history/columnar?points=0')
+    assert response.status == 400
+
+
+async def test_ws_history_stream(hass, hass_ws_client):
+    """Test streaming columnar history over the websocket."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    start = dt_util.utcnow() - timedelta(hours=1)
+    hass.states.async_set('sensor.power', '10')
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({
+        'id': 5,
+        'type': 'history/stream',
+        'start_time': start.isoformat(),
+        'entity_ids': ['sensor.power'],
+    })
+    msg = await client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == 'event'
+    assert msg['event']['sensor.power']['s'] == ['10']
+
+    msg = await client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == 'result'
+    assert msg['success']
+
+
+async def test_ws_history_stream_chunks(hass, hass_ws_client):
+    """Test streamed history is split into chunks of entities."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    start = dt_util.utcnow() - timedelta(hours=1)
+    for idx in range(3):
+        hass.states.async_set('sensor.power_{}'.format(idx), idx)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client(hass)
+    with patch('homeassistant.components.history.STREAM_CHUNK_SIZE', 2):
+        await client.send_json({
+            'id': 5,
+            'type': 'history/stream',
+            'start_time': start.isoformat(),
+        })
+        first = await client.receive_json()
+        second = await client.receive_json()
+
+    assert first['type'] == 'event'
+    assert len(first['event']) == 2
+    assert second['type'] == 'event'
+    assert len(second['event']) == 1
+    assert set(first['event']) | set(second['event']) == {
+        'sensor.power_0', 'sensor.power_1', 'sensor.power_2'}
+
+    msg = await client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == 'result'
+    assert msg['success']
+
+
+async def test_fetch_columnar_api_chunks(hass, aiohttp_client):
+    """Test the columnar history view writes valid JSON over chunks."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    for idx in range(3):
+        hass.states.async_set('sensor.power_{}'.format(idx), idx)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await aiohttp_client(hass.http.app)
+    with patch('homeassistant.components.history.STREAM_CHUNK_SIZE', 2):
+        response = await client.get(
+            '/api/history/columnar/{}'.format(
+                (dt_util.utcnow() - timedelta(hours=1)).isoformat()))
+    assert response.status == 200
+    result = await response.json()
+    assert result['sensor.power_2']['s'] == ['2']
+    assert len(result) == 3
@@ -3,6 +3,7 @@
 import logging
 from datetime import (timedelta, datetime)
 import unittest
+from unittest.mock import Mock
 
 from homeassistant.components import sun
 import homeassistant.core as ha
@@ -583,6 +584,45 @@ async def test_logbook_view(hass, aiohttp_client):
     assert response.status == 200
 
 
+async def test_logbook_query_filters(hass):
+    """Test the logbook query skips entries that are not reported."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'logbook', {})
+    await hass.components.recorder.wait_connection_ready()
+
+    hass.states.async_set('switch.new', STATE_ON)
+    hass.states.async_set('switch.test', STATE_OFF, {'friendly_name': 'Test'})
+    hass.states.async_set('switch.test', STATE_ON, {'friendly_name': 'Test'})
+    hass.states.async_set('switch.test', STATE_ON, {'friendly_name': 'Twin'})
+    hass.states.async_set('switch.hidden', STATE_OFF, {ATTR_HIDDEN: True})
+    hass.states.async_set('switch.hidden', STATE_ON, {ATTR_HIDDEN: True})
+    hass.states.async_set('group.auto', STATE_OFF, {'auto': True})
+    hass.states.async_set('group.auto', STATE_ON, {'auto': True})
+    hass.states.async_remove('switch.new')
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    entries = await hass.async_add_job(
+        lambda: list(logbook._get_events(
+            hass, {}, dt_util.utcnow() - timedelta(hours=1),
+            dt_util.utcnow() + timedelta(hours=1))))
+
+    entries = [entry for entry in entries
+               if entry['domain'] != ha.DOMAIN]
+    assert len(entries) == 1
+    assert entries[0]['entity_id'] == 'switch.test'
+    assert entries[0]['name'] == 'Test'
+    assert entries[0]['message'] == 'turned on'
+
+
+def test_row_with_invalid_entity_skipped():
+    """Test a stored row with an invalid entity id is skipped."""
+    row = Mock(entity_id='not an entity', state=STATE_ON, attributes_id=None,
+               shared_attrs=None, attributes='{}')
+
+    assert logbook._row_to_event_converter()(row) is None
+
+
 async def test_logbook_view_period_entity(hass, aiohttp_client):
     """Test the logbook view with period and entity."""
     await hass.async_add_job(init_recorder_component, hass)
@@ -97,6 +97,149 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_coalesce_state_changes(hass, websocket_client):
+    """Test pending state changes are coalesced in a single frame."""
+    hass.states.async_set('sensor.power', 'off')
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_CONNECTION_OPTIONS,
+        'coalesce_messages': True,
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
+
+    await websocket_client.send_json({
+        'id': 6,
+        'type': commands.TYPE_SUBSCRIBE_EVENTS,
+        'event_type': 'state_changed',
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['success']
+
+    hass.states.async_set('sensor.power', 0)
+    hass.states.async_set('sensor.energy', 1)
+    for value in range(1, 5):
+        hass.states.async_set('sensor.power', value)
+
+    with timeout(3, loop=hass.loop):
+        msgs = await websocket_client.receive_json()
+
+    assert isinstance(msgs, list)
+    assert [msg['event']['data']['entity_id'] for msg in msgs] == \
+        ['sensor.energy', 'sensor.power']
+    assert [msg['event']['data']['new_state']['state'] for msg in msgs] == \
+        ['1', '4']
+    assert msgs[1]['event']['data']['old_state']['state'] == 'off'
+
+
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities command."""
+    hass.states.async_set('light.kitchen', 'off', {'color': 'red'})
+    hass.states.async_set('light.hallway', 'off')
+    hass.states.async_set('switch.heater', 'off')
+    kitchen = hass.states.get('light.kitchen')
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUBSCRIBE_ENTITIES,
+        'entity_ids': ['switch.heater'],
+        'domains': ['light'],
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == const.TYPE_RESULT
+    assert msg['success']
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == commands.TYPE_EVENT
+    assert set(msg['event']['a']) == {
+        'light.kitchen', 'light.hallway', 'switch.heater'}
+    assert msg['event']['a']['light.kitchen'] == {
+        's': 'off',
+        'a': {'color': 'red'},
+        'c': kitchen.context.id,
+        'lc': kitchen.last_changed.timestamp(),
+    }
+
+    hass.states.async_set('sensor.ignored', '1')
+    hass.states.async_set('light.kitchen', 'on', {'brightness': 100})
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+
+    kitchen = hass.states.get('light.kitchen')
+    assert msg['id'] == 5
+    assert msg['event'] == {'c': {'light.kitchen': {
+        '+': {
+            's': 'on',
+            'a': {'brightness': 100},
+            'c': kitchen.context.id,
+            'lc': kitchen.last_changed.timestamp(),
+            'lu': kitchen.last_updated.timestamp(),
+        },
+        '-': {'a': ['color']},
+    }}}
+
+    hass.states.async_set('light.porch', 'on')
+    hass.states.async_remove('switch.heater')
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+    assert list(msg['event']['a']) == ['light.porch']
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+    assert msg['event'] == {'r': ['switch.heater']}
+
+
+async def test_subscribe_entities_by_entity_id(hass, websocket_client):
+    """Test subscribe entities command with only entity ids."""
+    hass.states.async_set('light.kitchen', 'off')
+    hass.states.async_set('light.hallway', 'off')
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUBSCRIBE_ENTITIES,
+        'entity_ids': ['light.kitchen'],
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['success']
+
+    msg = await websocket_client.receive_json()
+    assert list(msg['event']['a']) == ['light.kitchen']
+
+    hass.states.async_set('light.hallway', 'on')
+    hass.states.async_set('light.kitchen', 'off', {'brightness': 10})
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+
+    # Only the attributes changed
+    diff = msg['event']['c']['light.kitchen']
+    assert 's' not in diff['+']
+    assert 'lc' not in diff['+']
+    assert diff['+']['a'] == {'brightness': 10}
+    assert '-' not in diff
+
+    await websocket_client.send_json({
+        'id': 6,
+        'type': commands.TYPE_UNSUBSCRIBE_EVENTS,
+        'subscription': 5
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['success']
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set('greeting.hello', 'world')
@@ -90,3 +90,35 @@ async def test_handler_failing(hass, websocket_client):
     assert msg['type'] == const.TYPE_RESULT
     assert not msg['success']
     assert msg['error']['code'] == const.ERR_UNKNOWN_ERROR
+
+
+async def test_bulk_send_respects_pending_limit(
+        hass, mock_low_queue, websocket_client):
+    """Test a bulk sender waits for room instead of overflowing."""
+    @hass.components.websocket_api.async_response
+    async def handle_bulk(hass, connection, msg):
+        """Send more messages than the max pending messages."""
+        for idx in range(20):
+            await connection.async_send_message({
+                'id': msg['id'],
+                'type': 'event',
+                'event': idx,
+            })
+        connection.send_message(messages.result_message(msg['id']))
+
+    hass.components.websocket_api.async_register_command(
+        'bulk', handle_bulk,
+        messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({'type': 'bulk'}))
+    await websocket_client.send_json({
+        'id': 5,
+        'type': 'bulk',
+    })
+
+    for idx in range(20):
+        msg = await websocket_client.receive_json()
+        assert msg['type'] == 'event'
+        assert msg['event'] == idx
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
@@ -38,6 +38,43 @@ async def test_unload_entry_successful(hass):
     assert not hass.data[zone.DOMAIN]
 
 
+async def test_active_zone_follows_zone_changes(hass):
+    """Test the zone index is updated when zones change."""
+    assert await setup.async_setup_component(hass, zone.DOMAIN, {
+        'zone': {
+            'name': 'Office',
+            'latitude': 52.3731,
+            'longitude': 4.8922,
+            'radius': 100,
+        }
+    })
+    await hass.async_block_till_done()
+
+    active = zone.zone.async_active_zone(hass, 52.3731, 4.8922)
+    assert active.entity_id == 'zone.office'
+    assert zone.zone.async_active_zone(hass, 52.0907, 5.1214) is None
+
+    hass.states.async_set('zone.office', 'zoning', {
+        'latitude': 52.0907,
+        'longitude': 5.1214,
+        'radius': 100,
+    })
+    await hass.async_block_till_done()
+
+    assert zone.zone.async_active_zone(hass, 52.3731, 4.8922) is None
+    active = zone.zone.async_active_zone(hass, 52.0907, 5.1214)
+    assert active.entity_id == 'zone.office'
+
+    # A large GPS accuracy reaches zones further away
+    active = zone.zone.async_active_zone(hass, 52.0997, 5.1214, 1000)
+    assert active.entity_id == 'zone.office'
+
+    hass.states.async_remove('zone.office')
+    await hass.async_block_till_done()
+
+    assert zone.zone.async_active_zone(hass, 52.0907, 5.1214) is None
+
+
 class TestComponentZone(unittest.TestCase):
     """Test the zone component."""
 
@@ -21,7 +21,7 @@ import homeassistant.util.dt as dt_util
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, MockModule, mock_coro,
-    async_fire_time_changed, MockEntity, MockConfigEntry)
+    async_fire_time_changed, fire_time_changed, MockEntity, MockConfigEntry)
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = "test_domain"
@@ -159,6 +159,8 @@ class TestHelpersEntityComponent(unittest.TestCase):
             }
         })
 
+        self.hass.block_till_done()
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=30))
         self.hass.block_till_done()
         assert mock_track.called
         assert timedelta(seconds=30) == mock_track.call_args[0][2]
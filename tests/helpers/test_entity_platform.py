@@ -1,6 +1,7 @@
 """Tests for the EntityPlatform helper."""
 import asyncio
 import logging
+import threading
 import unittest
 from unittest.mock import patch, Mock, MagicMock
 from datetime import timedelta
@@ -18,7 +19,8 @@ import homeassistant.util.dt as dt_util
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, fire_time_changed, mock_registry,
-    MockEntity, MockEntityPlatform, MockConfigEntry)
+    MockEntity, MockEntityPlatform, MockConfigEntry, mock_coro,
+    mock_coro_func, async_fire_time_changed)
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = "test_domain"
@@ -159,6 +161,8 @@ class TestHelpersEntityPlatform(unittest.TestCase):
             }
         })
 
+        self.hass.block_till_done()
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=30))
         self.hass.block_till_done()
         assert mock_track.called
         assert timedelta(seconds=30) == mock_track.call_args[0][2]
@@ -327,6 +331,91 @@ def test_parallel_updates_sync_platform(hass):
     assert handle.parallel_updates is not None
 
 
+async def test_polling_jitter(hass):
+    """Test the first poll of a platform is moved forward by a jitter."""
+    entity = MockEntity(should_poll=True)
+    entity.async_update = Mock(return_value=mock_coro())
+    entity_platform = MockEntityPlatform(
+        hass, platform=MockPlatform(), scan_interval=timedelta(seconds=20))
+
+    utcnow = dt_util.utcnow()
+
+    with patch('homeassistant.util.dt.utcnow', return_value=utcnow), \
+            patch('random.uniform', return_value=4):
+        await entity_platform.async_add_entities([entity])
+        entity.async_update.reset_mock()
+
+        async_fire_time_changed(hass, utcnow + timedelta(seconds=15))
+        await hass.async_block_till_done()
+        assert not entity.async_update.called
+
+        async_fire_time_changed(hass, utcnow + timedelta(seconds=16))
+        await hass.async_block_till_done()
+        assert entity.async_update.called
+
+
+async def test_update_in_integration_executor(hass):
+    """Test blocking updates run in the executor of the integration."""
+    threads = []
+
+    entity = MockEntity(should_poll=True)
+    entity.update = lambda: threads.append(threading.current_thread().name)
+    entity_platform = MockEntityPlatform(
+        hass, platform_name='slow_integration', platform=MockPlatform())
+
+    await entity_platform.async_add_entities([entity], True)
+
+    assert len(threads) == 1
+    assert threads[0].startswith('UpdateWorker_slow_integration')
+
+
+async def test_update_executors_max(hass):
+    """Test updates use the shared executor past the max executors."""
+    threads = []
+
+    with patch.object(entity_platform, 'UPDATE_EXECUTORS_MAX', 1):
+        for integration in ('first_integration', 'second_integration'):
+            entity = MockEntity(should_poll=True)
+            entity.update = lambda: threads.append(
+                threading.current_thread().name)
+            await MockEntityPlatform(
+                hass, platform_name=integration,
+                platform=MockPlatform()).async_add_entities([entity], True)
+
+    assert len(threads) == 2
+    assert threads[0].startswith('UpdateWorker_first_integration')
+    assert not threads[1].startswith('UpdateWorker_')
+
+
+async def test_polling_update_many(hass):
+    """Test platforms can update all their entities at once."""
+    entities = [MockEntity(should_poll=True, name='test1'),
+                MockEntity(should_poll=True, name='test2')]
+    for entity in entities:
+        entity.update = Mock()
+
+    async def async_update_many(hass, update_entities):
+        """Update the entities in one go."""
+        for entity in update_entities:
+            entity._values['available'] = False
+
+    platform = MockPlatform()
+    platform.async_update_many = Mock(side_effect=async_update_many)
+    entity_platform = MockEntityPlatform(hass, platform=platform)
+
+    await entity_platform.async_add_entities(entities)
+    await entity_platform._update_entity_states(dt_util.utcnow())
+
+    assert len(platform.async_update_many.mock_calls) == 1
+    # Entities are added concurrently, so their order is not fixed
+    assert sorted(entity.name for entity
+                  in platform.async_update_many.mock_calls[0][1][1]) == \
+        ['test1', 'test2']
+    assert not entities[0].update.called
+    assert hass.states.get('test_domain.test1').state == 'unavailable'
+    assert hass.states.get('test_domain.test2').state == 'unavailable'
+
+
 @asyncio.coroutine
 def test_raise_error_on_update(hass):
     """Test the add entity if they raise an error on update."""
@@ -547,6 +636,29 @@ async def test_setup_entry(hass):
         'super-mock-id'
 
 
+async def test_scheduled_entities_added_together(hass):
+    """Test entities scheduled in the same iteration are added together."""
+    entity_platform = MockEntityPlatform(hass)
+
+    with patch.object(entity_platform, 'async_add_entities',
+                      side_effect=mock_coro_func()) as mock_add:
+        entity_platform._async_schedule_add_entities(
+            [MockEntity(name='test1')])
+        entity_platform._async_schedule_add_entities(
+            [MockEntity(name='test2')])
+        entity_platform._async_schedule_add_entities(
+            [MockEntity(name='test3')], update_before_add=True)
+        await hass.async_block_till_done()
+
+    assert len(mock_add.mock_calls) == 2
+    assert [entity.name for entity in mock_add.mock_calls[0][1][0]] == \
+        ['test1', 'test2']
+    assert not mock_add.mock_calls[0][2]['update_before_add']
+    assert [entity.name for entity in mock_add.mock_calls[1][1][0]] == \
+        ['test3']
+    assert mock_add.mock_calls[1][2]['update_before_add']
+
+
 async def test_setup_entry_platform_not_ready(hass, caplog):
     """Test when an entry is not ready yet."""
     async_setup_entry = Mock(side_effect=PlatformNotReady)
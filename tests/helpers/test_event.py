@@ -10,15 +10,18 @@ import pytest
 from homeassistant.core import callback
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import (
+    EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.helpers.event import (
     async_call_later,
+    async_track_point_in_utc_time,
     call_later,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
     track_time_change,
     track_state_change,
+    track_state_change_event,
     track_time_interval,
     track_template,
     track_same_state,
@@ -85,6 +88,71 @@ class TestEventHelpers(unittest.TestCase):
         self.hass.block_till_done()
         assert 2 == len(runs)
 
+    def test_track_point_in_time_shared_listener(self):
+        """Test points in time share one listener that is removed after."""
+        birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+        runs = []
+        listeners = self.hass.bus.listeners.get(EVENT_TIME_CHANGED, 0)
+
+        for idx in range(3):
+            track_point_in_utc_time(
+                self.hass, callback(lambda x, idx=idx: runs.append(idx)),
+                birthday_paulus + timedelta(seconds=2 - idx))
+        unsub = track_point_in_utc_time(
+            self.hass, callback(lambda x: runs.append('cancelled')),
+            birthday_paulus)
+
+        assert self.hass.bus.listeners[EVENT_TIME_CHANGED] == listeners + 1
+
+        unsub()
+        self._send_time_changed(birthday_paulus + timedelta(seconds=1))
+        self.hass.block_till_done()
+        assert runs == [2, 1]
+
+        self._send_time_changed(birthday_paulus + timedelta(seconds=5))
+        self.hass.block_till_done()
+        assert runs == [2, 1, 0]
+        assert self.hass.bus.listeners.get(
+            EVENT_TIME_CHANGED, 0) == listeners
+
+    def test_track_point_in_time_rescheduled_in_tick(self):
+        """Test actions rescheduled by an action wait for the next tick."""
+        birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+        runs = []
+        listeners = self.hass.bus.listeners.get(EVENT_TIME_CHANGED, 0)
+
+        @callback
+        def reschedule(now):
+            """Run and schedule again for a point that already passed."""
+            runs.append(now)
+            if len(runs) < 3:
+                async_track_point_in_utc_time(
+                    self.hass, reschedule, birthday_paulus)
+
+        track_point_in_utc_time(self.hass, reschedule, birthday_paulus)
+
+        self._send_time_changed(birthday_paulus)
+        self.hass.block_till_done()
+        assert len(runs) == 1
+
+        self._send_time_changed(birthday_paulus)
+        self.hass.block_till_done()
+        assert len(runs) == 2
+
+        unsub = track_point_in_utc_time(
+            self.hass, callback(lambda x: runs.append('cancelled')),
+            birthday_paulus + timedelta(seconds=10))
+        self._send_time_changed(birthday_paulus)
+        self.hass.block_till_done()
+        assert len(runs) == 3
+        assert self.hass.bus.listeners[EVENT_TIME_CHANGED] == listeners + 1
+
+        # Cancelling the last pending action stops listening to the time
+        unsub()
+        self.hass.block_till_done()
+        assert self.hass.bus.listeners.get(
+            EVENT_TIME_CHANGED, 0) == listeners
+
     def test_track_state_change(self):
         """Test track_state_change."""
         # 2 lists to track how often our callbacks get called
@@ -164,6 +232,55 @@ class TestEventHelpers(unittest.TestCase):
         assert 5 == len(wildcard_runs)
         assert 6 == len(wildercard_runs)
 
+    def test_track_state_change_event(self):
+        """Test state change events are only dispatched to their entity."""
+        light_runs = []
+        switch_runs = []
+
+        unsub_light = track_state_change_event(
+            self.hass, ['Light.Bowl', 'light.top'],
+            callback(lambda event: light_runs.append(event)))
+        track_state_change_event(
+            self.hass, 'switch.kitchen',
+            callback(lambda event: switch_runs.append(event)))
+
+        self.hass.states.set('light.bowl', 'on')
+        self.hass.states.set('light.top', 'on')
+        self.hass.states.set('light.other', 'on')
+        self.hass.block_till_done()
+
+        assert len(light_runs) == 2
+        assert light_runs[0].data['entity_id'] == 'light.bowl'
+        assert light_runs[1].data['new_state'].state == 'on'
+        assert len(switch_runs) == 0
+
+        self.hass.states.set('switch.kitchen', 'on')
+        unsub_light()
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.block_till_done()
+
+        assert len(light_runs) == 2
+        assert len(switch_runs) == 1
+
+    def test_track_state_change_event_single_bus_listener(self):
+        """Test all trackers share one state changed bus listener."""
+        listeners = self.hass.bus.listeners.get(EVENT_STATE_CHANGED, 0)
+
+        unsubs = [
+            track_state_change_event(
+                self.hass, 'light.{}'.format(idx), callback(lambda event: 0))
+            for idx in range(3)]
+        unsubs.append(track_state_change(
+            self.hass, 'light.bowl', callback(lambda *args: 0)))
+
+        assert self.hass.bus.listeners[EVENT_STATE_CHANGED] == listeners + 1
+
+        for unsub in unsubs:
+            unsub()
+
+        assert self.hass.bus.listeners.get(
+            EVENT_STATE_CHANGED, 0) == listeners
+
     def test_track_template(self):
         """Test tracking template."""
         specific_runs = []
@@ -1,7 +1,12 @@
 """Test Home Assistant remote methods and classes."""
+from collections import OrderedDict
+import json
+from types import MappingProxyType
+
 import pytest
 
 from homeassistant import core
+from homeassistant.helpers import json as json_helper
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
 
@@ -19,3 +24,54 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_encoder_fast_types(hass):
+    """Test the types the JSON Encoder looks up by exact type."""
+    ha_json_enc = JSONEncoder()
+    state = core.State('test.test', 'hello')
+    event = core.Event('test_event', {'hello': 'world'})
+
+    assert ha_json_enc.encode(state) == \
+        ha_json_enc.encode(state.as_dict())
+    assert ha_json_enc.default(event) == event.as_dict()
+    assert ha_json_enc.default(state.context) == state.context.as_dict()
+    assert ha_json_enc.default({1, 2}) == [1, 2]
+    assert ha_json_enc.default(MappingProxyType({'a': 1})) == {'a': 1}
+
+
+def test_json_dump_backends(hass):
+    """Test the JSON backends encode Home Assistant objects alike."""
+    state = core.State('light.kitchen', 'on', {
+        'brightness': 144, 'effects': {'rainbow'}, 'rgb_color': (1, 2, 3)})
+    event = core.Event('state_changed', {
+        'entity_id': 'light.kitchen', 'new_state': state})
+    data = {'states': [state], 'event': event, 'time': dt_util.utcnow()}
+    expected = json.loads(json.dumps(
+        {'states': [state.as_dict()], 'event': event.as_dict(),
+         'time': data['time']}, cls=JSONEncoder))
+
+    assert json.loads(json_helper._json_dumps(data)) == expected
+    assert json.loads(json_helper.JSON_DUMP(data)) == expected
+
+    if json_helper.orjson is not None:
+        assert json.loads(json_helper._orjson_dumps(data)) == expected
+
+
+def test_json_dump_sort_keys():
+    """Test the JSON backends sort keys on request."""
+    data = {'b': 1, 'c': {'z': 1, 'y': 2}, 'a': 2}
+
+    def keys(encoded):
+        """Return the keys of the outer and inner object in order."""
+        decoded = json.loads(encoded, object_pairs_hook=OrderedDict)
+        return list(decoded), list(decoded['c'])
+
+    assert keys(json_helper._json_dumps(data, sort_keys=True)) == \
+        (['a', 'b', 'c'], ['y', 'z'])
+    assert keys(json_helper.JSON_DUMP(data, sort_keys=True)) == \
+        (['a', 'b', 'c'], ['y', 'z'])
+
+    if json_helper.orjson is not None:
+        assert keys(json_helper._orjson_dumps(data, sort_keys=True)) == \
+            (['a', 'b', 'c'], ['y', 'z'])
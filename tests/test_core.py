@@ -1,6 +1,7 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+import json
 import logging
 import os
 import unittest
@@ -14,6 +15,7 @@ import pytest
 import homeassistant.core as ha
 from homeassistant.exceptions import (InvalidEntityFormatError,
                                       InvalidStateError)
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util.async_ import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import (METRIC_SYSTEM)
@@ -21,7 +23,8 @@ from homeassistant.const import (
     __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
     ATTR_NOW, EVENT_TIME_CHANGED, EVENT_TIMER_OUT_OF_SYNC, ATTR_SECONDS,
     EVENT_HOMEASSISTANT_STOP, EVENT_HOMEASSISTANT_CLOSE,
-    EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED, EVENT_SERVICE_EXECUTED)
+    EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED, EVENT_SERVICE_EXECUTED,
+    MATCH_ALL)
 
 from tests.common import get_test_home_assistant, async_mock_service
 
@@ -284,6 +287,22 @@ class TestEvent(unittest.TestCase):
         }
         assert expected == event.as_dict()
 
+    def test_as_json(self):
+        """Test the cached JSON representation."""
+        state = ha.State('light.kitchen', 'on', {'brightness': 144})
+        event = ha.Event(EVENT_STATE_CHANGED, {
+            'entity_id': 'light.kitchen',
+            'old_state': None,
+            'new_state': state,
+        })
+
+        assert json.loads(event.as_json()) == \
+            json.loads(json.dumps(event, cls=JSONEncoder))
+        assert json.loads(event.data_json) == \
+            json.loads(json.dumps(event.data, cls=JSONEncoder))
+        assert event.as_json() is event.as_json()
+        assert state.as_json() in event.as_json()
+
 
 class TestEventBus(unittest.TestCase):
     """Test EventBus methods."""
@@ -317,6 +336,52 @@ class TestEventBus(unittest.TestCase):
         # Should do nothing now
         unsub()
 
+    def test_callback_listener_exception_isolated(self):
+        """Test a failing callback listener does not block the others."""
+        calls = []
+
+        @ha.callback
+        def failing_listener(event):
+            """Mock failing listener."""
+            raise ValueError('boom')
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(event)
+
+        self.bus.listen('test_event', failing_listener)
+        self.bus.listen('test_event', listener)
+
+        with patch.object(ha, '_LOGGER') as mock_logger:
+            self.bus.fire('test_event')
+            self.hass.block_till_done()
+
+        assert len(calls) == 1
+        assert mock_logger.exception.call_count == 1
+
+    def test_callback_listeners_run_in_one_handle(self):
+        """Test callback listeners of an event are scheduled once."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(event)
+
+        for _ in range(3):
+            self.bus.listen('test_event', listener)
+
+        with patch.object(self.hass.loop, 'call_soon',
+                          wraps=self.hass.loop.call_soon) as mock_call_soon:
+            self.bus.fire('test_event')
+            self.hass.block_till_done()
+
+        assert len(calls) == 3
+        assert len([
+            call for call in mock_call_soon.mock_calls
+            if call[1] and call[1][0] is ha._async_run_callbacks]) == 1
+
     def test_unsubscribe_listener(self):
         """Test unsubscribe listener from returned function."""
         calls = []
@@ -467,6 +532,15 @@ class TestState(unittest.TestCase):
         state = ha.State('domain.hello', 'world', {'some': 'attr'})
         assert state == ha.State.from_dict(state.as_dict())
 
+    def test_as_json(self):
+        """Test the cached JSON representation."""
+        state = ha.State('domain.hello', 'world', {'some': ['attr']})
+
+        assert json.loads(state.as_json()) == \
+            json.loads(json.dumps(state, cls=JSONEncoder))
+        assert json.loads(state.attributes_json) == {'some': ['attr']}
+        assert state.as_json() is state.as_json()
+
     def test_dict_conversion_with_wrong_data(self):
         """Test conversion with wrong data."""
         assert ha.State.from_dict(None) is None
@@ -843,6 +917,7 @@ class TestConfig(unittest.TestCase):
 def test_create_timer(mock_monotonic, loop):
     """Test create timer."""
     hass = MagicMock()
+    hass.bus._listeners = {EVENT_TIME_CHANGED: []}
     funcs = []
     orig_callback = ha.callback
 
@@ -892,6 +967,7 @@ def test_create_timer(mock_monotonic, loop):
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
     hass = MagicMock()
+    hass.bus._listeners = {EVENT_TIME_CHANGED: []}
     funcs = []
     orig_callback = ha.callback
 
@@ -927,6 +1003,27 @@ def test_timer_out_of_sync(mock_monotonic, loop):
     assert abs(target - 14.2) < 0.001
 
 
+@patch('homeassistant.core.monotonic')
+def test_timer_without_time_listeners(mock_monotonic, loop):
+    """Test the timer does not fire time events nobody listens to."""
+    hass = MagicMock()
+    hass.bus._listeners = {MATCH_ALL: []}
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+
+    with patch('homeassistant.core.dt_util.utcnow',
+               return_value=datetime(2018, 12, 31, 3, 4, 5, 333333)):
+        ha._async_create_timer(hass)
+
+    delay, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch('homeassistant.core.dt_util.utcnow',
+               return_value=datetime(2018, 12, 31, 3, 4, 6, 100000)):
+        callback(target)
+
+    assert len(hass.bus.async_fire.mock_calls) == 0
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
 @asyncio.coroutine
 def test_hass_start_starts_the_timer(loop):
     """Test when hass starts, it starts the timer."""
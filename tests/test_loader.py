@@ -1,6 +1,7 @@
 """Test to verify that we can load components."""
 # pylint: disable=protected-access
 import asyncio
+import sys
 import unittest
 
 import pytest
@@ -133,3 +134,50 @@ async def test_log_warning_custom_component(hass, caplog):
 
     loader.get_component(hass, 'light.test')
     assert 'You are using a custom component for light.test' in caplog.text
+
+
+async def test_get_metadata_without_import(hass, tmpdir):
+    """Test metadata is read from the source and refreshed on change."""
+    hass.config.config_dir = str(tmpdir)
+    source = tmpdir.mkdir(loader.PATH_CUSTOM_COMPONENTS).join('meta.py')
+    source.write("DEPENDENCIES = ['http']\nREQUIREMENTS = ['meta==1']\n")
+
+    assert loader.get_metadata(hass, 'meta') == {
+        'dependencies': ['http'],
+        'requirements': ['meta==1'],
+    }
+    assert 'custom_components.meta' not in sys.modules
+    assert 'meta' not in hass.data.get(loader.DATA_KEY, {})
+
+    await loader.async_save_metadata_index(hass)
+    hass.data.pop(loader.DATA_METADATA)
+    await loader.async_load_metadata_index(hass)
+    index = hass.data[loader.DATA_METADATA]
+    assert index.entries['meta']['metadata']['dependencies'] == ['http']
+    assert not index.changed
+
+    # Changed files are read again when the index is loaded
+    source.write("DEPENDENCIES = ['http', 'frontend']\n")
+    await loader.async_load_metadata_index(hass, ['meta'])
+    index = hass.data[loader.DATA_METADATA]
+    assert 'meta' in index.checked
+    assert 'http' in index.checked
+    assert index.changed
+    assert loader.get_metadata(hass, 'meta') == {
+        'dependencies': ['http', 'frontend'],
+        'requirements': [],
+    }
+
+
+def test_read_metadata_not_literal(tmpdir):
+    """Test metadata that is not a literal requires an import."""
+    source = tmpdir.join('module.py')
+
+    source.write("from .const import DOMAIN\nDEPENDENCIES = [DOMAIN]\n")
+    assert loader._read_metadata(str(source)) is None
+
+    source.write("REQUIREMENTS = ['a==1']\nREQUIREMENTS += ['b==1']\n")
+    assert loader._read_metadata(str(source)) is None
+
+    source.write("from other import REQUIREMENTS\n")
+    assert loader._read_metadata(str(source)) is None
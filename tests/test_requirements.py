@@ -4,11 +4,13 @@ from unittest.mock import patch, call
 
 from homeassistant import loader, setup
 from homeassistant.requirements import (
-    CONSTRAINT_FILE, PackageLoadable, async_process_requirements)
+    CONSTRAINT_FILE, DATA_REQS_CACHE, STORAGE_KEY, PackageLoadable,
+    async_clear_requirements_cache, async_process_requirements)
 
 import pkg_resources
 
-from tests.common import get_test_home_assistant, MockModule, mock_coro
+from tests.common import (
+    get_test_home_assistant, MockModule, mock_coro, mock_coro_func)
 
 RESOURCE_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', 'resources'))
@@ -123,3 +125,58 @@ async def test_package_loadable_installed_twice(hass):
 
     with patch('pkg_resources.find_distributions', side_effect=[[v2]]):
         assert await PackageLoadable(hass).loadable('Hello==2.0.0')
+
+
+async def test_requirements_cache(hass, hass_storage):
+    """Test met requirements are not checked again."""
+    hass_storage[STORAGE_KEY] = {
+        'version': 1,
+        'key': STORAGE_KEY,
+        'data': {
+            'fingerprint': 'abc',
+            'met': {'cached==1.0.0': 0.5},
+        },
+    }
+
+    with patch('homeassistant.requirements.site_fingerprint',
+               return_value='abc'), \
+            patch('homeassistant.requirements.PackageLoadable.loadable',
+                  side_effect=mock_coro_func(True)) as mock_loadable:
+        assert await async_process_requirements(
+            hass, 'test_component', ['cached==1.0.0', 'hello==1.0.0'])
+
+        assert len(mock_loadable.mock_calls) == 1
+        assert hass.data[DATA_REQS_CACHE].met['hello==1.0.0'] >= 0
+
+        timeline = setup.async_get_setup_timeline(hass)
+        assert timeline[0][setup.PHASE_REQUIREMENTS_SAVED] == 0.5
+
+        assert await async_process_requirements(
+            hass, 'test_component', ['hello==1.0.0'])
+        assert len(mock_loadable.mock_calls) == 1
+
+        await async_clear_requirements_cache(hass)
+        assert await async_process_requirements(
+            hass, 'test_component', ['hello==1.0.0'])
+        assert len(mock_loadable.mock_calls) == 2
+
+
+async def test_requirements_cache_fingerprint_changed(hass, hass_storage):
+    """Test met requirements are checked if the packages changed."""
+    hass_storage[STORAGE_KEY] = {
+        'version': 1,
+        'key': STORAGE_KEY,
+        'data': {
+            'fingerprint': 'abc',
+            'met': {'cached==1.0.0': 0.5},
+        },
+    }
+
+    with patch('homeassistant.requirements.site_fingerprint',
+               return_value='def'), \
+            patch('homeassistant.requirements.PackageLoadable.loadable',
+                  side_effect=mock_coro_func(True)) as mock_loadable:
+        assert await async_process_requirements(
+            hass, 'test_component', ['cached==1.0.0'])
+
+    assert len(mock_loadable.mock_calls) == 1
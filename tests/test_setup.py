@@ -4,6 +4,7 @@ import asyncio
 import os
 from unittest import mock
 import threading
+import time
 import logging
 
 import voluptuous as vol
@@ -459,3 +460,67 @@ def test_platform_no_warn_slow(hass):
             hass, 'test_component1', {})
         assert result
         assert not mock_call.called
+
+
+async def test_setup_timeline(hass):
+    """Test the setup phases of a component are recorded."""
+    loader.set_component(hass, 'comp_dep', MockModule('comp_dep'))
+    loader.set_component(hass, 'comp', MockModule(
+        'comp', dependencies=['comp_dep']))
+
+    assert await setup.async_setup_component(hass, 'comp', {})
+
+    timeline = {timings['name']: timings
+                for timings in setup.async_get_setup_timeline(hass)}
+    assert set(timeline) == {'comp', 'comp_dep'}
+    for phase in (setup.PHASE_IMPORT, setup.PHASE_DEPENDENCIES,
+                  setup.PHASE_SETUP):
+        assert timeline['comp'][phase] >= 0
+    assert setup.PHASE_DEPENDENCIES not in timeline['comp_dep']
+    assert timeline['comp_dep']['start'] >= timeline['comp']['start']
+
+
+async def test_component_setup_timeout(hass):
+    """Test a component is not set up if it takes too long."""
+    async def async_setup(hass, config):
+        """Never finish setting up."""
+        await asyncio.sleep(10, loop=hass.loop)
+        return True
+
+    loader.set_component(hass, 'comp', MockModule(
+        'comp', async_setup=async_setup))
+
+    with mock.patch.object(setup, 'SETUP_TIMEOUT', 0):
+        assert not await setup.async_setup_component(hass, 'comp', {})
+
+    assert 'comp' not in hass.config.components
+
+
+async def test_component_sync_setup_no_timeout(hass):
+    """Test a sync setup running in the executor is not abandoned."""
+    def setup_component(hass, config):
+        """Finish setting up after the timeout."""
+        time.sleep(0.1)
+        return True
+
+    loader.set_component(hass, 'comp', MockModule(
+        'comp', setup=setup_component))
+
+    with mock.patch.object(setup, 'SETUP_TIMEOUT', 0):
+        assert await setup.async_setup_component(hass, 'comp', {})
+
+    assert 'comp' in hass.config.components
+
+
+async def test_component_invalid_config_skips_dependencies(hass):
+    """Test invalid config is rejected before dependencies are set up."""
+    loader.set_component(hass, 'comp_dep', MockModule('comp_dep'))
+    loader.set_component(hass, 'comp', MockModule(
+        'comp', dependencies=['comp_dep'],
+        config_schema=vol.Schema({'comp': {'hello': str}}, required=True)))
+
+    assert not await setup.async_setup_component(
+        hass, 'comp', {'comp': {'hello': 1}})
+
+    assert 'comp' not in hass.config.components
+    assert 'comp_dep' not in hass.config.components
@@ -1,8 +1,10 @@
 """Test Home Assistant yaml loader."""
 import io
+import json
 import os
 import unittest
 import logging
+from datetime import date
 from unittest.mock import patch
 
 import pytest
@@ -443,3 +445,86 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert 'contains duplicate key' in caplog.text
+
+
+def test_load_yaml_cached(tmpdir):
+    """Test the parsed YAML is cached until a source changes."""
+    config = tmpdir.join(YAML_CONFIG_FILE)
+    config.write('included: !include included.yaml\n'
+                 'secret: !secret password\n'
+                 'packages: !include_dir_merge_named packages\n')
+    included = tmpdir.join('included.yaml')
+    included.write('- one\n')
+    tmpdir.join(yaml.SECRET_YAML).write('password: pw1\n')
+    tmpdir.mkdir('packages').join('first.yaml').write('first: 1\n')
+    cache_path = str(tmpdir.join('.cache'))
+
+    loaded = yaml.load_yaml_cached(str(config), cache_path)
+    assert loaded == {'included': ['one'], 'secret': 'pw1',
+                      'packages': {'first': 1}}
+
+    with patch.object(yaml, 'load_yaml') as mock_load:
+        cached = yaml.load_yaml_cached(str(config), cache_path)
+    assert not mock_load.called
+    assert cached == loaded
+    assert cached['included'].__config_file__ == str(config)
+    assert cached['included'].__line__ == 0
+
+    included.write('- two\n')
+    assert yaml.load_yaml_cached(str(config), cache_path)['included'] == \
+        ['two']
+
+    tmpdir.join('packages', 'second.yaml').write('second: 2\n')
+    assert yaml.load_yaml_cached(str(config), cache_path)['packages'] == \
+        {'first': 1, 'second': 2}
+
+    yaml.clear_secret_cache()
+    tmpdir.join(yaml.SECRET_YAML).write('password: pw2\n')
+    assert yaml.load_yaml_cached(str(config), cache_path)['secret'] == 'pw2'
+    yaml.clear_secret_cache()
+
+
+def test_load_yaml_cached_json(tmpdir):
+    """Test the cache is stored as JSON and keeps the loaded types."""
+    config = tmpdir.join(YAML_CONFIG_FILE)
+    config.write('name: !include name.yaml\n1: [a]\n')
+    tmpdir.join('name.yaml').write('Home\n')
+    cache_path = tmpdir.join('.cache')
+
+    loaded = yaml.load_yaml_cached(str(config), str(cache_path))
+    assert json.loads(cache_path.read())['config']['map']
+
+    cached = yaml.load_yaml_cached(str(config), str(cache_path))
+    assert cached == loaded == {'name': 'Home', 1: ['a']}
+    assert isinstance(cached['name'], yaml.NodeStrClass)
+    assert cached['name'].__config_file__ == str(config)
+    assert isinstance(cached[1], yaml.NodeListClass)
+    assert cached[1].__line__ == 1
+
+
+def test_load_yaml_cached_invalid(tmpdir, caplog):
+    """Test an unreadable cache or uncacheable YAML is not used."""
+    config = tmpdir.join(YAML_CONFIG_FILE)
+    config.write('date: 2018-12-01\n')
+    cache_path = tmpdir.join('.cache')
+    cache_path.write_binary(b'\x80\x03}q\x00.')
+
+    assert yaml.load_yaml_cached(str(config), str(cache_path)) == \
+        {'date': date(2018, 12, 1)}
+    assert 'Unable to read config cache' in caplog.text
+    assert cache_path.read_binary() == b'\x80\x03}q\x00.'
+
+
+def test_load_yaml_cached_environment_variable(tmpdir):
+    """Test the cache is not used if an environment variable changed."""
+    config = tmpdir.join(YAML_CONFIG_FILE)
+    config.write('value: !env_var HA_TEST_CACHE default\n')
+    cache_path = str(tmpdir.join('.cache'))
+
+    with patch.dict(os.environ, {'HA_TEST_CACHE': 'first'}):
+        assert yaml.load_yaml_cached(str(config), cache_path) == \
+            {'value': 'first'}
+
+    with patch.dict(os.environ, {'HA_TEST_CACHE': 'second'}):
+        assert yaml.load_yaml_cached(str(config), cache_path) == \
+            {'value': 'second'}